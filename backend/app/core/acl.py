@@ -0,0 +1,119 @@
+import threading
+import time
+from types import MappingProxyType
+from typing import Mapping, FrozenSet, NamedTuple
+
+from sqlalchemy import event, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import ACL_REFRESH_SECONDS
+from app.core.database import SessionLocal
+from app.models.user import Role
+from app.models.permission import Permission, RolePermission, ACLVersion
+
+
+# ------------------------------
+# ROLE -> PERMISSION MAP
+# ------------------------------
+# Loaded once per process and swapped as a whole. Any ORM write to
+# roles, permissions or role_permissions (and user updates, see
+# app.core.deps) bumps acl_version; each process compares its stamp at
+# most every ACL_REFRESH_SECONDS, so checks in between run no SQL.
+# Bulk SQL that bypasses the ORM must call bump_acl_version itself.
+
+class ACL(NamedTuple):
+    version: int
+    roles: Mapping[int, str]                     # role id -> name
+    permissions: Mapping[int, FrozenSet[str]]    # role id -> permission names
+
+
+_acl = None
+_checked_at = 0.0
+_stale = False
+_lock = threading.Lock()
+
+
+def _version(db: Session):
+    return db.scalar(select(ACLVersion.version).where(ACLVersion.id == 1))
+
+
+def _load(db: Session, version: int):
+    roles = {role_id: name for role_id, name in db.execute(select(Role.id, Role.name))}
+
+    grants = {}
+    for role_id, name in db.execute(
+        select(RolePermission.role_id, Permission.name)
+        .join(Permission, Permission.id == RolePermission.permission_id)
+    ):
+        grants.setdefault(role_id, set()).add(name)
+
+    return ACL(
+        version=version,
+        roles=MappingProxyType(roles),
+        permissions=MappingProxyType({r: frozenset(p) for r, p in grants.items()})
+    )
+
+
+def current_acl() -> ACL:
+    global _acl, _checked_at, _stale
+
+    now = time.monotonic()
+    acl = _acl
+    if acl is not None and not _stale and now - _checked_at < ACL_REFRESH_SECONDS:
+        return acl
+
+    with _lock:
+        if _acl is not None and not _stale and time.monotonic() - _checked_at < ACL_REFRESH_SECONDS:
+            return _acl
+
+        with SessionLocal() as db:
+            version = _version(db)
+            if version is None:
+                try:
+                    db.add(ACLVersion(id=1, version=0))
+                    db.commit()
+                except IntegrityError:   # another worker created it first
+                    db.rollback()
+                version = _version(db)
+
+            if _acl is None or _stale or _acl.version != version:
+                _stale = False
+                _acl = _load(db, version)
+
+        _checked_at = time.monotonic()
+        return _acl
+
+
+def invalidate_acl():
+    """Reload on the next check in this process (others follow via acl_version)."""
+    global _stale
+    _stale = True
+
+
+def bump_acl_version(connection):
+    """Tell every process its ACL and auth caches are stale, once this commits."""
+    connection.execute(update(ACLVersion).values(version=ACLVersion.version + 1))
+
+
+def _bump(mapper, connection, target):
+    bump_acl_version(connection)
+    session = Session.object_session(target)
+    if session is not None:
+        session.info["acl_changed"] = True
+
+
+for _model in (Role, Permission, RolePermission):
+    for _event in ("after_insert", "after_update", "after_delete"):
+        event.listen(_model, _event, _bump)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session):
+    if session.info.pop("acl_changed", False):
+        invalidate_acl()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_change(session):
+    session.info.pop("acl_changed", None)
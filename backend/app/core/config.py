@@ -12,6 +12,90 @@ DB_NAME = os.getenv("DB_NAME")
 # Use MySQL if all variables are provided, otherwise fallback to SQLite
 if all([DB_USER, DB_PASSWORD, DB_HOST, DB_NAME]):
     DATABASE_URL = f"mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+    ASYNC_DATABASE_URL = f"mysql+aiomysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 else:
     # Use SQLite for easier local development
-    DATABASE_URL = "sqlite:///./cubeloan360.db"
\ No newline at end of file
+    DATABASE_URL = "sqlite:///./cubeloan360.db"
+    ASYNC_DATABASE_URL = "sqlite+aiosqlite:///./cubeloan360.db"
+
+# explicit URLs win over both (bench/ points these at a scratch database)
+DATABASE_URL = os.getenv("DATABASE_URL", DATABASE_URL)
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", ASYNC_DATABASE_URL)
+
+# sync pool: size + overflow should cover Starlette's worker threads
+# (40 by default), otherwise requests queue on the pool, not the threads
+POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "30"))
+POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))   # seconds, below MySQL wait_timeout
+POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))     # seconds to wait for a connection
+
+# async engine pool: coroutines are cheap, so it can hold far more
+# connections than the sync pool behind Starlette's thread pool
+ASYNC_POOL_SIZE = int(os.getenv("DB_ASYNC_POOL_SIZE", "20"))
+ASYNC_MAX_OVERFLOW = int(os.getenv("DB_ASYNC_MAX_OVERFLOW", "80"))
+
+# SQLite tuning, applied on every new connection
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",        # readers don't block the writer
+    "synchronous": "NORMAL",      # safe with WAL, far fewer fsyncs
+    "cache_size": os.getenv("SQLITE_CACHE_SIZE", "-65536"),   # negative = KiB, 64 MiB
+    "temp_store": "MEMORY",
+    "busy_timeout": os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"),
+}
+
+# customer 360 view cache (app.utils.customer360)
+CUSTOMER_CACHE_SIZE = int(os.getenv("CUSTOMER_CACHE_SIZE", "5000"))
+CUSTOMER_CACHE_TTL = int(os.getenv("CUSTOMER_CACHE_TTL", "30"))   # seconds
+
+# get_current_user cache: decoded tokens and user snapshots; user
+# changes reach every worker via acl_version (ACL_REFRESH_SECONDS), the
+# TTL only bounds writes that skip it
+AUTH_CACHE_SIZE = int(os.getenv("AUTH_CACHE_SIZE", "10000"))
+AUTH_CACHE_TTL = int(os.getenv("AUTH_CACHE_TTL", "60"))   # seconds
+
+# how often each process checks whether roles/permissions/users changed;
+# the upper bound for a change to reach every worker
+ACL_REFRESH_SECONDS = float(os.getenv("ACL_REFRESH_SECONDS", "5"))
+
+# password hashing: bcrypt cost (log2 rounds) and the size of the
+# dedicated hashing pool; changing the cost rehashes users on login
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+HASH_WORKERS = int(os.getenv("HASH_WORKERS", "4"))
+
+# per-route latency / SQL metrics at /metrics; off means no middleware
+# and no engine listeners at all
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+
+# N+1 query detector for dev and tests: off | warn | raise. Flags any
+# statement shape run more than NPLUSONE_THRESHOLD times in one request
+NPLUSONE_MODE = os.getenv("NPLUSONE_MODE", "off").lower()
+NPLUSONE_THRESHOLD = int(os.getenv("NPLUSONE_THRESHOLD", "5"))
+
+# uploaded documents: content-addressed store on local disk (one file
+# per distinct sha256) and the largest accepted upload
+DOCUMENT_STORE_DIR = os.getenv("DOCUMENT_STORE_DIR", "document_store")
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", str(25 * 1024 * 1024)))
+
+# document processing worker (app.jobs.document_worker): pool size,
+# retry with exponential backoff, and a time limit per stage in seconds
+DOC_WORKERS = int(os.getenv("DOC_WORKERS", str(os.cpu_count() or 2)))
+DOC_POLL_SECONDS = float(os.getenv("DOC_POLL_SECONDS", "1"))
+DOC_MAX_ATTEMPTS = int(os.getenv("DOC_MAX_ATTEMPTS", "5"))
+DOC_RETRY_BASE_SECONDS = float(os.getenv("DOC_RETRY_BASE_SECONDS", "10"))
+DOC_RETRY_MAX_SECONDS = float(os.getenv("DOC_RETRY_MAX_SECONDS", "600"))
+DOC_JOB_LEASE_SECONDS = int(os.getenv("DOC_JOB_LEASE_SECONDS", "900"))   # RUNNING longer = worker died
+DOC_STAGE_TIMEOUTS = {
+    stage: float(seconds)
+    for stage, seconds in (
+        item.split("=") for item in os.getenv("DOC_STAGE_TIMEOUTS", "hash=60,normalize=120,extract=120").split(",")
+    )
+}
+
+# /kyc/bulk: rows upserted per transaction, and how many row errors
+# the report lists in full (the count is always exact)
+KYC_BULK_BATCH = int(os.getenv("KYC_BULK_BATCH", "5000"))
+KYC_BULK_MAX_ERRORS = int(os.getenv("KYC_BULK_MAX_ERRORS", "1000"))
+
+# credit risk policy (app.core.credit_policy shape) as a JSON file;
+# unset means the built-in policy
+CREDIT_POLICY_FILE = os.getenv("CREDIT_POLICY_FILE")
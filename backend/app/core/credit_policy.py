@@ -0,0 +1,42 @@
+# Risk grading policy, evaluated by app.utils.credit_rules.
+#
+# Grades run best to worst. Every rule whose conditions all hold puts
+# the application at (at least) its grade; the worst matched grade wins
+# and LOW is the default. Conditions are [field, operator, value] with
+# fields cibil_score, foir (percent), monthly_income,
+# existing_obligations, employment_type and operators < <= > >= == !=
+# in not_in missing. employment_type takes only == != in not_in missing
+# and matches in normalize_employment_type form (Self-Employed is
+# SELF_EMPLOYED, Business Owner is BUSINESS). A JSON file of the same
+# shape can replace this one through CREDIT_POLICY_FILE.
+
+CREDIT_POLICY = {
+    "version": "2026-10",
+    "grades": ["LOW", "MEDIUM", "HIGH", "REJECT"],
+    "decisions": {
+        "LOW": "APPROVE",
+        "MEDIUM": "APPROVE",
+        "HIGH": "REFER",
+        "REJECT": "REJECT",
+    },
+    "rules": [
+        # hard stops
+        {"name": "cibil_below_650", "grade": "REJECT", "when": [["cibil_score", "<", 650]]},
+        {"name": "foir_above_65", "grade": "REJECT", "when": [["foir", ">", 65]]},
+        {"name": "income_below_15k", "grade": "REJECT", "when": [["monthly_income", "<", 15000]]},
+
+        # manual review
+        {"name": "no_bureau_score", "grade": "HIGH", "when": [["cibil_score", "missing", None]]},
+        {"name": "cibil_650_699", "grade": "HIGH", "when": [["cibil_score", "<", 700]]},
+        {"name": "foir_55_65", "grade": "HIGH", "when": [["foir", ">", 55]]},
+        {"name": "self_employed_foir_above_45", "grade": "HIGH", "when": [
+            ["employment_type", "in", ["SELF_EMPLOYED", "BUSINESS"]], ["foir", ">", 45]
+        ]},
+
+        # approve with care
+        {"name": "cibil_700_749", "grade": "MEDIUM", "when": [["cibil_score", "<", 750]]},
+        {"name": "foir_40_55", "grade": "MEDIUM", "when": [["foir", ">", 40]]},
+        {"name": "income_below_30k", "grade": "MEDIUM", "when": [["monthly_income", "<", 30000]]},
+        {"name": "not_salaried", "grade": "MEDIUM", "when": [["employment_type", "not_in", ["SALARIED"]]]},
+    ],
+}
@@ -1,8 +1,47 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.orm import sessionmaker, declarative_base
-from .config import DATABASE_URL
+from .config import (
+    DATABASE_URL, ASYNC_DATABASE_URL,
+    POOL_SIZE, MAX_OVERFLOW, POOL_RECYCLE, POOL_TIMEOUT,
+    ASYNC_POOL_SIZE, ASYNC_MAX_OVERFLOW,
+    SQLITE_PRAGMAS
+)
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    for name, value in SQLITE_PRAGMAS.items():
+        cursor.execute(f"PRAGMA {name}={value}")
+    cursor.close()
+
+
+# peak checked-out connections per engine, for sizing the pools
+_peak_checked_out = {}
+
 
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
+def _tune(sync_engine, name):
+    if sync_engine.dialect.name == "sqlite":
+        event.listen(sync_engine, "connect", _apply_sqlite_pragmas)
+
+    _peak_checked_out[name] = 0
+
+    @event.listens_for(sync_engine, "checkout")
+    def track_peak(dbapi_connection, connection_record, connection_proxy):
+        checked_out = sync_engine.pool.checkedout()
+        if checked_out > _peak_checked_out[name]:
+            _peak_checked_out[name] = checked_out
+
+
+engine = create_engine(
+    DATABASE_URL,
+    pool_pre_ping=True,
+    pool_size=POOL_SIZE,
+    max_overflow=MAX_OVERFLOW,
+    pool_recycle=POOL_RECYCLE,
+    pool_timeout=POOL_TIMEOUT
+)
+_tune(engine, "sync")
 
 SessionLocal = sessionmaker(
     autocommit=False,
@@ -10,6 +49,24 @@ SessionLocal = sessionmaker(
     bind=engine
 )
 
+# async stack for I/O-bound read routes; coexists with the sync one
+# above while routers migrate (same database, separate pool)
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    pool_pre_ping=True,
+    pool_size=ASYNC_POOL_SIZE,
+    max_overflow=ASYNC_MAX_OVERFLOW,
+    pool_recycle=POOL_RECYCLE,
+    pool_timeout=POOL_TIMEOUT
+)
+_tune(async_engine.sync_engine, "async")
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False
+)
+
 
 Base = declarative_base()
 
@@ -19,3 +76,26 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def pool_status():
+    """Connection usage of both pools against their configured capacity."""
+    status = {}
+    for name, eng, size, overflow in (
+        ("sync", engine, POOL_SIZE, MAX_OVERFLOW),
+        ("async", async_engine.sync_engine, ASYNC_POOL_SIZE, ASYNC_MAX_OVERFLOW),
+    ):
+        pool = eng.pool
+        status[name] = {
+            "capacity": size + overflow,
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "peak_checked_out": _peak_checked_out[name],
+        }
+    return status
@@ -1,71 +1,132 @@
+import time
+from dataclasses import dataclass
+from typing import Optional
+
 from fastapi import Depends, HTTPException
 from jose import jwt, JWTError
+from sqlalchemy import event, inspect
 from sqlalchemy.orm import Session
 
-from app.core.database import SessionLocal
+from app.core.acl import bump_acl_version, current_acl
+from app.core.config import AUTH_CACHE_SIZE, AUTH_CACHE_TTL
+from app.core.database import get_db
 from app.core.security import SECRET_KEY, ALGORITHM
-from app.models.user import User, Role
+from app.models.user import User
+from app.utils.cache import TTLCache
 
 
-# ---------- DB SESSION ----------
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+# ---------- AUTH CACHE ----------
+# token -> user id (never outlives the token's exp) and
+# (acl version, user id) -> snapshot, so a warm request runs no user
+# query. Changing a user's role or active flag, or deleting the user,
+# bumps acl_version in the database like a role change does, so every
+# process stops using its old snapshots within ACL_REFRESH_SECONDS.
+# Other edits (name, email, password) and SQL that skips
+# bump_acl_version reach other workers within AUTH_CACHE_TTL.
 
+@dataclass(frozen=True)
+class CurrentUser:
+    id: int
+    role_id: Optional[int]
+    full_name: str
+    email: str
+    is_active: bool
 
-# ---------- CURRENT USER FROM TOKEN ----------
-def get_current_user(token: str, db: Session = Depends(get_db)):
+
+_tokens = TTLCache(AUTH_CACHE_SIZE, AUTH_CACHE_TTL)
+_users = TTLCache(AUTH_CACHE_SIZE, AUTH_CACHE_TTL)
+
+
+def auth_cache_stats():
+    return {"tokens": _tokens.stats(), "users": _users.stats()}
+
+
+# what a snapshot's access decisions depend on; other edits (e.g. the
+# rehash on login) must not flush every worker's caches
+AUTH_COLUMNS = ("role_id", "is_active")
+
+
+def _bump(connection, target):
+    # same transaction as the change; this process reloads on commit
+    bump_acl_version(connection)
+    session = Session.object_session(target)
+    if session is not None:
+        session.info["acl_changed"] = True
+
+
+@event.listens_for(User, "after_update")
+def _user_updated(mapper, connection, target):
+    state = inspect(target)
+    if any(state.attrs[name].history.has_changes() for name in AUTH_COLUMNS):
+        _bump(connection, target)
+
+
+@event.listens_for(User, "after_delete")
+def _user_deleted(mapper, connection, target):
+    _bump(connection, target)
+
+
+def _token_user_id(token: str):
+    user_id = _tokens.get(token)
+    if user_id is not None:
+        return user_id
 
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         user_id = int(payload.get("sub"))
-    except JWTError:
+    except (JWTError, TypeError, ValueError):
         raise HTTPException(401, "Invalid token")
 
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
-        raise HTTPException(401, "User not found")
+    exp = payload.get("exp")
+    ttl = exp - time.time() if exp else None
+    _tokens.set(token, user_id, ttl)
+    return user_id
+
+
+# ---------- CURRENT USER FROM TOKEN ----------
+def get_current_user(token: str, db: Session = Depends(get_db)):
+
+    user_id = _token_user_id(token)
+
+    key = (current_acl().version, user_id)
+    user = _users.get(key)
+    if user is None:
+        row = db.query(User).filter(User.id == user_id).first()
+        if not row:
+            raise HTTPException(401, "User not found")
+
+        user = CurrentUser(
+            id=row.id,
+            role_id=row.role_id,
+            full_name=row.full_name,
+            email=row.email,
+            is_active=bool(row.is_active)
+        )
+        _users.set(key, user)
+
+    if not user.is_active:
+        raise HTTPException(401, "User inactive")
 
     return user
 
 
 # ---------- ROLE CHECK ----------
 def require_role(role_name: str):
-    def checker(
-        user: User = Depends(get_current_user),
-        db: Session = Depends(get_db)
-    ):
-        role = db.query(Role).filter(Role.id == user.role_id).first()
-
-        if not role or role.name != role_name:
+    def checker(user: CurrentUser = Depends(get_current_user)):
+        if current_acl().roles.get(user.role_id) != role_name:
             raise HTTPException(403, "Permission denied")
 
         return user
 
     return checker
 
-from app.models.permission import Permission, RolePermission
-
 
+# ---------- PERMISSION CHECK ----------
 def require_permission(permission_name: str):
-    def checker(user=Depends(get_current_user), db: Session = Depends(get_db)):
-
-        perm = (
-            db.query(Permission)
-            .join(RolePermission, RolePermission.permission_id == Permission.id)
-            .filter(
-                RolePermission.role_id == user.role_id,
-                Permission.name == permission_name
-            )
-            .first()
-        )
-
-        if not perm:
+    def checker(user: CurrentUser = Depends(get_current_user)):
+        if permission_name not in current_acl().permissions.get(user.role_id, ()):
             raise HTTPException(403, "Permission denied")
 
         return user
 
-    return checker
\ No newline at end of file
+    return checker
@@ -0,0 +1,180 @@
+import threading
+import time
+from contextvars import ContextVar
+
+from sqlalchemy import event
+
+# ------------------------------
+# PER-ROUTE METRICS (Prometheus text format)
+# ------------------------------
+# MetricsMiddleware times every request and labels it with the route
+# template (/servicing/timeline/{loan_account_id}), not the raw path.
+# Nothing is registered unless METRICS_ENABLED is set (see main.py).
+# SQL statements are attributed to the request through a context var,
+# which Starlette copies into the worker thread of sync routes.
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 500)
+
+
+class _Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.sum += value
+        self.count += 1
+
+
+class _RequestStats:
+    __slots__ = ("scope", "queries", "db_time", "started")
+
+    def __init__(self, scope):
+        self.scope = scope
+        self.queries = 0
+        self.db_time = 0.0
+        self.started = None
+
+
+_current = ContextVar("request_stats", default=None)
+_lock = threading.Lock()
+
+_active = set()     # _RequestStats of requests being served
+_requests = {}      # (method, route, status) -> count
+_latency = {}       # (method, route) -> _Histogram
+_queries = {}       # (method, route) -> _Histogram of statements per request
+_db_time = {}       # (method, route) -> seconds
+
+
+def _before_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    if stats is not None:
+        stats.started = time.perf_counter()
+
+
+def _after_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    if stats is not None and stats.started is not None:
+        stats.queries += 1
+        stats.db_time += time.perf_counter() - stats.started
+        stats.started = None
+
+
+def instrument_engine(sync_engine):
+    event.listen(sync_engine, "before_cursor_execute", _before_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_execute)
+
+
+def _key(scope):
+    # FastAPI stores the matched APIRoute in the scope while routing
+    route = scope.get("route")
+    return scope["method"], route.path if route is not None else "<unmatched>"
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency, status, in-flight and SQL per route."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] == "/metrics":
+            await self.app(scope, receive, send)
+            return
+
+        stats = _RequestStats(scope)
+        token = _current.set(stats)
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        with _lock:
+            _active.add(stats)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            _current.reset(token)
+            key = _key(scope)
+
+            with _lock:
+                _active.discard(stats)
+                counter = key + (str(status),)
+                _requests[counter] = _requests.get(counter, 0) + 1
+                _latency.setdefault(key, _Histogram(LATENCY_BUCKETS)).observe(elapsed)
+                _queries.setdefault(key, _Histogram(QUERY_BUCKETS)).observe(stats.queries)
+                _db_time[key] = _db_time.get(key, 0.0) + stats.db_time
+
+
+# ------------------------------
+# EXPOSITION
+# ------------------------------
+def _labels(method, route, **extra):
+    labels = {"method": method, "route": route, **extra}
+    body = ",".join(
+        f'{k}="{str(v).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+        for k, v in labels.items()
+    )
+    return "{" + body + "}"
+
+
+def _histogram_lines(name, series):
+    for (method, route), h in sorted(series.items()):
+        cumulative = 0
+        for bound, count in zip(h.buckets, h.counts):
+            cumulative += count
+            yield f"{name}_bucket{_labels(method, route, le=bound)} {cumulative}"
+        yield f"{name}_bucket{_labels(method, route, le='+Inf')} {h.count}"
+        yield f"{name}_sum{_labels(method, route)} {h.sum}"
+        yield f"{name}_count{_labels(method, route)} {h.count}"
+
+
+def render_metrics():
+    with _lock:
+        lines = [
+            "# HELP http_requests_total Requests by route template and status.",
+            "# TYPE http_requests_total counter",
+        ]
+        for (method, route, status), count in sorted(_requests.items()):
+            lines.append(f"http_requests_total{_labels(method, route, status=status)} {count}")
+
+        lines += [
+            "# HELP http_requests_in_flight Requests currently being served.",
+            "# TYPE http_requests_in_flight gauge",
+        ]
+        in_flight = {key: 0 for key in _latency}
+        for stats in _active:
+            key = _key(stats.scope)
+            in_flight[key] = in_flight.get(key, 0) + 1
+        for (method, route), count in sorted(in_flight.items()):
+            lines.append(f"http_requests_in_flight{_labels(method, route)} {count}")
+
+        lines += [
+            "# HELP http_request_duration_seconds Request latency.",
+            "# TYPE http_request_duration_seconds histogram",
+            *_histogram_lines("http_request_duration_seconds", _latency),
+            "# HELP db_queries_per_request SQL statements executed per request.",
+            "# TYPE db_queries_per_request histogram",
+            *_histogram_lines("db_queries_per_request", _queries),
+            "# HELP db_query_seconds_total Time spent executing SQL.",
+            "# TYPE db_query_seconds_total counter",
+        ]
+        for (method, route), seconds in sorted(_db_time.items()):
+            lines.append(f"db_query_seconds_total{_labels(method, route)} {seconds}")
+
+    return "\n".join(lines) + "\n"
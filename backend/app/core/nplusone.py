@@ -0,0 +1,118 @@
+import logging
+import os
+import re
+import sysconfig
+import traceback
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+# ------------------------------
+# N+1 QUERY DETECTOR (dev / test)
+# ------------------------------
+# Fingerprints every statement run while a request (or a ``watch``
+# block) is active. A fingerprint seen more than NPLUSONE_THRESHOLD
+# times means a query issued in a loop: "warn" logs the route and the
+# app call site once, "raise" fails the statement with NPlusOneError.
+
+_THIS_FILE = os.path.abspath(__file__)
+_LIBRARY_DIRS = tuple({sysconfig.get_paths()["stdlib"], sysconfig.get_paths()["purelib"], sysconfig.get_paths()["platlib"]})
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_PARAM_LISTS = re.compile(r"\((?:\s*(?:\?|%s|%\(\w+\)s)\s*,?)+\)")
+_SPACE = re.compile(r"\s+")
+
+
+class NPlusOneError(AssertionError):
+    pass
+
+
+class _Watch:
+    __slots__ = ("label", "scope", "threshold", "mode", "counts", "flagged")
+
+    def __init__(self, label, threshold, mode, scope=None):
+        self.label = label
+        self.scope = scope
+        self.threshold = threshold
+        self.mode = mode
+        self.counts = {}
+        self.flagged = []     # (fingerprint, count, call site)
+
+
+_current = ContextVar("nplusone_watch", default=None)
+
+
+def fingerprint(statement: str):
+    """Statement shape with literals and expanded IN lists folded away."""
+    shape = _LITERALS.sub("?", statement)
+    shape = _PARAM_LISTS.sub("(?)", shape)
+    return _SPACE.sub(" ", shape).strip()
+
+
+def _call_site():
+    # innermost frame outside the stdlib, installed packages and this module
+    for frame in reversed(traceback.extract_stack()):
+        path = os.path.abspath(frame.filename)
+        if path != _THIS_FILE and not path.startswith(_LIBRARY_DIRS) and not frame.filename.startswith("<"):
+            return f"{os.path.relpath(path)}:{frame.lineno} in {frame.name}"
+    return "<unknown>"
+
+
+def _before_execute(conn, cursor, statement, parameters, context, executemany):
+    watch = _current.get()
+    if watch is None:
+        return
+
+    shape = fingerprint(statement)
+    count = watch.counts.get(shape, 0) + 1
+    watch.counts[shape] = count
+    if count != watch.threshold + 1:
+        return
+
+    label = watch.label
+    route = watch.scope.get("route") if watch.scope is not None else None
+    if route is not None:
+        label = f"{watch.scope['method']} {route.path}"
+
+    site = _call_site()
+    watch.flagged.append((shape, count, site))
+    message = f"N+1 query in {label}: repeated >{watch.threshold} times at {site}: {shape[:200]}"
+    if watch.mode == "raise":
+        raise NPlusOneError(message)
+    logger.warning(message)
+
+
+def instrument_engine(sync_engine):
+    if not event.contains(sync_engine, "before_cursor_execute", _before_execute):
+        event.listen(sync_engine, "before_cursor_execute", _before_execute)
+
+
+@contextmanager
+def watch(label: str, threshold: int = 5, mode: str = "raise", scope=None):
+    """Watch the statements run in this block; yields the _Watch for inspection."""
+    state = _Watch(label, threshold, mode, scope)
+    token = _current.set(state)
+    try:
+        yield state
+    finally:
+        _current.reset(token)
+
+
+class NPlusOneMiddleware:
+    """Run every HTTP request under ``watch``, labelled with its route."""
+
+    def __init__(self, app, threshold: int, mode: str):
+        self.app = app
+        self.threshold = threshold
+        self.mode = mode
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with watch(f"{scope['method']} {scope['path']}", self.threshold, self.mode, scope):
+            await self.app(scope, receive, send)
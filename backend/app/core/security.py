@@ -1,24 +1,55 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from jose import jwt
-from passlib.context import CryptContext
+import bcrypt
+
+from app.core.config import BCRYPT_ROUNDS, HASH_WORKERS
 
 SECRET_KEY = "CHANGE_THIS_TO_RANDOM_LONG_SECRET"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# bcrypt is deliberately slow; it gets its own small pool so a login
+# storm queues here instead of taking every request worker thread
+_hash_pool = ThreadPoolExecutor(max_workers=HASH_WORKERS, thread_name_prefix="bcrypt")
+
+
+def _secret(password: str):
+    return password.encode("utf-8")[:72]   # bcrypt only uses the first 72 bytes
 
 
 def hash_password(password: str):
-    return pwd_context.hash(password)
+    return bcrypt.hashpw(_secret(password), bcrypt.gensalt(BCRYPT_ROUNDS)).decode()
 
 
 def verify_password(password: str, hashed: str):
-    return pwd_context.verify(password, hashed)
+    try:
+        return bcrypt.checkpw(_secret(password), hashed.encode())
+    except ValueError:   # not a bcrypt hash
+        return False
+
+
+def needs_rehash(hashed: str):
+    # $2b$<cost>$<salt+hash>
+    try:
+        return int(hashed.split("$")[2]) != BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return True
+
+
+async def hash_password_async(password: str):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hash_pool, hash_password, password)
+
+
+async def verify_password_async(password: str, hashed: str):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hash_pool, verify_password, password, hashed)
 
 
 def create_access_token(data: dict):
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
-    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
\ No newline at end of file
+    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
@@ -0,0 +1,36 @@
+"""
+Nightly DPD aging snapshot.
+
+    python -m app.jobs.aging_snapshot [--date YYYY-MM-DD]
+
+Buckets the overdue EMI schedule as of the given date (default today)
+into dpd_snapshots. Re-running for the same date replaces its rows.
+"""
+import argparse
+from datetime import date
+
+from app.core.database import Base, SessionLocal, engine
+from app import models  # noqa: F401
+from app.utils.dpd import take_snapshot
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--date", type=date.fromisoformat, default=date.today())
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+
+    db = SessionLocal()
+    try:
+        totals = take_snapshot(db, args.date)
+    finally:
+        db.close()
+
+    print(f"snapshot {args.date}")
+    for bucket, values in totals.items():
+        print(f"  {bucket:<10} loans={values['loans']} installments={values['installments']} amount={values['amount']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+Document processing worker.
+
+    python -m app.jobs.document_worker [--workers N] [--drain]
+
+Polls document_jobs, runs each claimed document through the stages in
+app.utils.docproc on a process pool of ``--workers`` (DOC_WORKERS), and
+writes stage / percent into processing_progress as they go. Failed
+attempts are retried with exponential backoff (DOC_RETRY_BASE_SECONDS,
+doubling up to DOC_RETRY_MAX_SECONDS) until DOC_MAX_ATTEMPTS, then the
+document is marked FAILED. Stage time limits come from
+DOC_STAGE_TIMEOUTS ("hash=60,normalize=120,extract=120").
+
+Several workers can run against the same database. Jobs held by a
+worker that stopped heartbeating for DOC_JOB_LEASE_SECONDS are
+requeued. If a pool process dies (OOM kill, segfault) the pool is
+rebuilt and its in-flight jobs are retried like any failed attempt.
+A stage that runs past its time limit is not retried: the same file
+would time out again. ``--drain`` exits once nothing is queued or
+running, instead of polling forever.
+"""
+import argparse
+import logging
+import multiprocessing as mp
+import os
+import queue
+import socket
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from sqlalchemy import func, select
+
+from app.core.config import (
+    DOC_WORKERS, DOC_POLL_SECONDS, DOC_JOB_LEASE_SECONDS, DOC_STAGE_TIMEOUTS
+)
+from app.core.database import Base, SessionLocal, engine
+from app import models  # noqa: F401
+from app.models.document import Document
+from app.models.processing import DocumentJob
+from app.utils.blobstore import document_store
+from app.utils.docproc import StageTimeout, init_worker, process_document
+from app.utils.document_jobs import (
+    claim, complete, enqueue_pending, record_progress, release, renew, requeue_stale, retry_or_fail
+)
+
+logger = logging.getLogger(__name__)
+
+SWEEP_SECONDS = 60
+
+
+def _flush_progress(db, progress_queue):
+    # latest report per document only
+    latest = {}
+    while True:
+        try:
+            document_id, stage, percent = progress_queue.get_nowait()
+        except queue.Empty:
+            break
+        latest[document_id] = (stage, percent)
+
+    for document_id, (stage, percent) in latest.items():
+        document = db.get(Document, document_id)
+        # reports can trail the result; never overwrite COMPLETED / FAILED
+        if document is not None and document.processing_status == "PROCESSING":
+            record_progress(db, document, stage, percent)
+    if latest:
+        db.commit()
+
+
+def _finish(db, job_id, future):
+    job = db.get(DocumentJob, job_id)
+    document = db.get(Document, job.document_id)
+    try:
+        result, timings = future.result()
+    except Exception as exc:
+        # a time limit is deterministic for a given file: no retry
+        retryable = not isinstance(exc, StageTimeout)
+        retry_or_fail(db, job, document, f"{type(exc).__name__}: {exc}", retryable)
+        logger.warning("job %d document %d: attempt %d failed: %s: %s",
+                       job_id, document.id, job.attempts, type(exc).__name__, exc)
+        return
+    complete(db, job, document, timings)
+    logger.info("job %d document %d: done in %.2fs %s %s",
+                job_id, document.id, sum(timings.values()), timings, result)
+
+
+def _idle(db):
+    return not db.scalar(
+        select(func.count(DocumentJob.id)).where(DocumentJob.status.in_(["QUEUED", "RUNNING"]))
+    )
+
+
+def _start_pool(workers):
+    # a fresh queue too: a process that died mid-put can leave the old
+    # one's lock held
+    progress_queue = mp.get_context().Queue()
+    pool = ProcessPoolExecutor(workers, initializer=init_worker, initargs=(progress_queue,))
+    return pool, progress_queue
+
+
+def run(workers, drain=False, poll=DOC_POLL_SECONDS, timeouts=DOC_STAGE_TIMEOUTS):
+    worker = f"{socket.gethostname()}:{os.getpid()}"
+    pool, progress_queue = _start_pool(workers)
+    running = {}            # future -> job id
+    last_sweep = last_renew = 0.0
+
+    db = SessionLocal()
+    try:
+        while True:
+            now = time.monotonic()
+            if now - last_sweep >= SWEEP_SECONDS:
+                enqueue_pending(db)
+                requeue_stale(db, DOC_JOB_LEASE_SECONDS)
+                last_sweep = now
+            if running and now - last_renew >= DOC_JOB_LEASE_SECONDS / 3:
+                renew(db, worker)
+                last_renew = now
+
+            broken = False
+            claimed = claim(db, worker, workers - len(running))
+            for i, job in enumerate(claimed):
+                try:
+                    future = pool.submit(
+                        process_document, job.document_id, document_store.path(job.content_hash),
+                        job.content_hash, job.size_bytes, timeouts
+                    )
+                except BrokenProcessPool:
+                    release(db, [j.job_id for j in claimed[i:]])
+                    broken = True
+                    break
+                running[future] = job.job_id
+
+            if running:
+                done, _ = wait(running, timeout=poll, return_when=FIRST_COMPLETED)
+                if not broken:
+                    _flush_progress(db, progress_queue)
+                for future in done:
+                    # a dead pool process fails every future still in the pool
+                    broken |= isinstance(future.exception(), BrokenProcessPool)
+                    _finish(db, running.pop(future), future)
+            elif drain and _idle(db):
+                break
+            else:
+                time.sleep(poll)
+
+            if broken:
+                # every in-flight future has failed by now; the jobs are
+                # back in the queue, start over with new processes
+                for future in list(running):
+                    _finish(db, running.pop(future), future)
+                logger.error("pool process died; restarting the pool")
+                pool.shutdown(wait=False, cancel_futures=True)
+                pool, progress_queue = _start_pool(workers)
+    finally:
+        pool.shutdown()
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=DOC_WORKERS)
+    parser.add_argument("--drain", action="store_true", help="exit when the queue is empty")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    Base.metadata.create_all(bind=engine)
+    run(args.workers, drain=args.drain)
+
+
+if __name__ == "__main__":
+    main()
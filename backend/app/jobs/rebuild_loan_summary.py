@@ -0,0 +1,42 @@
+"""
+Recompute loan_summaries from the source tables and report drift.
+
+    python -m app.jobs.rebuild_loan_summary [--dry-run]
+
+Exits non-zero when drift was found, so it can run as a nightly check.
+"""
+import argparse
+
+from app.core.database import Base, SessionLocal, engine
+from app import models  # noqa: F401
+from app.utils.loan_summary import rebuild_summaries
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dry-run", action="store_true", help="report drift without fixing it")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+
+    db = SessionLocal()
+    try:
+        report = rebuild_summaries(db, fix=not args.dry_run)
+    finally:
+        db.close()
+
+    print(f"accounts: {report['accounts']}")
+    print(f"missing summaries: {len(report['missing'])}")
+    print(f"orphaned summaries: {len(report['orphaned'])}")
+    print(f"drifted summaries: {len(report['drifted'])}")
+
+    for account_id, diff in sorted(report["drifted"].items()):
+        for field, values in diff.items():
+            print(f"  {account_id} {field}: stored={values['stored']} expected={values['expected']}")
+
+    if report["missing"] or report["orphaned"] or report["drifted"]:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,11 @@
 from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from app.core.database import Base, engine
+from fastapi.responses import PlainTextResponse
+from anyio import to_thread
+from app.core.config import METRICS_ENABLED, NPLUSONE_MODE, NPLUSONE_THRESHOLD
+from app.core.database import Base, engine, async_engine, pool_status
+from app.core.metrics import MetricsMiddleware, instrument_engine, render_metrics
+from app.core import nplusone
 from app import models
 from app.models.payment import Payment
 from app.routes import auth, onboarding, kyc, document, credit, approval, disbursement, servicing, recovery
@@ -15,6 +20,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
 # register routers AFTER app exists
@@ -28,9 +34,33 @@ app.include_router(disbursement.router)
 app.include_router(servicing.router)
 app.include_router(recovery.router)
 
+# per-route latency, status, in-flight and SQL counts
+if METRICS_ENABLED:
+    instrument_engine(engine)
+    instrument_engine(async_engine.sync_engine)
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/metrics", include_in_schema=False)
+    def metrics():
+        return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+# dev/test: flag statements repeated in a loop within one request
+if NPLUSONE_MODE in ("warn", "raise"):
+    nplusone.instrument_engine(engine)
+    nplusone.instrument_engine(async_engine.sync_engine)
+    app.add_middleware(nplusone.NPlusOneMiddleware, threshold=NPLUSONE_THRESHOLD, mode=NPLUSONE_MODE)
+
 # create tables (dev only)
 Base.metadata.create_all(bind=engine)
 
 @app.get("/")
 def root():
-    return {"message": "CubeLoan360 backend running"}
\ No newline at end of file
+    return {"message": "CubeLoan360 backend running"}
+
+@app.get("/db/pool")
+async def db_pool():
+    # size the sync pool (DB_POOL_SIZE + DB_MAX_OVERFLOW) against the worker threads
+    return {
+        "worker_threads": to_thread.current_default_thread_limiter().total_tokens,
+        "pools": pool_status()
+    }
@@ -0,0 +1,50 @@
+"""
+One-off migrations for existing databases (create_all only builds new
+tables). Each mNNN module exposes upgrade(bind=engine) and
+downgrade(bind=engine) and runs as
+
+    python -m app.migrations.mNNN_name [--downgrade]
+"""
+import argparse
+
+from app.core.database import engine
+
+
+def cli(upgrade, downgrade, upgraded: str, downgraded: str):
+    """The ``__main__`` of a migration module."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--downgrade", action="store_true")
+    args = parser.parse_args()
+
+    if args.downgrade:
+        downgrade()
+        print(downgraded)
+    else:
+        upgrade()
+        print(upgraded)
+
+
+def index_migration(models, names):
+    """
+    (upgrade, downgrade, main) for a migration that only adds indexes.
+    The definitions live on ``models``; this creates (or drops) the
+    ``names`` that are missing (or present).
+    """
+    def indexes():
+        found = {i.name: i for model in models for i in model.__table__.indexes}
+        return [found[name] for name in names]
+
+    def upgrade(bind=engine):
+        for index in indexes():
+            index.create(bind=bind, checkfirst=True)
+
+    def downgrade(bind=engine):
+        for index in reversed(indexes()):
+            index.drop(bind=bind, checkfirst=True)
+
+    def main():
+        cli(upgrade, downgrade,
+            f"created {len(names)} indexes (skipping existing)",
+            f"dropped {len(names)} indexes (skipping missing)")
+
+    return upgrade, downgrade, main
@@ -0,0 +1,42 @@
+"""
+Indexes for the servicing, recovery and onboarding hot paths.
+
+    python -m app.migrations.m001_hot_path_indexes [--downgrade]
+
+create_all only builds indexes for new tables, so existing databases
+need this once. The index definitions live on the models; this only
+creates (or drops) the ones that are missing (or present).
+"""
+from app.migrations import index_migration
+from app.models.application import LoanApplication
+from app.models.customer import CustomerAddress, EmploymentDetails
+from app.models.disbursement import LoanAccount, EMISchedule
+from app.models.document import Document
+from app.models.kyc import KYCRecord
+from app.models.payment import Payment
+from app.models.recovery import RecoveryAction
+
+INDEXES = [
+    "ix_emi_schedules_loan_installment",
+    "ix_emi_schedules_overdue",
+    "ix_payments_loan_date_status",
+    "ix_recovery_actions_loan_id",
+    "ix_loan_accounts_application_id",
+    "ix_documents_customer_id",
+    "ix_kyc_records_customer_id",
+    "ix_loan_applications_customer_id",
+    "ix_customer_addresses_customer_id",
+    "ix_employment_details_customer_id",
+]
+
+TABLES = [
+    EMISchedule, Payment, RecoveryAction, LoanAccount, Document,
+    KYCRecord, LoanApplication, CustomerAddress, EmploymentDetails,
+]
+
+
+upgrade, downgrade, main = index_migration(TABLES, INDEXES)
+
+
+if __name__ == "__main__":
+    main()
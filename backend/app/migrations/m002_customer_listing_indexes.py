@@ -0,0 +1,22 @@
+"""
+Indexes for the paginated /onboarding/customers listing.
+
+    python -m app.migrations.m002_customer_listing_indexes [--downgrade]
+
+Same approach as m001: the definitions live on Customer, this creates
+(or drops) the ones missing (or present) on an existing database.
+"""
+from app.migrations import index_migration
+from app.models.customer import Customer
+
+INDEXES = [
+    "ix_customers_status_id",
+    "ix_customers_created_at_id",
+]
+
+
+upgrade, downgrade, main = index_migration([Customer], INDEXES)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Search keys and indexes behind /onboarding/search.
+
+    python -m app.migrations.m003_customer_search [--downgrade]
+
+Adds customers.mobile_normalized and kyc_records.pan_normalized if
+missing and backfills them, creates their indexes, then the name index:
+FULLTEXT on MySQL, the FTS5 table and its sync triggers on SQLite
+(rebuilt from the existing rows). Downgrade drops the indexes and the
+FTS table but keeps the two columns.
+"""
+from sqlalchemy import bindparam, inspect, select, text, update
+
+from app.core.database import engine
+from app.migrations import cli
+from app.models.customer import Customer, CUSTOMER_NAME_FTS
+from app.models.kyc import KYCRecord
+from app.utils.normalize import normalize_mobile, normalize_pan
+
+BATCH = 5000
+
+COLUMNS = [
+    (Customer, "mobile_normalized", "mobile_number", normalize_mobile),
+    (KYCRecord, "pan_normalized", "pan_number", normalize_pan),
+]
+
+INDEXES = [
+    (Customer, "ix_customers_mobile_normalized"),
+    (KYCRecord, "ix_kyc_records_pan_normalized"),
+    (Customer, "ft_customers_name"),   # MySQL only
+]
+
+SQLITE_DROP = [
+    "DROP TRIGGER IF EXISTS customers_fts_ai",
+    "DROP TRIGGER IF EXISTS customers_fts_ad",
+    "DROP TRIGGER IF EXISTS customers_fts_au",
+    "DROP TABLE IF EXISTS customer_name_fts",
+]
+
+
+def _index(model, name):
+    return next(i for i in model.__table__.indexes if i.name == name)
+
+
+def _backfill(conn, model, column, source, normalize):
+    table = model.__table__
+    last = 0
+    while True:
+        rows = conn.execute(
+            select(table.c.id, table.c[source])
+            .where(table.c.id > last, table.c[source].is_not(None))
+            .order_by(table.c.id)
+            .limit(BATCH)
+        ).all()
+        if not rows:
+            return
+        conn.execute(
+            update(table).where(table.c.id == bindparam("row_id")).values({column: bindparam("value")}),
+            [{"row_id": row_id, "value": normalize(value)} for row_id, value in rows]
+        )
+        last = rows[-1][0]
+
+
+def upgrade(bind=engine):
+    with bind.begin() as conn:
+        inspector = inspect(conn)
+        for model, column, source, normalize in COLUMNS:
+            table = model.__tablename__
+            if column not in {c["name"] for c in inspector.get_columns(table)}:
+                ddl_type = model.__table__.c[column].type.compile(dialect=conn.dialect)
+                conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl_type}"))
+            _backfill(conn, model, column, source, normalize)
+
+        for model, name in INDEXES:
+            if name.startswith("ft_") and conn.dialect.name != "mysql":
+                continue
+            _index(model, name).create(bind=conn, checkfirst=True)
+
+        if conn.dialect.name == "sqlite":
+            for ddl in CUSTOMER_NAME_FTS:
+                conn.execute(ddl)
+            conn.execute(text("INSERT INTO customer_name_fts(customer_name_fts) VALUES ('rebuild')"))
+
+
+def downgrade(bind=engine):
+    with bind.begin() as conn:
+        if conn.dialect.name == "sqlite":
+            for statement in SQLITE_DROP:
+                conn.execute(text(statement))
+
+        for model, name in reversed(INDEXES):
+            if name.startswith("ft_") and conn.dialect.name != "mysql":
+                continue
+            _index(model, name).drop(bind=conn, checkfirst=True)
+
+
+if __name__ == "__main__":
+    cli(upgrade, downgrade,
+        "customer search keys backfilled and indexed",
+        "dropped customer search indexes (columns kept)")
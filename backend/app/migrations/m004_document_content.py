@@ -0,0 +1,47 @@
+"""
+Content columns for documents uploaded into the document store.
+
+    python -m app.migrations.m004_document_content [--downgrade]
+
+Adds documents.content_hash / size_bytes / content_type /
+original_filename if missing and the content_hash index. Rows from
+before the streaming upload keep NULLs there: they only ever had a
+client-supplied file_path. Downgrade drops the index, not the columns.
+"""
+from sqlalchemy import inspect, text
+
+from app.core.database import engine
+from app.migrations import cli
+from app.models.document import Document
+
+COLUMNS = ["content_hash", "size_bytes", "content_type", "original_filename"]
+
+INDEXES = ["ix_documents_content_hash"]
+
+
+def _indexes():
+    found = {i.name: i for i in Document.__table__.indexes}
+    return [found[name] for name in INDEXES]
+
+
+def upgrade(bind=engine):
+    with bind.begin() as conn:
+        existing = {c["name"] for c in inspect(conn).get_columns(Document.__tablename__)}
+        for column in COLUMNS:
+            if column not in existing:
+                ddl_type = Document.__table__.c[column].type.compile(dialect=conn.dialect)
+                conn.execute(text(f"ALTER TABLE {Document.__tablename__} ADD COLUMN {column} {ddl_type}"))
+
+        for index in _indexes():
+            index.create(bind=conn, checkfirst=True)
+
+
+def downgrade(bind=engine):
+    for index in reversed(_indexes()):
+        index.drop(bind=bind, checkfirst=True)
+
+
+if __name__ == "__main__":
+    cli(upgrade, downgrade,
+        "document content columns and index in place",
+        "dropped document content index (columns kept)")
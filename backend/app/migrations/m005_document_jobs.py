@@ -0,0 +1,48 @@
+"""
+Queue table and progress columns for the document worker.
+
+    python -m app.migrations.m005_document_jobs [--downgrade]
+
+Creates document_jobs, adds processing_progress.document_id if missing
+and the processing_progress indexes. Existing PENDING documents are
+queued by the worker itself on start-up. Downgrade drops the
+document_jobs table and the indexes, not the column.
+"""
+from sqlalchemy import inspect, text
+
+from app.core.database import engine
+from app.migrations import cli
+from app.models.processing import DocumentJob, ProcessingProgress
+
+INDEXES = [
+    "ix_processing_progress_customer_id",
+    "ix_processing_progress_document_id",
+]
+
+
+def _indexes():
+    found = {i.name: i for i in ProcessingProgress.__table__.indexes}
+    return [found[name] for name in INDEXES]
+
+
+def upgrade(bind=engine):
+    with bind.begin() as conn:
+        table = ProcessingProgress.__tablename__
+        if "document_id" not in {c["name"] for c in inspect(conn).get_columns(table)}:
+            conn.execute(text(f"ALTER TABLE {table} ADD COLUMN document_id INTEGER REFERENCES documents(id)"))
+
+        for index in _indexes():
+            index.create(bind=conn, checkfirst=True)
+        DocumentJob.__table__.create(bind=conn, checkfirst=True)
+
+
+def downgrade(bind=engine):
+    DocumentJob.__table__.drop(bind=bind, checkfirst=True)
+    for index in reversed(_indexes()):
+        index.drop(bind=bind, checkfirst=True)
+
+
+if __name__ == "__main__":
+    cli(upgrade, downgrade,
+        "document_jobs and processing_progress.document_id in place",
+        "dropped document_jobs and processing_progress indexes (column kept)")
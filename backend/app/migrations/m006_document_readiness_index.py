@@ -0,0 +1,21 @@
+"""
+Covering index for the /documents/readiness aggregate.
+
+    python -m app.migrations.m006_document_readiness_index [--downgrade]
+
+Same approach as m001/m002: the definition lives on Document, this
+creates (or drops) it on an existing database.
+"""
+from app.migrations import index_migration
+from app.models.document import Document
+
+INDEXES = [
+    "ix_documents_customer_type_verified",
+]
+
+
+upgrade, downgrade, main = index_migration([Document], INDEXES)
+
+
+if __name__ == "__main__":
+    main()
@@ -10,7 +10,10 @@ from .loan import *
 from .repayment import *
 from .payment import *
 from .collection import *
+from .recovery import *
 from .audit import *
 from .permission import *
 from .processing import *
+from .loan_summary import *
+from .dpd_snapshot import *
 from .payment import Payment
\ No newline at end of file
@@ -1,11 +1,14 @@
 from sqlalchemy import Column, Integer, String, ForeignKey, DECIMAL, TIMESTAMP
+from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
+from app.models.credit import CreditReview
+from app.models.disbursement import LoanAccount
 
 class LoanApplication(Base):
     __tablename__ = "loan_applications"
     id = Column(Integer, primary_key=True)
-    customer_id = Column(Integer, ForeignKey("customers.id"))
+    customer_id = Column(Integer, ForeignKey("customers.id"), index=True)
     application_number = Column(String(50), unique=True)
     loan_type = Column(String(50))
     requested_amount = Column(DECIMAL(14,2))
@@ -13,4 +16,7 @@ class LoanApplication(Base):
     interest_rate_expected = Column(DECIMAL(5,2))
     status = Column(String(50), default="DRAFT")
     created_at = Column(TIMESTAMP, server_default=func.now())
-    updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
\ No newline at end of file
+    updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
+
+    credit_reviews = relationship(CreditReview, order_by=CreditReview.id, viewonly=True)
+    loan_accounts = relationship(LoanAccount, order_by=LoanAccount.id, viewonly=True)
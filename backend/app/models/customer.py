@@ -1,6 +1,11 @@
-from sqlalchemy import Column, Integer, String, Boolean, Date, ForeignKey, DECIMAL, TIMESTAMP
+from sqlalchemy import Column, Integer, String, Boolean, Date, ForeignKey, DECIMAL, TIMESTAMP, Index, DDL, event
+from sqlalchemy.orm import relationship, validates
 from sqlalchemy.sql import func
 from app.core.database import Base
+from app.models.application import LoanApplication
+from app.models.document import Document
+from app.models.kyc import KYCRecord
+from app.utils.normalize import normalize_mobile
 
 class Customer(Base):
     __tablename__ = "customers"
@@ -10,16 +15,68 @@ class Customer(Base):
     dob = Column(Date)
     gender = Column(String(20))
     mobile_number = Column(String(20), unique=True)
+    mobile_normalized = Column(String(10), index=True)   # search key, see validates below
     email = Column(String(120))
     otp_verified = Column(Boolean, default=False)
     status = Column(String(50), default="ONBOARDING")
     created_at = Column(TIMESTAMP, server_default=func.now())
 
+    # read side of the customer 360 view (app.utils.customer360);
+    # writes keep going through the child rows' customer_id
+    addresses = relationship("CustomerAddress", order_by="CustomerAddress.id", viewonly=True)
+    employment = relationship("EmploymentDetails", order_by="EmploymentDetails.id", viewonly=True)
+    applications = relationship(LoanApplication, order_by=LoanApplication.id, viewonly=True)
+    kyc_records = relationship(KYCRecord, order_by=KYCRecord.id, viewonly=True)
+    documents = relationship(Document, order_by=Document.id, viewonly=True)
+
+    # keyset listing: filter by status / created_at, page by id;
+    # name search is FULLTEXT on MySQL, FTS5 on SQLite (below)
+    __table_args__ = (
+        Index("ix_customers_status_id", "status", "id"),
+        Index("ix_customers_created_at_id", "created_at", "id"),
+        Index("ft_customers_name", "first_name", "last_name", mysql_prefix="FULLTEXT").ddl_if(dialect="mysql"),
+    )
+
+    @validates("mobile_number")
+    def _normalize_mobile(self, key, value):
+        self.mobile_normalized = normalize_mobile(value)
+        return value
+
+
+# SQLite name search: external-content FTS5 table over customers,
+# kept in step by triggers. Prefix indexes make "ram*" cheap.
+CUSTOMER_NAME_FTS = [
+    DDL(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS customer_name_fts USING fts5("
+        "first_name, last_name, content='customers', content_rowid='id', prefix='2 3')"
+    ),
+    DDL(
+        "CREATE TRIGGER IF NOT EXISTS customers_fts_ai AFTER INSERT ON customers BEGIN "
+        "INSERT INTO customer_name_fts(rowid, first_name, last_name) "
+        "VALUES (new.id, new.first_name, new.last_name); END"
+    ),
+    DDL(
+        "CREATE TRIGGER IF NOT EXISTS customers_fts_ad AFTER DELETE ON customers BEGIN "
+        "INSERT INTO customer_name_fts(customer_name_fts, rowid, first_name, last_name) "
+        "VALUES ('delete', old.id, old.first_name, old.last_name); END"
+    ),
+    DDL(
+        "CREATE TRIGGER IF NOT EXISTS customers_fts_au AFTER UPDATE OF first_name, last_name ON customers BEGIN "
+        "INSERT INTO customer_name_fts(customer_name_fts, rowid, first_name, last_name) "
+        "VALUES ('delete', old.id, old.first_name, old.last_name); "
+        "INSERT INTO customer_name_fts(rowid, first_name, last_name) "
+        "VALUES (new.id, new.first_name, new.last_name); END"
+    ),
+]
+
+for _ddl in CUSTOMER_NAME_FTS:
+    event.listen(Customer.__table__, "after_create", _ddl.execute_if(dialect="sqlite"))
+
 
 class CustomerAddress(Base):
     __tablename__ = "customer_addresses"
     id = Column(Integer, primary_key=True)
-    customer_id = Column(Integer, ForeignKey("customers.id"))
+    customer_id = Column(Integer, ForeignKey("customers.id"), index=True)
     street_address = Column(String(255))
     city = Column(String(80))
     state = Column(String(80))
@@ -29,7 +86,7 @@ class CustomerAddress(Base):
 class EmploymentDetails(Base):
     __tablename__ = "employment_details"
     id = Column(Integer, primary_key=True)
-    customer_id = Column(Integer, ForeignKey("customers.id"))
+    customer_id = Column(Integer, ForeignKey("customers.id"), index=True)
     employment_type = Column(String(50))
     company_name = Column(String(120))
     designation = Column(String(120))
@@ -1,13 +1,15 @@
-from sqlalchemy import Column, Integer, ForeignKey, String, Float, Date
+from sqlalchemy import Column, Integer, ForeignKey, String, Float, Date, Index
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql import text
 from app.core.database import Base
+from app.models.loan_summary import LoanSummary
 
 
 class LoanAccount(Base):
     __tablename__ = "loan_accounts"
 
     id = Column(Integer, primary_key=True, index=True)
-    application_id = Column(Integer, ForeignKey("loan_applications.id"))
+    application_id = Column(Integer, ForeignKey("loan_applications.id"), index=True)
     account_number = Column(String(50), unique=True, index=True)
 
     loan_amount = Column(Float)
@@ -21,6 +23,8 @@ class LoanAccount(Base):
     # ✅ THIS MUST EXIST (reverse side of relationship)
     disbursements = relationship("Disbursement", back_populates="loan_account")
 
+    summary = relationship(LoanSummary, uselist=False, viewonly=True)
+
 
 class Disbursement(Base):
     __tablename__ = "disbursements"
@@ -36,6 +40,16 @@ class Disbursement(Base):
 
 class EMISchedule(Base):
     __tablename__ = "emi_schedules"
+    __table_args__ = (
+        # allocation, timeline and per-loan lookups
+        Index("ix_emi_schedules_loan_installment", "loan_account_id", "installment_no"),
+        # overdue scans; partial where the backend supports it
+        Index(
+            "ix_emi_schedules_overdue", "due_date", "balance",
+            sqlite_where=text("balance > 0"),
+            postgresql_where=text("balance > 0")
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     loan_account_id = Column(Integer, ForeignKey("loan_accounts.id"))
@@ -1,13 +1,23 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, TIMESTAMP
+from sqlalchemy import Column, Integer, BigInteger, String, Boolean, ForeignKey, TIMESTAMP, Index
 from sqlalchemy.sql import func
 from app.core.database import Base
 
 class Document(Base):
     __tablename__ = "documents"
     id = Column(Integer, primary_key=True)
-    customer_id = Column(Integer, ForeignKey("customers.id"))
+    customer_id = Column(Integer, ForeignKey("customers.id"), index=True)
     document_type = Column(String(50))
-    file_path = Column(String(255))
+    file_path = Column(String(255))          # key in the document store
+    content_hash = Column(String(64), index=True)   # sha256, dedup key
+    size_bytes = Column(BigInteger)
+    content_type = Column(String(100))
+    original_filename = Column(String(255))
     uploaded_at = Column(TIMESTAMP, server_default=func.now())
     verified = Column(Boolean, default=False)
-    processing_status = Column(String(50))
\ No newline at end of file
+    processing_status = Column(String(50))
+
+    # covers the readiness aggregate (/documents/readiness) without
+    # touching the table rows
+    __table_args__ = (
+        Index("ix_documents_customer_type_verified", "customer_id", "document_type", "verified"),
+    )
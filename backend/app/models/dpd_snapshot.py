@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, String, Float, Date, TIMESTAMP, UniqueConstraint
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+# nightly aging snapshot: one row per (date, DPD bucket), see app.jobs.aging_snapshot
+class DPDSnapshot(Base):
+    __tablename__ = "dpd_snapshots"
+    __table_args__ = (
+        UniqueConstraint("snapshot_date", "bucket", name="uq_dpd_snapshot_date_bucket"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    snapshot_date = Column(Date, nullable=False, index=True)
+    bucket = Column(String(20), nullable=False)   # DPD 1-30 / DPD 31-60 / DPD 60+
+
+    installments = Column(Integer, default=0)
+    loans = Column(Integer, default=0)
+    amount = Column(Float, default=0)
+
+    created_at = Column(TIMESTAMP, server_default=func.now())
@@ -1,16 +1,24 @@
 from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, TIMESTAMP
+from sqlalchemy.orm import validates
 from sqlalchemy.sql import func
 from app.core.database import Base
+from app.utils.normalize import normalize_pan
 
 class KYCRecord(Base):
     __tablename__ = "kyc_records"
     id = Column(Integer, primary_key=True)
-    customer_id = Column(Integer, ForeignKey("customers.id"))
+    customer_id = Column(Integer, ForeignKey("customers.id"), index=True)
     pan_number = Column(String(20))
+    pan_normalized = Column(String(20), index=True)   # search key
     pan_verified = Column(Boolean, default=False)
     aadhaar_number = Column(String(20))
     aadhaar_verified = Column(Boolean, default=False)
     video_kyc_status = Column(String(50))
     cibil_score = Column(Integer)
     cibil_checked = Column(Boolean, default=False)
-    created_at = Column(TIMESTAMP, server_default=func.now())
\ No newline at end of file
+    created_at = Column(TIMESTAMP, server_default=func.now())
+
+    @validates("pan_number")
+    def _normalize_pan(self, key, value):
+        self.pan_normalized = normalize_pan(value)
+        return value
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, ForeignKey, String, Float, Date, TIMESTAMP
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+# one row per loan account, kept in step with EMISchedule and Payment
+# by disbursement and payment posting (see app.utils.loan_summary)
+class LoanSummary(Base):
+    __tablename__ = "loan_summaries"
+
+    loan_account_id = Column(Integer, ForeignKey("loan_accounts.id"), primary_key=True)
+
+    outstanding_principal = Column(Float, default=0)   # SUM(EMISchedule.principal)
+    interest_due = Column(Float, default=0)            # SUM(EMISchedule.interest)
+    outstanding_balance = Column(Float, default=0)     # SUM(EMISchedule.balance)
+    total_paid = Column(Float, default=0)              # SUM(Payment.amount) where SUCCESS
+    next_due_date = Column(Date, nullable=True)        # oldest installment with balance > 0
+
+    status = Column(String(20), index=True)            # mirrors LoanAccount.status
+
+    updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
@@ -1,9 +1,12 @@
-from sqlalchemy import Column, Integer, ForeignKey, Float, String, Date
+from sqlalchemy import Column, Integer, ForeignKey, Float, String, Date, Index
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 
 class Payment(Base):
     __tablename__ = "payments"
+    __table_args__ = (
+        Index("ix_payments_loan_date_status", "loan_account_id", "payment_date", "status"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     loan_account_id = Column(Integer, ForeignKey("loan_accounts.id"))
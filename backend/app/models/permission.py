@@ -13,4 +13,11 @@ class RolePermission(Base):
     __tablename__ = "role_permissions"
 
     role_id = Column(Integer, ForeignKey("roles.id"), primary_key=True)
-    permission_id = Column(Integer, ForeignKey("permissions.id"), primary_key=True)
\ No newline at end of file
+    permission_id = Column(Integer, ForeignKey("permissions.id"), primary_key=True)
+
+class ACLVersion(Base):
+    __tablename__ = "acl_version"
+
+    # single row, bumped whenever roles or their permissions change
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
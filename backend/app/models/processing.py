@@ -1,10 +1,40 @@
-from sqlalchemy import Column, Integer, String, ForeignKey
+from datetime import datetime
+
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, TIMESTAMP, Index
+from sqlalchemy.sql import func
 from app.core.database import Base
 
 class ProcessingProgress(Base):
     __tablename__ = "processing_progress"
 
     id = Column(Integer, primary_key=True)
-    customer_id = Column(Integer, ForeignKey("customers.id"))
+    customer_id = Column(Integer, ForeignKey("customers.id"), index=True)
+    document_id = Column(Integer, ForeignKey("documents.id"), index=True)
     stage = Column(String(100))
-    progress_percent = Column(Integer, default=0)
\ No newline at end of file
+    progress_percent = Column(Integer, default=0)
+
+
+class DocumentJob(Base):
+    """
+    Queue row for the document worker (app.jobs.document_worker).
+    QUEUED -> RUNNING -> DONE, or back to QUEUED with a later run_after
+    until attempts run out (FAILED).
+    """
+    __tablename__ = "document_jobs"
+
+    id = Column(Integer, primary_key=True)
+    document_id = Column(Integer, ForeignKey("documents.id"), unique=True)
+    status = Column(String(20), default="QUEUED")
+    attempts = Column(Integer, default=0)
+    run_after = Column(DateTime, default=datetime.utcnow)   # UTC, compared in Python
+    locked_by = Column(String(100))
+    locked_at = Column(DateTime)
+    last_error = Column(Text)
+    stage_timings = Column(Text)   # JSON {stage: seconds} of the last run
+    created_at = Column(TIMESTAMP, server_default=func.now())
+    updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
+
+    # claim query: next due QUEUED jobs in order
+    __table_args__ = (
+        Index("ix_document_jobs_status_run_after", "status", "run_after", "id"),
+    )
@@ -1,8 +1,12 @@
-from sqlalchemy import Column, Integer, ForeignKey, String, Date, Float
+from sqlalchemy import Column, Integer, ForeignKey, String, Date, Float, Index
 from app.core.database import Base
 
 class RecoveryAction(Base):
     __tablename__ = "recovery_actions"
+    __table_args__ = (
+        # latest action per account (recovery board)
+        Index("ix_recovery_actions_loan_id", "loan_account_id", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     loan_account_id = Column(Integer, ForeignKey("loan_accounts.id"))
@@ -1,20 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
-from app.core.database import SessionLocal
+from app.core.database import get_db
 from app.models.approval import LoanApproval
 from app.models.application import LoanApplication
 from app.schemas.approval import ApprovalInput
 
 router = APIRouter(prefix="/approval", tags=["Loan Approval"])
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 @router.post("/generate/{application_id}")
 def generate(application_id: int, data: ApprovalInput, db: Session = Depends(get_db)):
 
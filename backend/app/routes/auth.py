@@ -1,52 +1,58 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.core.database import SessionLocal
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_async_db
+from app.core.deps import auth_cache_stats
 from app.models.user import User, Role
 from app.schemas.auth import RegisterRequest, LoginRequest
-from app.core.security import hash_password, verify_password, create_access_token
+from app.core.security import (
+    hash_password_async,
+    verify_password_async,
+    needs_rehash,
+    create_access_token
+)
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
+# bcrypt runs on the dedicated hashing pool (core.security), so these
+# routes are async and never hold a request worker thread while hashing
 
 @router.post("/register")
-def register(data: RegisterRequest, db: Session = Depends(get_db)):
+async def register(data: RegisterRequest, db: AsyncSession = Depends(get_async_db)):
 
-    existing = db.query(User).filter(User.email == data.email).first()
+    existing = await db.scalar(select(User.id).where(User.email == data.email).limit(1))
     if existing:
         raise HTTPException(400, "Email already registered")
 
     # default role = officer
-    role = db.query(Role).filter(Role.name == "officer").first()
+    role_id = await db.scalar(select(Role.id).where(Role.name == "officer").limit(1))
 
     user = User(
         full_name=data.full_name,
         email=data.email,
-        password_hash=hash_password(data.password),
-        role_id=role.id if role else None
+        password_hash=await hash_password_async(data.password),
+        role_id=role_id
     )
 
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
 
     return {"message": "User created"}
 
 
 @router.post("/login")
-def login(data: LoginRequest, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == data.email).first()
+async def login(data: LoginRequest, db: AsyncSession = Depends(get_async_db)):
+    user = await db.scalar(select(User).where(User.email == data.email).limit(1))
 
-    if not user or not verify_password(data.password, user.password_hash):
+    if not user or not await verify_password_async(data.password, user.password_hash):
         raise HTTPException(401, "Invalid credentials")
 
+    # BCRYPT_ROUNDS changed since this hash was made
+    if needs_rehash(user.password_hash):
+        user.password_hash = await hash_password_async(data.password)
+        await db.commit()
+
     token = create_access_token({"sub": str(user.id)})
 
     return {
@@ -54,3 +60,8 @@ def login(data: LoginRequest, db: Session = Depends(get_db)):
         "token_type": "bearer",
         "user_id": user.id
     }
+
+
+@router.get("/cache-stats")
+def cache_stats():
+    return auth_cache_stats()
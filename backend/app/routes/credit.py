@@ -1,23 +1,48 @@
+from collections import Counter
+
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import bindparam, select, update
 from sqlalchemy.orm import Session
 
-from app.core.database import SessionLocal
+from app.core.database import get_db
+from app.models.application import LoanApplication
 from app.models.credit import CreditReview
-from app.schemas.credit import CreditInput, CreditDecision
+from app.models.customer import EmploymentDetails
+from app.schemas.credit import (
+    CreditInput, CreditDecision, CreditGradeRequest, CreditGradeResult, CreditRegradeResult
+)
+from app.utils.credit_rules import CompiledPolicy, current_policy
+from app.utils.customer360 import invalidate_customers
 
 router = APIRouter(prefix="/credit", tags=["Credit Review"])
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+
+def _employment_type():
+    """Latest employment type of the application's customer, as a scalar subquery."""
+    return (
+        select(EmploymentDetails.employment_type)
+        .where(EmploymentDetails.customer_id == LoanApplication.customer_id)
+        .order_by(EmploymentDetails.id.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+
 
 @router.post("/analyze/{application_id}")
 def analyze(application_id: int, data: CreditInput, db: Session = Depends(get_db)):
 
-    foir = (data.existing_obligations / data.monthly_income) * 100
+    if data.monthly_income <= 0:
+        raise HTTPException(400, "monthly_income must be positive")
+
+    employment_type = data.employment_type
+    if employment_type is None:
+        employment_type = db.scalar(
+            select(_employment_type()).where(LoanApplication.id == application_id)
+        )
+
+    grade = current_policy.evaluate(
+        [data.cibil_score], [data.monthly_income], [data.existing_obligations], [employment_type]
+    ).rows()[0]
 
     review = db.query(CreditReview).filter(
         CreditReview.application_id == application_id
@@ -29,13 +54,14 @@ def analyze(application_id: int, data: CreditInput, db: Session = Depends(get_db
     review.cibil_score = data.cibil_score
     review.monthly_income = data.monthly_income
     review.total_obligations = data.existing_obligations
-    review.foir_percent = foir
+    review.foir_percent = grade["foir"]
+    review.risk_level = grade["risk_level"]
 
     db.add(review)
     db.commit()
     db.refresh(review)
 
-    return {"foir": foir}
+    return grade
 
 @router.post("/decision/{application_id}")
 def decision(application_id: int, data: CreditDecision, db: Session = Depends(get_db)):
@@ -47,7 +73,8 @@ def decision(application_id: int, data: CreditDecision, db: Session = Depends(ge
     if not review:
         raise HTTPException(404, "Credit review not found")
 
-    review.risk_level = data.risk_grade
+    if data.risk_grade is not None:
+        review.risk_level = data.risk_grade
     review.decision = data.decision
     review.remarks = data.remarks
 
@@ -65,4 +92,92 @@ def summary(application_id: int, db: Session = Depends(get_db)):
     if not review:
         raise HTTPException(404, "No credit data")
 
-    return review.__dict__
\ No newline at end of file
+    return review.__dict__
+
+
+# ------------------------------
+# BATCH GRADING
+# ------------------------------
+# Both endpoints run the compiled rules engine over the whole batch in
+# one vectorized pass. /grade is stateless: score what the caller sends,
+# optionally against a draft policy. /regrade re-scores the stored
+# credit reviews against the current policy, e.g. after a policy change.
+
+@router.post("/grade", response_model=CreditGradeResult)
+def grade(data: CreditGradeRequest):
+
+    policy = current_policy
+    if data.policy is not None:
+        try:
+            policy = CompiledPolicy(data.policy)
+        except ValueError as exc:
+            raise HTTPException(400, f"Invalid policy: {exc}")
+
+    apps = data.applications
+    grading = policy.evaluate(
+        [a.cibil_score if a.cibil_score is not None else float("nan") for a in apps],
+        [a.monthly_income for a in apps],
+        [a.existing_obligations for a in apps],
+        [a.employment_type for a in apps],
+    )
+    grades = grading.rows()
+    for app, row in zip(apps, grades):
+        row["application_id"] = app.application_id
+
+    return {
+        "policy_version": policy.version,
+        "counts": Counter(grading.risk_level.tolist()),
+        "grades": grades,
+    }
+
+@router.post("/regrade", response_model=CreditRegradeResult)
+def regrade(apply: bool = False, pending_only: bool = True, db: Session = Depends(get_db)):
+    """
+    Re-grade stored credit reviews with the current policy. Dry run by
+    default; ``apply=true`` writes the new risk levels. ``pending_only``
+    skips reviews that already have a decision.
+    """
+    query = (
+        select(
+            CreditReview.id, CreditReview.cibil_score, CreditReview.monthly_income,
+            CreditReview.total_obligations, CreditReview.risk_level,
+            LoanApplication.customer_id, _employment_type().label("employment_type"),
+        )
+        .join(LoanApplication, LoanApplication.id == CreditReview.application_id)
+        .where(CreditReview.monthly_income.is_not(None))
+    )
+    if pending_only:
+        query = query.where(CreditReview.decision.is_(None))
+    rows = db.execute(query).all()
+
+    grading = current_policy.evaluate(
+        [r.cibil_score if r.cibil_score is not None else float("nan") for r in rows],
+        [float(r.monthly_income) for r in rows],
+        [float(r.total_obligations or 0) for r in rows],
+        [r.employment_type for r in rows],
+    )
+    new_levels = grading.risk_level.tolist()
+
+    changed = [(r, level) for r, level in zip(rows, new_levels) if r.risk_level != level]
+    transitions = Counter(f"{r.risk_level or 'NONE'} -> {level}" for r, level in changed)
+
+    if apply and changed:
+        # Core executemany on the table: one statement, no per-row ORM load
+        table = CreditReview.__table__
+        db.execute(
+            update(table)
+            .where(table.c.id == bindparam("review_id"))
+            .values(risk_level=bindparam("v_risk_level")),
+            [{"review_id": r.id, "v_risk_level": level} for r, level in changed]
+        )
+        db.commit()
+        invalidate_customers(r.customer_id for r, _ in changed)
+
+    return {
+        "policy_version": current_policy.version,
+        "reviews": len(rows),
+        "changed": len(changed),
+        "applied": apply,
+        "counts": Counter(new_levels),
+        "transitions": transitions,
+    }
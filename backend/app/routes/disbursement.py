@@ -1,18 +1,97 @@
-from email.mime import application
+import logging
 
 from fastapi import APIRouter, Depends
+from sqlalchemy import insert
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 from datetime import date
-from app.utils.emi import generate_schedule
 import random
-from app.core.database import get_db;
+from app.core.database import get_db
 from app.models.disbursement import LoanAccount, Disbursement, EMISchedule
 from app.models.approval import LoanApproval
 from app.models.application import LoanApplication
-from app.utils.emi import generate_schedule
+from app.schemas.disbursement import ConfirmBatchRequest
+from app.utils.emi import amortize
+from app.utils.loan_summary import open_summaries
 
 router = APIRouter(prefix="/disbursement", tags=["Disbursement"])
 
+logger = logging.getLogger(__name__)
+
+
+def _account_numbers(db: Session, count: int):
+    # random numbers, unique within the batch and against existing accounts
+    numbers = set()
+    while len(numbers) < count:
+        candidates = {
+            "LN" + str(random.randint(100000, 999999))
+            for _ in range(count - len(numbers))
+        } - numbers
+
+        taken = {
+            n for (n,) in db.query(LoanAccount.account_number).filter(
+                LoanAccount.account_number.in_(candidates)
+            )
+        }
+        numbers |= candidates - taken
+
+    return list(numbers)
+
+
+def _open_accounts(db: Session, pairs):
+    """
+    Create loan accounts, disbursements, EMI schedules and balance
+    summaries for a list of
+    (application, approval) pairs. Accounts are flushed once for their
+    ids; disbursements and schedule rows go in as bulk inserts. The
+    caller owns the transaction.
+    """
+    today = date.today()
+
+    accounts = [
+        LoanAccount(
+            application_id=application.id,
+            account_number=account_no,
+            loan_amount=application.requested_amount,
+            principal_amount=application.requested_amount,
+            interest_rate=approval.interest_rate,
+            tenure_months=approval.tenure_months,
+            emi_amount=approval.emi_amount
+        )
+        for (application, approval), account_no in zip(pairs, _account_numbers(db, len(pairs)))
+    ]
+    db.add_all(accounts)
+    db.flush()
+
+    db.execute(insert(Disbursement), [
+        {
+            "loan_account_id": account.id,
+            "amount": application.requested_amount,
+            "disbursement_date": today
+        }
+        for account, (application, _) in zip(accounts, pairs)
+    ])
+
+    batch = amortize(
+        [float(application.requested_amount) for application, _ in pairs],   # DECIMAL → float
+        [approval.interest_rate for _, approval in pairs],
+        [approval.tenure_months for _, approval in pairs],
+        today,
+        [approval.emi_amount for _, approval in pairs]
+    )
+
+    rows = [
+        {"loan_account_id": account.id, **row}
+        for i, account in enumerate(accounts)
+        for row in batch.rows(i)
+    ]
+    if rows:
+        db.execute(insert(EMISchedule), rows)
+
+    open_summaries(db, accounts, batch)
+
+    return accounts, batch
+
 
 @router.post("/confirm/{application_id}")
 def confirm(application_id: int, db: Session = Depends(get_db)):
@@ -36,6 +115,9 @@ def confirm(application_id: int, db: Session = Depends(get_db)):
     if not approval:
         return {"error": "Approval not found"}
 
+    if None in (approval.interest_rate, approval.tenure_months, approval.emi_amount):
+        return {"error": "Approval terms incomplete"}
+
     # check if loan already disbursed
     existing_account = db.query(LoanAccount).filter(
         LoanAccount.application_id == application_id
@@ -46,52 +128,99 @@ def confirm(application_id: int, db: Session = Depends(get_db)):
             "message": "Loan already disbursed",
             "account_number": existing_account.account_number
         }
-    # ✅ generate loan account number
-    account_no = "LN" + str(random.randint(100000, 999999))
-
-    # ✅ create loan account (amount comes from application, terms from approval)
-    loan_account = LoanAccount(
-        application_id=application_id,
-        account_number=account_no,
-        loan_amount=application.requested_amount,
-        principal_amount=application.requested_amount,
-        interest_rate=approval.interest_rate,
-        tenure_months=approval.tenure_months,
-        emi_amount=approval.emi_amount
-    )
 
-    db.add(loan_account)
+    # ✅ account + disbursement + EMI schedule in one transaction
+    accounts, batch = _open_accounts(db, [(application, approval)])
+    account_no = accounts[0].account_number
     db.commit()
-    db.refresh(loan_account)
 
-    # ✅ record disbursement
-    disb = Disbursement(
-        loan_account_id=loan_account.id,
-        amount=application.requested_amount,
-        disbursement_date=date.today()
-    )
-    db.add(disb)
+    return {
+        "account_number": account_no,
+        "schedule_count": int(batch.months[0])
+    }
 
-    # ✅ generate EMI schedule
-    amount = float(application.requested_amount)
 
-    schedule = generate_schedule(
-        amount,   # DECIMAL → float
-        approval.interest_rate,
-        approval.tenure_months,
-        approval.emi_amount,
-        date.today()
-    )
+# ------------------------------
+# END-OF-DAY BATCH DISBURSEMENT
+# ------------------------------
+@router.post("/confirm-batch")
+def confirm_batch(data: ConfirmBatchRequest, db: Session = Depends(get_db)):
 
-    for row in schedule:
-        db.add(EMISchedule(
-            loan_account_id=loan_account.id,
-            **row
-        ))
+    application_ids = list(dict.fromkeys(data.application_ids))
+    report = {}
 
-    db.commit()
+    for start in range(0, len(application_ids), data.chunk_size):
+        chunk = application_ids[start:start + data.chunk_size]
+
+        applications = {
+            a.id: a for a in db.query(LoanApplication).filter(
+                LoanApplication.id.in_(chunk)
+            )
+        }
+        approvals = {
+            a.application_id: a for a in db.query(LoanApproval).filter(
+                LoanApproval.application_id.in_(chunk)
+            )
+        }
+        existing = dict(
+            db.query(LoanAccount.application_id, LoanAccount.account_number).filter(
+                LoanAccount.application_id.in_(chunk)
+            ).all()
+        )
+
+        pairs = []
+        for application_id in chunk:
+            application = applications.get(application_id)
+            approval = approvals.get(application_id)
+
+            if not application:
+                report[application_id] = {"status": "FAILED", "error": "Application not found"}
+            elif application.requested_amount is None:
+                report[application_id] = {"status": "FAILED", "error": "Requested amount missing in application"}
+            elif not approval:
+                report[application_id] = {"status": "FAILED", "error": "Approval not found"}
+            elif None in (approval.interest_rate, approval.tenure_months, approval.emi_amount):
+                report[application_id] = {"status": "FAILED", "error": "Approval terms incomplete"}
+            elif application_id in existing:
+                report[application_id] = {
+                    "status": "ALREADY_DISBURSED",
+                    "account_number": existing[application_id]
+                }
+            else:
+                pairs.append((application, approval))
+
+        if not pairs:
+            continue
+
+        pending = [application.id for application, _ in pairs]
+
+        try:
+            accounts, batch = _open_accounts(db, pairs)
+            opened = [(a.application_id, a.account_number) for a in accounts]
+            db.commit()
+        except SQLAlchemyError as e:
+            db.rollback()
+            # SQLAlchemy's message repeats the SQL with its bound values:
+            # log only the driver's error, report a generic reason
+            logger.error(
+                "Batch disbursement of %d applications failed: %s: %s",
+                len(pending), type(e).__name__, getattr(e, "orig", None) or e
+            )
+            for application_id in pending:
+                report[application_id] = {"status": "FAILED", "error": "Batch failed; retry"}
+            continue
+
+        for i, (application_id, account_no) in enumerate(opened):
+            report[application_id] = {
+                "status": "DISBURSED",
+                "account_number": account_no,
+                "schedule_count": int(batch.months[i])
+            }
+
+    results = [{"application_id": i, **report[i]} for i in application_ids]
 
     return {
-        "account_number": account_no,
-        "schedule_count": len(schedule)
-    }
\ No newline at end of file
+        "requested": len(application_ids),
+        "disbursed": sum(1 for r in results if r["status"] == "DISBURSED"),
+        "results": results
+    }
@@ -1,50 +1,111 @@
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import FileResponse
+from sqlalchemy import case, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.database import SessionLocal
+from app.core.config import UPLOAD_MAX_BYTES
+from app.core.database import get_db, get_async_db
 from app.models.document import Document
 from app.models.customer import Customer
 from app.models.application import LoanApplication
-from app.schemas.document import UploadDocumentRequest, VerifyDocumentRequest, EmploymentUpdateRequest
+from app.schemas.document import (
+    VerifyDocumentRequest, EmploymentUpdateRequest,
+    DocumentStatus, DocumentSummary, EmploymentOut, ProcessingOut, CustomerReadiness
+)
 from app.models.customer import EmploymentDetails
 from app.models.document import Document
-from app.models.processing import ProcessingProgress   # create model
+from app.models.processing import ProcessingProgress, DocumentJob
 from app.core.document_config import REQUIRED_DOCUMENTS
+from app.utils.blobstore import document_store
+from app.utils.uploads import receive_upload
 
 router = APIRouter(prefix="/documents", tags=["Documents"])
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 @router.post("/upload")
-def upload_document(data: UploadDocumentRequest, db: Session = Depends(get_db)):
+async def upload_document(request: Request, db: AsyncSession = Depends(get_async_db)):
+    # multipart/form-data: customer_id, document_type, file
+    upload = await receive_upload(request, document_store, UPLOAD_MAX_BYTES)
+
+    try:
+        customer_id = int(upload.fields.get("customer_id", ""))
+    except ValueError:
+        await upload.discard()
+        raise HTTPException(400, "customer_id is required")
+    document_type = upload.fields.get("document_type")
+    if not document_type:
+        await upload.discard()
+        raise HTTPException(400, "document_type is required")
 
-    customer = db.query(Customer).filter(Customer.id == data.customer_id).first()
-    if not customer:
+    if await db.get(Customer, customer_id) is None:
+        await upload.discard()
         raise HTTPException(404, "Customer not found")
 
+    digest, stored = await upload.save()
+
+    # same scan uploaded again for the same slot: keep the first record
+    # (the blob itself is stored once regardless; two identical uploads
+    # racing each other can still both get a row)
+    existing = await db.scalar(
+        select(Document).where(
+            Document.customer_id == customer_id,
+            Document.document_type == document_type,
+            Document.content_hash == digest
+        ).limit(1)
+    )
+    if existing:
+        return {
+            "message": "Document already uploaded",
+            "document_id": existing.id,
+            "sha256": digest,
+            "size": existing.size_bytes,
+            "duplicate": True
+        }
+
     doc = Document(
-        customer_id=data.customer_id,
-        document_type=data.document_type,
-        file_path=data.file_path,
+        customer_id=customer_id,
+        document_type=document_type,
+        file_path=document_store.key(digest),
+        content_hash=digest,
+        size_bytes=upload.blob.size,
+        content_type=upload.content_type,
+        original_filename=upload.filename,
         verified=False,
         processing_status="PENDING"
     )
 
     db.add(doc)
-    db.commit()
-    db.refresh(doc)
+    await db.flush()
+    db.add(DocumentJob(document_id=doc.id))   # picked up by app.jobs.document_worker
+    await db.commit()
 
     return {
         "message": "Document uploaded",
-        "document_id": doc.id
+        "document_id": doc.id,
+        "sha256": digest,
+        "size": doc.size_bytes,
+        "duplicate": False
     }
 
+
+@router.get("/{document_id}/file")
+async def download_document(document_id: int, db: AsyncSession = Depends(get_async_db)):
+    doc = await db.get(Document, document_id)
+    if not doc:
+        raise HTTPException(404, "Document not found")
+    if not doc.content_hash or not document_store.exists(doc.content_hash):
+        raise HTTPException(404, "Document has no stored file")
+
+    return FileResponse(
+        document_store.path(doc.content_hash),
+        media_type=doc.content_type or "application/octet-stream",
+        filename=doc.original_filename or doc.content_hash,
+        headers={"ETag": f'"{doc.content_hash}"', "Cache-Control": "private, max-age=31536000, immutable"}
+    )
+
 @router.post("/verify")
 def verify_document(data: VerifyDocumentRequest, db: Session = Depends(get_db)):
 
@@ -80,14 +141,15 @@ def update_employment(data: EmploymentUpdateRequest, db: Session = Depends(get_d
 @router.get("/check/{customer_id}")
 def check_documents(customer_id: int, db: Session = Depends(get_db)):
 
-    docs = db.query(Document).filter(Document.customer_id == customer_id).all()
+    uploaded, verified = db.query(
+        func.count(Document.id),
+        func.coalesce(func.sum(case((Document.verified.is_(True), 1), else_=0)), 0)
+    ).filter(Document.customer_id == customer_id).one()
 
-    if not docs:
+    if not uploaded:
         return {"ready": False, "reason": "No documents uploaded"}
 
-    all_verified = all(d.verified for d in docs)
-
-    if not all_verified:
+    if verified < uploaded:
         return {"ready": False, "reason": "Documents pending verification"}
 
     # move application forward
@@ -101,7 +163,7 @@ def check_documents(customer_id: int, db: Session = Depends(get_db)):
 
     return {"ready": True, "message": "Documents verified"}
 
-@router.get("/summary/{customer_id}")
+@router.get("/summary/{customer_id}", response_model=DocumentSummary)
 def document_summary(customer_id: int, db: Session = Depends(get_db)):
 
     employment = db.query(EmploymentDetails).filter(
@@ -121,24 +183,101 @@ def document_summary(customer_id: int, db: Session = Depends(get_db)):
             d = doc_map[doc_type]
             status = (
                 "VERIFIED" if d.verified else
-                "PROCESSING" if d.processing_status == "PENDING"
+                "PROCESSING" if d.processing_status in ("PENDING", "PROCESSING")
                 else "UPLOADED"
             )
         else:
             status = "MISSING"
 
-        documents.append({
-            "document_type": doc_type,
-            "status": status,
-            "file": doc_map.get(doc_type).file_path if doc_type in doc_map else None
-        })
+        documents.append(DocumentStatus(
+            document_type=doc_type,
+            status=status,
+            file=(d.original_filename or d.file_path) if doc_type in doc_map else None
+        ))
 
     progress = db.query(ProcessingProgress).filter(
         ProcessingProgress.customer_id == customer_id
     ).all()
 
-    return {
-        "documents": documents,
-        "employment": employment.__dict__ if employment else None,
-        "processing": [p.__dict__ for p in progress]
-    }
\ No newline at end of file
+    return DocumentSummary(
+        documents=documents,
+        employment=EmploymentOut.model_validate(employment) if employment else None,
+        processing=[ProcessingOut.model_validate(p) for p in progress]
+    )
+
+
+# ------------------------------
+# READINESS (reviewer queue)
+# ------------------------------
+def _readiness_query(status=None, ready=None, cursor=None):
+    """
+    One row per customer with, per required type, whether anything was
+    uploaded (has_N) and whether one is verified (ok_N): a single
+    GROUP BY over customers LEFT JOIN documents, walked in id order.
+    """
+    required = len(REQUIRED_DOCUMENTS)
+    has, ok = [], []
+    for doc_type in REQUIRED_DOCUMENTS:
+        of_type = Document.document_type == doc_type
+        has.append(func.max(case((of_type, 1), else_=0)))
+        ok.append(func.max(case((of_type & Document.verified.is_(True), 1), else_=0)))
+    verified = sum(ok[1:], ok[0])
+
+    query = select(
+        Customer.id, Customer.first_name, Customer.last_name,
+        *[h.label(f"has_{i}") for i, h in enumerate(has)],
+        *[o.label(f"ok_{i}") for i, o in enumerate(ok)],
+    ).outerjoin(
+        Document,
+        (Document.customer_id == Customer.id) & Document.document_type.in_(REQUIRED_DOCUMENTS)
+    ).group_by(Customer.id)
+
+    if status:
+        query = query.where(Customer.status == status)
+    if cursor:
+        query = query.where(Customer.id > cursor)
+    if ready is True:
+        query = query.having(verified == required)
+    elif ready is False:
+        query = query.having(verified < required)
+
+    return query.order_by(Customer.id)
+
+
+def _readiness(row):
+    documents = {}
+    for i, doc_type in enumerate(REQUIRED_DOCUMENTS):
+        documents[doc_type] = (
+            "VERIFIED" if row[f"ok_{i}"] else
+            "PENDING" if row[f"has_{i}"]
+            else "MISSING"
+        )
+    counts = list(documents.values())
+    return CustomerReadiness(
+        customer_id=row["id"],
+        first_name=row["first_name"],
+        last_name=row["last_name"],
+        ready=counts.count("VERIFIED") == len(counts),
+        verified=counts.count("VERIFIED"),
+        pending=counts.count("PENDING"),
+        missing=counts.count("MISSING"),
+        documents=documents
+    )
+
+
+@router.get("/readiness", response_model=List[CustomerReadiness])
+async def documents_readiness(
+    response: Response,
+    status: Optional[str] = Query(None, description="customer status, e.g. ONBOARDED"),
+    ready: Optional[bool] = Query(None, description="only ready (true) / not ready (false) customers"),
+    cursor: Optional[int] = Query(None, description="X-Next-Cursor of the previous page"),
+    limit: int = Query(200, ge=1, le=1000),
+    db: AsyncSession = Depends(get_async_db)
+):
+    # readiness against REQUIRED_DOCUMENTS for a page of customers
+    rows = (await db.execute(_readiness_query(status, ready, cursor).limit(limit))).mappings().all()
+
+    if len(rows) == limit:
+        response.headers["X-Next-Cursor"] = str(rows[-1]["id"])
+
+    return [_readiness(row) for row in rows]
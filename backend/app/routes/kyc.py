@@ -1,33 +1,28 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 
-from app.core.database import SessionLocal
+from app.core.database import get_db
 from app.models.kyc import KYCRecord
 from app.models.customer import Customer
 from app.models.application import LoanApplication
 from app.schemas.kyc import (
     PANRequest, AadhaarRequest,
     VideoKYCRequest, CreditCheckRequest,
-    FinalKYCRequest
+    FinalKYCRequest, KYCBulkResult
 )
+from app.utils.kyc_bulk import ingest
 
 router = APIRouter(prefix="/kyc", tags=["KYC"])
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 def get_or_create_kyc(db: Session, customer_id: int):
+    # new record is only flushed: the caller's commit saves it together
+    # with its fields, or a rejected request leaves nothing behind
     kyc = db.query(KYCRecord).filter(KYCRecord.customer_id == customer_id).first()
     if not kyc:
         kyc = KYCRecord(customer_id=customer_id)
         db.add(kyc)
-        db.commit()
-        db.refresh(kyc)
+        db.flush()
     return kyc
 
 @router.post("/pan")
@@ -108,4 +103,11 @@ def complete_kyc(data: FinalKYCRequest, db: Session = Depends(get_db)):
 
     db.commit()
 
-    return {"message": "KYC completed successfully"}
\ No newline at end of file
+    return {"message": "KYC completed successfully"}
+
+@router.post("/bulk", response_model=KYCBulkResult)
+async def bulk_kyc(request: Request):
+    # bureau result file, streamed: text/csv with a header row, or
+    # application/x-ndjson; columns customer_id, pan_number,
+    # aadhaar_number, cibil_score (any of the last three)
+    return await ingest(request)
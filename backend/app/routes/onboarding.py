@@ -1,8 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from datetime import datetime
+from datetime import date, datetime, timedelta
+from typing import Optional
 
-from app.core.database import SessionLocal
+from app.core.database import get_db, get_async_db
 from app.models.customer import Customer, CustomerAddress, EmploymentDetails
 from app.models.application import LoanApplication
 from app.schemas.onboarding import (
@@ -11,37 +14,93 @@ from app.schemas.onboarding import (
     DemographicsRequest,
     ConfirmRequest
 )
+from app.utils.customer360 import CUSTOMER_FIELDS, customer_360, customer_cache_stats
+from app.utils.etag import etag_response
+from app.utils.search import search_queries, merge_results
 
 router = APIRouter(prefix="/onboarding", tags=["Onboarding"])
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+
+def _customers_query(selected, status=None, created_from=None, created_to=None, cursor=None):
+    # newest first, so callers that only read the first page (the LOS
+    # dropdowns) see the customers still being worked on; id is always
+    # read, it is the page key
+    columns = [Customer.id] + [getattr(Customer, f) for f in selected if f != "id"]
+
+    query = select(*columns)
+    if status:
+        query = query.where(Customer.status == status)
+    if created_from:
+        query = query.where(Customer.created_at >= created_from)
+    if created_to:
+        query = query.where(Customer.created_at < created_to + timedelta(days=1))
+    if cursor:
+        query = query.where(Customer.id < cursor)
+
+    return query.order_by(Customer.id.desc())
+
 
 @router.get("/customers")
-def get_customers(db: Session = Depends(get_db)):
-    customers = db.query(Customer).all()
-    return customers
+async def get_customers(
+    request: Request,
+    status: Optional[str] = None,
+    created_from: Optional[date] = None,
+    created_to: Optional[date] = None,
+    fields: Optional[str] = Query(None, description="comma-separated columns, e.g. id,first_name,status"),
+    cursor: Optional[int] = Query(None, description="X-Next-Cursor of the previous page"),
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_async_db)
+):
+
+    selected = CUSTOMER_FIELDS
+    if fields:
+        selected = list(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+        unknown = set(selected) - set(CUSTOMER_FIELDS)
+        if unknown:
+            raise HTTPException(400, f"Unknown fields: {', '.join(sorted(unknown))}")
+
+    query = _customers_query(selected, status, created_from, created_to, cursor)
+    rows = (await db.execute(query.limit(limit))).all()
+    customers = [
+        {f: getattr(row, f) for f in selected}
+        for row in rows
+    ]
+
+    headers = {}
+    if len(rows) == limit:
+        headers["X-Next-Cursor"] = str(rows[-1].id)
+
+    return etag_response(request, customers, headers)
+
+
+@router.get("/search")
+async def search_customers(
+    q: str = Query(..., min_length=2, description="mobile, name, PAN or application number"),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db)
+):
+    # ranked: PAN / mobile / application number hits, then names by relevance
+    results = [
+        (await db.execute(query)).all()
+        for query in search_queries(q, db.bind.dialect.name, limit)
+    ]
+    return merge_results(results, limit)
+
 
 @router.get("/customers/{customer_id}")
-def get_customer(customer_id: int, db: Session = Depends(get_db)):
-    customer = db.query(Customer).filter(Customer.id == customer_id).first()
-    if not customer:
+async def get_customer(customer_id: int, db: AsyncSession = Depends(get_async_db)):
+    # customer 360: profile, address, employment, applications with their
+    # latest credit review, KYC, documents and loan accounts
+    view = await customer_360(db, customer_id)
+    if view is None:
         raise HTTPException(404, "Customer not found")
-    
-    address = db.query(CustomerAddress).filter(CustomerAddress.customer_id == customer_id).first()
-    employment = db.query(EmploymentDetails).filter(EmploymentDetails.customer_id == customer_id).first()
-    application = db.query(LoanApplication).filter(LoanApplication.customer_id == customer_id).first()
 
-    return {
-        "customer": customer,
-        "address": address,
-        "employment": employment,
-        "application": application
-    }
+    return view
+
+
+@router.get("/cache-stats")
+def cache_stats():
+    return customer_cache_stats()
 
 @router.post("/basic")
 def create_basic(data: BasicInfoRequest, db: Session = Depends(get_db)):
@@ -1,47 +1,73 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import func, or_, and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, aliased
 from datetime import date
-from app.core.database import get_db
+from typing import Literal, Optional
+from app.core.database import get_db, get_async_db
 from app.models.disbursement import EMISchedule, LoanAccount
 from app.models.recovery import RecoveryAction
 from app.models.application import LoanApplication
 from app.models.customer import Customer
+from app.utils.dpd import BUCKETS, dpd_bucket, bucket_filter, overdue_filter
+from app.utils.export import ExportFormat, stream_export
 
 router = APIRouter(prefix="/recovery", tags=["Recovery"])
 
+OVERDUE_FIELDS = ["loan_account_id", "installment", "due_date", "balance", "dpd", "bucket"]
+
+BOARD_FIELDS = [
+    "loan_account_id", "customer", "loan_id", "installment", "dpd",
+    "overdue_amount", "bucket", "officer", "status"
+]
+
+
+def _overdue_query(today):
+    return select(
+        EMISchedule.loan_account_id,
+        EMISchedule.installment_no,
+        EMISchedule.due_date,
+        EMISchedule.balance,
+        dpd_bucket(today).label("bucket")
+    ).where(*overdue_filter(today))
+
+
+def _overdue_row(row, today):
+    return {
+        "loan_account_id": row.loan_account_id,
+        "installment": row.installment_no,
+        "due_date": row.due_date,
+        "balance": row.balance,
+        "dpd": (today - row.due_date).days,
+        "bucket": row.bucket
+    }
+
+
 @router.get("/overdue")
-def overdue_loans(db: Session = Depends(get_db)):
+async def overdue_loans(db: AsyncSession = Depends(get_async_db)):
 
     today = date.today()
 
-    emis = db.query(EMISchedule).filter(
-        EMISchedule.balance > 0,
-        EMISchedule.due_date < today
-    ).all()
-
-    result = []
+    rows = await db.execute(_overdue_query(today))
 
-    for e in emis:
+    return [_overdue_row(r, today) for r in rows]
 
-        dpd = (today - e.due_date).days
 
-        if dpd <= 30:
-            bucket = "DPD 1-30"
-        elif dpd <= 60:
-            bucket = "DPD 31-60"
-        else:
-            bucket = "DPD 60+"
+@router.get("/overdue/export")
+def export_overdue(format: ExportFormat = "csv"):
 
-        result.append({
-            "loan_account_id": e.loan_account_id,
-            "installment": e.installment_no,
-            "due_date": e.due_date,
-            "balance": e.balance,
-            "dpd": dpd,
-            "bucket": bucket
-        })
+    today = date.today()
 
-    return result
+    return stream_export(
+        _overdue_query(today).order_by(
+            EMISchedule.due_date,
+            EMISchedule.loan_account_id
+        ),
+        lambda r: _overdue_row(r, today),
+        OVERDUE_FIELDS,
+        format,
+        f"overdue-{today}"
+    )
 
 @router.post("/action/{loan_account_id}")
 def add_action(
@@ -66,11 +92,13 @@ def add_action(
     return {"message": "Recovery action logged"}
 
 @router.get("/history/{loan_account_id}")
-def action_history(loan_account_id: int, db: Session = Depends(get_db)):
+async def action_history(loan_account_id: int, db: AsyncSession = Depends(get_async_db)):
 
-    actions = db.query(RecoveryAction).filter(
-        RecoveryAction.loan_account_id == loan_account_id
-    ).order_by(RecoveryAction.id.desc()).all()
+    actions = await db.scalars(
+        select(RecoveryAction).where(
+            RecoveryAction.loan_account_id == loan_account_id
+        ).order_by(RecoveryAction.id.desc())
+    )
 
     return [
         {
@@ -82,124 +110,127 @@ def action_history(loan_account_id: int, db: Session = Depends(get_db)):
         for a in actions
     ]
 
+def _board_query(today, bucket=None, officer=None):
+    """
+    Overdue installments joined to account, application, customer and
+    the latest recovery action of the account, most overdue first.
+    """
+    latest = select(
+        RecoveryAction.loan_account_id,
+        func.max(RecoveryAction.id).label("action_id")
+    ).group_by(RecoveryAction.loan_account_id).subquery()
+
+    action = aliased(RecoveryAction)
+
+    query = select(
+        EMISchedule.loan_account_id,
+        EMISchedule.installment_no,
+        EMISchedule.due_date,
+        EMISchedule.balance,
+        LoanAccount.account_number,
+        Customer.first_name,
+        Customer.last_name,
+        action.officer,
+        dpd_bucket(today).label("bucket")
+    ).join(
+        LoanAccount, LoanAccount.id == EMISchedule.loan_account_id
+    ).outerjoin(
+        LoanApplication, LoanApplication.id == LoanAccount.application_id
+    ).outerjoin(
+        Customer, Customer.id == LoanApplication.customer_id
+    ).outerjoin(
+        latest, latest.c.loan_account_id == EMISchedule.loan_account_id
+    ).outerjoin(
+        action, action.id == latest.c.action_id
+    ).where(*overdue_filter(today))
+
+    if bucket:
+        query = query.where(*bucket_filter(today, bucket))
+
+    if officer == "Unassigned":
+        query = query.where(action.officer.is_(None))
+    elif officer:
+        query = query.where(action.officer == officer)
+
+    return query.order_by(
+        EMISchedule.due_date,
+        EMISchedule.loan_account_id,
+        EMISchedule.installment_no
+    )
+
+
+def _board_row(row, today):
+    name = " ".join(n for n in (row.first_name, row.last_name) if n)
+
+    return {
+        "loan_account_id": row.loan_account_id,
+        "customer": name or "Unknown",
+        "loan_id": row.account_number,
+        "installment": row.installment_no,
+        "dpd": (today - row.due_date).days,
+        "overdue_amount": float(row.balance),
+        "bucket": row.bucket,
+        "officer": row.officer or "Unassigned",
+        "status": "Actioned" if row.officer else "Pending"
+    }
+
+
 @router.get("/board")
-def recovery_board(db: Session = Depends(get_db)):
+async def recovery_board(
+    response: Response,
+    bucket: Optional[Literal[BUCKETS]] = None,
+    officer: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_async_db)
+):
 
     today = date.today()
 
-    # fetch all overdue EMIs
-    emis = db.query(EMISchedule).filter(
-        EMISchedule.balance > 0,
-        EMISchedule.due_date < today
-    ).all()
-
-    results = []
-
-    for e in emis:
-
-        # get loan account
-        loan = db.query(LoanAccount).filter(
-            LoanAccount.id == e.loan_account_id
-        ).first()
-
-        if not loan:
-            continue
-
-        # get application
-        app = db.query(LoanApplication).filter(
-            LoanApplication.id == loan.application_id
-        ).first()
-
-        # get customer
-        customer = db.query(Customer).filter(
-            Customer.id == app.customer_id
-        ).first() if app else None
-
-        dpd = (today - e.due_date).days
-
-        # bucket logic
-        if dpd <= 30:
-            bucket = "DPD 1-30"
-        elif dpd <= 60:
-            bucket = "DPD 31-60"
-        else:
-            bucket = "DPD 60+"
-
-        # fake officer/status for now (safe default)
-        officer = "Unassigned"
-        status = "Pending"
-
-        results.append({
-            "loan_account_id": loan.id,
-            "customer": customer.name if customer else "Unknown",
-            "loan_id": loan.account_number,
-            "installment": e.installment_no,
-            "dpd": dpd,
-            "overdue_amount": float(e.balance),
-            "bucket": bucket,
-            "officer": officer,
-            "status": status
-        })
+    query = _board_query(today, bucket, officer)
+
+    # keyset pagination on (due_date, loan_account_id), i.e. most overdue
+    # first; cursor = "due_date:loan_account_id", absolute so a cursor
+    # from before midnight still continues at the same row
+    if cursor:
+        try:
+            due, after_id = cursor.rsplit(":", 1)
+            after_due = date.fromisoformat(due)
+            after_id = int(after_id)
+        except ValueError:
+            raise HTTPException(400, "Invalid cursor")
+
+        query = query.where(or_(
+            EMISchedule.due_date > after_due,
+            and_(
+                EMISchedule.due_date == after_due,
+                EMISchedule.loan_account_id > after_id
+            )
+        ))
+
+    rows = (await db.execute(query.limit(limit))).all()
+    results = [_board_row(r, today) for r in rows]
+
+    if len(rows) == limit:
+        last = rows[-1]
+        response.headers["X-Next-Cursor"] = f"{last.due_date.isoformat()}:{last.loan_account_id}"
 
     return results
 
-@router.get("/board")
-def recovery_board(db: Session = Depends(get_db)):
+
+@router.get("/board/export")
+def export_board(
+    format: ExportFormat = "csv",
+    bucket: Optional[Literal[BUCKETS]] = None,
+    officer: Optional[str] = None
+):
 
     today = date.today()
 
-    # fetch all overdue EMIs
-    emis = db.query(EMISchedule).filter(
-        EMISchedule.balance > 0,
-        EMISchedule.due_date < today
-    ).all()
-
-    results = []
-
-    for e in emis:
-
-        # get loan account
-        loan = db.query(LoanAccount).filter(
-            LoanAccount.id == e.loan_account_id
-        ).first()
-
-        if not loan:
-            continue
-
-        # get application
-        app = db.query(LoanApplication).filter(
-            LoanApplication.id == loan.application_id
-        ).first()
-
-        # get customer
-        customer = db.query(Customer).filter(
-            Customer.id == app.customer_id
-        ).first() if app else None
-
-        dpd = (today - e.due_date).days
-
-        # bucket logic
-        if dpd <= 30:
-            bucket = "DPD 1-30"
-        elif dpd <= 60:
-            bucket = "DPD 31-60"
-        else:
-            bucket = "DPD 60+"
-
-        # fake officer/status for now (safe default)
-        officer = "Unassigned"
-        status = "Pending"
-
-        results.append({
-            "loan_account_id": loan.id,
-            "customer": customer.name if customer else "Unknown",
-            "loan_id": loan.account_number,
-            "installment": e.installment_no,
-            "dpd": dpd,
-            "overdue_amount": float(e.balance),
-            "bucket": bucket,
-            "officer": officer,
-            "status": status
-        })
-
-    return results
\ No newline at end of file
+    return stream_export(
+        _board_query(today, bucket, officer),
+        lambda r: _board_row(r, today),
+        BOARD_FIELDS,
+        format,
+        f"recovery-board-{today}"
+    )
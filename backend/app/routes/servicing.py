@@ -1,10 +1,18 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy import func
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import func, case, and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from datetime import date
-from app.core.database import get_db
-from app.models.disbursement import LoanAccount, EMISchedule
+from datetime import date, timedelta
+from typing import List, Optional
+from app.core.database import get_db, get_async_db
+from app.models.disbursement import EMISchedule
 from app.models.payment import Payment
+from app.models.loan_summary import LoanSummary
+from app.models.dpd_snapshot import DPDSnapshot
+from app.utils.dpd import BUCKETS, bucket_totals_query, collect_bucket_totals
+from app.utils.locks import locked_loan_account
+from app.utils.loan_summary import apply_payment
+from app.utils.export import ExportFormat, stream_export
 
 router = APIRouter(prefix="/servicing", tags=["Loan Servicing"])
 
@@ -12,24 +20,15 @@ router = APIRouter(prefix="/servicing", tags=["Loan Servicing"])
 # DASHBOARD DATA
 # ------------------------------
 @router.get("/dashboard")
-def dashboard(db: Session = Depends(get_db)):
-
-    # active loans (only ACTIVE ones)
-    active_loans = db.query(LoanAccount).filter(
-        LoanAccount.status == "ACTIVE"
-    ).count()
-
-    # total outstanding = SUM(balance)
-    total_outstanding = db.query(
-        func.coalesce(func.sum(EMISchedule.balance), 0)
-    ).scalar()
-
-    # total collected amount
-    total_collected = db.query(
-        func.coalesce(func.sum(Payment.amount), 0)
-    ).filter(
-        Payment.status == "SUCCESS"
-    ).scalar()
+async def dashboard(db: AsyncSession = Depends(get_async_db)):
+
+    # one summary row per loan account, maintained on disbursement/payment
+    totals = await db.execute(select(
+        func.coalesce(func.sum(case((LoanSummary.status == "ACTIVE", 1), else_=0)), 0),
+        func.coalesce(func.sum(LoanSummary.outstanding_balance), 0),
+        func.coalesce(func.sum(LoanSummary.total_paid), 0)
+    ))
+    active_loans, total_outstanding, total_collected = totals.one()
 
     # total payable = collected + outstanding
     total_payable = total_collected + total_outstanding
@@ -46,71 +45,128 @@ def dashboard(db: Session = Depends(get_db)):
     }
 
 
+BUCKET_KEYS = dict(zip(BUCKETS, ("dpd_1_30", "dpd_31_60", "dpd_60_plus")))
+
+
 @router.get("/overdue-buckets")
-def overdue_buckets(db: Session = Depends(get_db)):
+async def overdue_buckets(live: bool = False, db: AsyncSession = Depends(get_async_db)):
 
     today = date.today()
 
-    emis = db.query(EMISchedule).filter(
-        EMISchedule.balance > 0,
-        EMISchedule.due_date < today
-    ).all()
+    # today's nightly snapshot unless a live figure is asked for
+    snapshot = [] if live else (await db.scalars(
+        select(DPDSnapshot).where(DPDSnapshot.snapshot_date == today)
+    )).all()
 
-    b1 = b2 = b3 = 0
+    if snapshot:
+        amounts = {s.bucket: s.amount for s in snapshot}
+    else:
+        totals = collect_bucket_totals(await db.execute(bucket_totals_query(today)))
+        amounts = {b: v["amount"] for b, v in totals.items()}
 
-    for e in emis:
-        dpd = (today - e.due_date).days
+    return {BUCKET_KEYS[b]: amounts.get(b, 0.0) for b in BUCKETS}
 
-        if dpd <= 30:
-            b1 += float(e.balance)
-        elif dpd <= 60:
-            b2 += float(e.balance)
-        else:
-            b3 += float(e.balance)
 
-    return {
-        "dpd_1_30": b1,
-        "dpd_31_60": b2,
-        "dpd_60_plus": b3
-    }
+@router.get("/overdue-trend")
+async def overdue_trend(days: int = Query(30, ge=1, le=366), db: AsyncSession = Depends(get_async_db)):
+
+    since = date.today() - timedelta(days=days)
+
+    snapshots = await db.scalars(
+        select(DPDSnapshot).where(
+            DPDSnapshot.snapshot_date >= since
+        ).order_by(DPDSnapshot.snapshot_date)
+    )
+
+    trend = {}
+    for s in snapshots:
+        point = trend.setdefault(s.snapshot_date, {"date": s.snapshot_date})
+        point[BUCKET_KEYS[s.bucket]] = s.amount
+        point[BUCKET_KEYS[s.bucket] + "_loans"] = s.loans
+
+    return list(trend.values())
 
 # ------------------------------
 # EMI TIMELINE
 # ------------------------------
-@router.get("/timeline/{loan_account_id}")
-def emi_timeline(loan_account_id: int, db: Session = Depends(get_db)):
+MAX_TIMELINES = 500
+
+
+def _timeline_query(loan_account_ids):
+    """
+    Installments of several loan accounts in one query, each outer-joined
+    to the distinct SUCCESS payment dates of its account.
+    """
+    paid_dates = select(
+        Payment.loan_account_id,
+        Payment.payment_date
+    ).where(
+        Payment.loan_account_id.in_(loan_account_ids),
+        Payment.status == "SUCCESS"
+    ).distinct().subquery()
+
+    return select(
+        EMISchedule.loan_account_id,
+        EMISchedule.installment_no,
+        EMISchedule.due_date,
+        EMISchedule.emi,
+        paid_dates.c.payment_date
+    ).outerjoin(
+        paid_dates,
+        and_(
+            paid_dates.c.loan_account_id == EMISchedule.loan_account_id,
+            paid_dates.c.payment_date == EMISchedule.due_date
+        )
+    ).where(
+        EMISchedule.loan_account_id.in_(loan_account_ids)
+    ).order_by(
+        EMISchedule.loan_account_id,
+        EMISchedule.installment_no
+    )
 
-    today = date.today()
 
-    emis = db.query(EMISchedule).filter(
-        EMISchedule.loan_account_id == loan_account_id
-    ).all()
+async def _timelines(db: AsyncSession, loan_account_ids):
 
-    timeline = []
+    today = date.today()
 
-    for e in emis:
+    timelines = {i: [] for i in loan_account_ids}
 
-        paid = db.query(Payment).filter(
-            Payment.loan_account_id == loan_account_id,
-            Payment.payment_date == e.due_date,
-            Payment.status == "SUCCESS"
-        ).first()
+    for loan_account_id, installment_no, due_date, emi, paid_on in await db.execute(_timeline_query(loan_account_ids)):
 
-        if paid:
+        if paid_on is not None:
             status = "PAID"
-        elif e.due_date < today:
+        elif due_date < today:
             status = "OVERDUE"
         else:
             status = "UPCOMING"
 
-        timeline.append({
-            "installment": e.installment_no,
-            "due_date": e.due_date,
-            "emi": e.emi,
+        timelines[loan_account_id].append({
+            "installment": installment_no,
+            "due_date": due_date,
+            "emi": emi,
             "status": status
         })
 
-    return timeline
+    return timelines
+
+
+@router.get("/timeline/{loan_account_id}")
+async def emi_timeline(loan_account_id: int, db: AsyncSession = Depends(get_async_db)):
+    return (await _timelines(db, [loan_account_id]))[loan_account_id]
+
+
+@router.get("/timelines")
+async def emi_timelines(
+    loan_account_ids: List[int] = Query(...),
+    db: AsyncSession = Depends(get_async_db)
+):
+
+    loan_account_ids = list(dict.fromkeys(loan_account_ids))
+
+    if len(loan_account_ids) > MAX_TIMELINES:
+        raise HTTPException(400, f"At most {MAX_TIMELINES} loan accounts per request")
+
+    return await _timelines(db, loan_account_ids)
 
 
 # ------------------------------
@@ -123,53 +179,69 @@ def post_payment(
     mode: str,
     db: Session = Depends(get_db)
 ):
-    
-    loan_account = db.query(LoanAccount).filter(
-    LoanAccount.id == loan_account_id
-).first()
-
-    if not loan_account:
-        return {"error": "Loan account not found"}
-
-
-    # 1️⃣ save payment
-    payment = Payment(
-        loan_account_id=loan_account.id,
-        amount=amount,
-        payment_date=date.today(),
-        mode=mode,
-        status="SUCCESS"
-    )
-    db.add(payment)
-
-    # 2️⃣ fetch pending EMIs oldest first
-    pending = db.query(EMISchedule).filter(
-        EMISchedule.loan_account_id == loan_account.id,
-        EMISchedule.balance > 0
-    ).order_by(EMISchedule.installment_no).all()
-
-    remaining = amount
-
-    # 3️⃣ allocate payment across EMIs
-    for emi in pending:
-        if remaining <= 0:
-            break
-
-        due = float(emi.principal + emi.interest)
 
-        if remaining >= due:
-            # fully paid
-            remaining -= due
-            emi.principal = 0
-            emi.interest = 0
-            emi.balance = 0
-        else:
-            # partially paid
-            emi.balance = float(emi.balance) - remaining
-            remaining = 0
-
-    # 4️⃣ commit everything together
-    db.commit()
+    with locked_loan_account(db, loan_account_id) as loan_account:
+
+        if not loan_account:
+            return {"error": "Loan account not found"}
+
+        # 1️⃣ save payment
+        payment = Payment(
+            loan_account_id=loan_account.id,
+            amount=amount,
+            payment_date=date.today(),
+            mode=mode,
+            status="SUCCESS"
+        )
+        db.add(payment)
+
+        remaining = amount
+        last_installment = 0
+        paid_principal = paid_interest = paid_balance = 0.0
+
+        # 2️⃣ allocate across pending EMIs oldest first, fetching only
+        # as many installments as the amount can cover
+        while remaining > 0:
+            page_size = min(int(remaining // (loan_account.emi_amount or remaining)) + 2, 60)
+
+            pending = db.query(EMISchedule).filter(
+                EMISchedule.loan_account_id == loan_account.id,
+                EMISchedule.balance > 0,
+                EMISchedule.installment_no > last_installment
+            ).order_by(EMISchedule.installment_no).limit(page_size).all()
+
+            if not pending:
+                break
+
+            for emi in pending:
+                if remaining <= 0:
+                    break
+
+                due = float(emi.principal + emi.interest)
+
+                if remaining >= due:
+                    # fully paid
+                    remaining -= due
+                    paid_principal += float(emi.principal)
+                    paid_interest += float(emi.interest)
+                    paid_balance += float(emi.balance)
+                    emi.principal = 0
+                    emi.interest = 0
+                    emi.balance = 0
+                else:
+                    # partially paid
+                    paid_balance += remaining
+                    emi.balance = float(emi.balance) - remaining
+                    remaining = 0
+
+            last_installment = pending[-1].installment_no
+
+        # 3️⃣ keep the balance summary in step
+        db.flush()
+        apply_payment(db, loan_account.id, amount, paid_principal, paid_interest, paid_balance)
+
+        # 4️⃣ commit everything together, still holding the account lock
+        db.commit()
 
     return {
         "message": "Payment posted",
@@ -178,11 +250,13 @@ def post_payment(
     }
 
 @router.get("/recent-payments/{loan_account_id}")
-def recent_payments(loan_account_id: int, db: Session = Depends(get_db)):
+async def recent_payments(loan_account_id: int, db: AsyncSession = Depends(get_async_db)):
 
-    payments = db.query(Payment).filter(
-        Payment.loan_account_id == loan_account_id
-    ).order_by(Payment.id.desc()).limit(10).all()
+    payments = await db.scalars(
+        select(Payment).where(
+            Payment.loan_account_id == loan_account_id
+        ).order_by(Payment.id.desc()).limit(10)
+    )
 
     return [
         {
@@ -193,4 +267,37 @@ def recent_payments(loan_account_id: int, db: Session = Depends(get_db)):
             "status": p.status
         }
         for p in payments
-    ]
\ No newline at end of file
+    ]
+
+
+PAYMENT_FIELDS = ["id", "loan_account_id", "amount", "date", "mode", "status"]
+
+
+@router.get("/payments/export")
+def export_payments(
+    format: ExportFormat = "csv",
+    since: Optional[date] = None,
+    loan_account_id: Optional[int] = None
+):
+
+    query = select(
+        Payment.id,
+        Payment.loan_account_id,
+        Payment.amount,
+        Payment.payment_date.label("date"),
+        Payment.mode,
+        Payment.status
+    ).order_by(Payment.id.desc())
+
+    if since:
+        query = query.where(Payment.payment_date >= since)
+    if loan_account_id:
+        query = query.where(Payment.loan_account_id == loan_account_id)
+
+    return stream_export(
+        query,
+        lambda p: dict(p._mapping),
+        PAYMENT_FIELDS,
+        format,
+        f"payments-{date.today()}"
+    )
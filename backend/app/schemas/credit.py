@@ -1,12 +1,46 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
 
 class CreditInput(BaseModel):
     cibil_score: int
     monthly_income: float
     existing_obligations: float
+    employment_type: Optional[str] = None   # defaults to the customer's employment details
 
 class CreditDecision(BaseModel):
-    risk_grade: str
+    risk_grade: Optional[str] = None        # defaults to the rules engine's grade
     decision: str
-    remarks: Optional[str] = None
\ No newline at end of file
+    remarks: Optional[str] = None
+
+
+# rules engine batch grading
+class CreditApplicationInput(BaseModel):
+    application_id: Optional[int] = None
+    cibil_score: Optional[int] = None       # None: no bureau record
+    monthly_income: float
+    existing_obligations: float = 0
+    employment_type: Optional[str] = None
+
+class CreditGradeRequest(BaseModel):
+    applications: List[CreditApplicationInput] = Field(..., min_length=1, max_length=100_000)
+    policy: Optional[dict] = None           # what-if: grade against this policy instead
+
+class CreditGrade(BaseModel):
+    application_id: Optional[int] = None
+    foir: Optional[float] = None
+    risk_level: str
+    decision: str
+    reasons: List[str]
+
+class CreditGradeResult(BaseModel):
+    policy_version: Optional[str] = None
+    counts: Dict[str, int]                  # applications per risk level
+    grades: List[CreditGrade]
+
+class CreditRegradeResult(BaseModel):
+    policy_version: Optional[str] = None
+    reviews: int
+    changed: int
+    applied: bool
+    counts: Dict[str, int]                  # reviews per new risk level
+    transitions: Dict[str, int]             # "OLD -> NEW": reviews
@@ -0,0 +1,6 @@
+from pydantic import BaseModel, Field
+from typing import List
+
+class ConfirmBatchRequest(BaseModel):
+    application_ids: List[int] = Field(..., min_length=1, max_length=5000)
+    chunk_size: int = Field(200, ge=1, le=1000)   # applications per transaction
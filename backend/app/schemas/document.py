@@ -1,10 +1,5 @@
-from pydantic import BaseModel
-
-class UploadDocumentRequest(BaseModel):
-    customer_id: int
-    document_type: str
-    file_path: str   # for now frontend sends path or filename
-
+from pydantic import BaseModel, ConfigDict
+from typing import Dict, List, Optional
 
 class VerifyDocumentRequest(BaseModel):
     document_id: int
@@ -17,4 +12,46 @@ class EmploymentUpdateRequest(BaseModel):
     designation: str
     experience_years: int
     monthly_income: float
-    employment_type: str
\ No newline at end of file
+    employment_type: str
+
+
+# responses
+class DocumentStatus(BaseModel):
+    document_type: str
+    status: str          # VERIFIED / PROCESSING / UPLOADED / MISSING
+    file: Optional[str] = None
+
+class EmploymentOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    customer_id: int
+    employment_type: Optional[str] = None
+    company_name: Optional[str] = None
+    designation: Optional[str] = None
+    monthly_income: Optional[float] = None
+    experience_years: Optional[int] = None
+
+class ProcessingOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    customer_id: Optional[int] = None
+    document_id: Optional[int] = None
+    stage: Optional[str] = None
+    progress_percent: Optional[int] = None
+
+class DocumentSummary(BaseModel):
+    documents: List[DocumentStatus]
+    employment: Optional[EmploymentOut] = None
+    processing: List[ProcessingOut]
+
+class CustomerReadiness(BaseModel):
+    customer_id: int
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    ready: bool          # every required document verified
+    verified: int        # required types with a verified document
+    pending: int         # uploaded, none verified yet
+    missing: int         # nothing uploaded
+    documents: Dict[str, str]   # type -> VERIFIED / PENDING / MISSING
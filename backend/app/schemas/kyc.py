@@ -1,4 +1,5 @@
 from pydantic import BaseModel
+from typing import List, Optional
 
 class PANRequest(BaseModel):
     customer_id: int
@@ -17,4 +18,19 @@ class CreditCheckRequest(BaseModel):
     cibil_score: int
 
 class FinalKYCRequest(BaseModel):
-    customer_id: int
\ No newline at end of file
+    customer_id: int
+
+# /kyc/bulk report
+class KYCBulkError(BaseModel):
+    line: int                       # 1-based line in the upload (CSV header is line 1)
+    customer_id: Optional[int] = None
+    error: str
+
+class KYCBulkResult(BaseModel):
+    rows: int
+    inserted: int
+    updated: int
+    failed: int
+    seconds: float
+    errors: List[KYCBulkError]
+    errors_truncated: bool = False
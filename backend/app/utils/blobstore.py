@@ -0,0 +1,72 @@
+import hashlib
+import os
+import tempfile
+
+from app.core.config import DOCUMENT_STORE_DIR
+
+
+# ------------------------------
+# CONTENT-ADDRESSED STORE
+# ------------------------------
+# Every blob lives at <root>/ab/cd/<sha256>, so identical files are
+# stored once however often they are uploaded. Writes go to <root>/tmp
+# first and are renamed into place once the hash is known; rename is
+# atomic on one filesystem, so a reader never sees a partial blob and
+# two concurrent writers of the same content simply overwrite each
+# other with identical bytes.
+
+class ContentStore:
+    def __init__(self, root: str):
+        self.root = root
+
+    def key(self, digest: str) -> str:
+        return f"{digest[:2]}/{digest[2:4]}/{digest}"
+
+    def path(self, digest: str) -> str:
+        return os.path.join(self.root, digest[:2], digest[2:4], digest)
+
+    def exists(self, digest: str) -> bool:
+        return os.path.exists(self.path(digest))
+
+    def writer(self) -> "BlobWriter":
+        return BlobWriter(self)
+
+
+class BlobWriter:
+    """Temp file that hashes and sizes what is written to it."""
+
+    def __init__(self, store: ContentStore):
+        self.store = store
+        tmp_dir = os.path.join(store.root, "tmp")
+        os.makedirs(tmp_dir, exist_ok=True)
+        fd, self.tmp_path = tempfile.mkstemp(dir=tmp_dir)
+        self.file = os.fdopen(fd, "wb")
+        self.hash = hashlib.sha256()
+        self.size = 0
+
+    def write(self, data: bytes):
+        self.hash.update(data)
+        self.file.write(data)
+        self.size += len(data)
+
+    def commit(self):
+        """Move the blob into place; returns (digest, stored) where
+        ``stored`` is False if identical content was already there."""
+        self.file.close()
+        digest = self.hash.hexdigest()
+        if self.store.exists(digest):
+            os.remove(self.tmp_path)
+            return digest, False
+
+        target = self.store.path(digest)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        os.replace(self.tmp_path, target)
+        return digest, True
+
+    def abort(self):
+        self.file.close()
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+
+
+document_store = ContentStore(DOCUMENT_STORE_DIR)
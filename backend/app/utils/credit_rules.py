@@ -0,0 +1,193 @@
+import json
+from typing import NamedTuple
+
+import numpy as np
+
+from app.core.config import CREDIT_POLICY_FILE
+from app.core.credit_policy import CREDIT_POLICY
+from app.utils.normalize import normalize_employment_type
+
+
+# ------------------------------
+# CREDIT RULES ENGINE
+# ------------------------------
+# A policy (see app.core.credit_policy) is validated and compiled once
+# into per-rule condition lists. Evaluating a batch is then one numpy
+# comparison per condition over the whole batch, whatever its size:
+# rule masks (rules x applications) -> worst matched grade per column.
+# Reasons are the rules that set the final grade, looked up once per
+# distinct combination rather than per application.
+
+NUMERIC_FIELDS = ("cibil_score", "foir", "monthly_income", "existing_obligations")
+CATEGORY_FIELDS = ("employment_type",)
+
+OPERATORS = {
+    "<": np.less,
+    "<=": np.less_equal,
+    ">": np.greater,
+    ">=": np.greater_equal,
+    "==": np.equal,
+    "!=": np.not_equal,
+    "in": lambda column, values: np.isin(column, values),
+    "not_in": lambda column, values: ~np.isin(column, values),
+    "missing": lambda column, _: np.isnan(column) if column.dtype.kind == "f" else column == "",
+}
+
+NUMERIC_OPERATORS = set(OPERATORS)
+CATEGORY_OPERATORS = {"==", "!=", "in", "not_in", "missing"}
+
+MAX_RULES = 62      # reason combinations are packed into an int64
+
+
+def _category(value):
+    if not isinstance(value, str):
+        raise TypeError
+    return normalize_employment_type(value) or ""
+
+
+class Grading(NamedTuple):
+    foir: np.ndarray            # (n,) percent, inf without income
+    risk_level: np.ndarray      # (n,) grade names
+    decision: np.ndarray        # (n,) recommended decision
+    reasons: list               # n tuples of rule names
+
+    def rows(self):
+        return [
+            {"foir": round(float(f), 2) if np.isfinite(f) else None, "risk_level": g, "decision": d, "reasons": list(r)}
+            for f, g, d, r in zip(self.foir.tolist(), self.risk_level.tolist(), self.decision.tolist(), self.reasons)
+        ]
+
+
+class CompiledPolicy:
+    def __init__(self, policy: dict):
+        """Raises ValueError describing the first problem in ``policy``."""
+        if not isinstance(policy, dict):
+            raise ValueError("policy must be an object")
+        self.version = policy.get("version")
+        if self.version is not None and not isinstance(self.version, str):
+            raise ValueError("version must be a string")
+
+        grades = policy.get("grades")
+        if not isinstance(grades, list) or not grades or not all(isinstance(g, str) for g in grades):
+            raise ValueError("grades must be a non-empty list of names")
+        if len(set(grades)) != len(grades):
+            raise ValueError("grades must be unique")
+        self.grades = grades
+        decisions = policy.get("decisions")
+        if not isinstance(decisions, dict):
+            raise ValueError("decisions must map each grade to a decision")
+        missing = [g for g in self.grades if g not in decisions]
+        if missing:
+            raise ValueError(f"no decision for grades: {', '.join(missing)}")
+        unnamed = [g for g in self.grades if not isinstance(decisions[g], str) or not decisions[g]]
+        if unnamed:
+            raise ValueError(f"decisions must be non-empty strings, check grades: {', '.join(unnamed)}")
+
+        rules = policy.get("rules", [])
+        if not isinstance(rules, list) or not all(isinstance(r, dict) for r in rules):
+            raise ValueError("rules must be a list of objects")
+        if len(rules) > MAX_RULES:
+            raise ValueError(f"at most {MAX_RULES} rules")
+
+        rank = {g: i for i, g in enumerate(self.grades)}
+        self.rules = []
+        for rule in rules:
+            name = rule.get("name")
+            if not isinstance(name, str) or not name:
+                raise ValueError("every rule needs a name")
+            if rule.get("grade") not in rank:
+                raise ValueError(f"rule {name}: unknown grade {rule.get('grade')!r}")
+            when = rule.get("when")
+            if not isinstance(when, list) or not when:
+                raise ValueError(f"rule {name}: when must be a non-empty list of conditions")
+            conditions = [self._condition(name, c) for c in when]
+            self.rules.append((name, rank[rule["grade"]], conditions))
+
+        self.names = [name for name, _, _ in self.rules]
+        self.rule_rank = np.array([r for _, r, _ in self.rules], dtype=np.int64)
+        self.grade_names = np.array(self.grades, dtype=object)
+        self.decision_names = np.array([decisions[g] for g in self.grades], dtype=object)
+        self._reasons = {0: ()}
+
+    @staticmethod
+    def _condition(name, condition):
+        if not isinstance(condition, list) or len(condition) != 3:
+            raise ValueError(f"rule {name}: conditions are [field, operator, value]")
+        field, op, value = condition
+        if field in NUMERIC_FIELDS:
+            allowed, cast = NUMERIC_OPERATORS, float
+        elif field in CATEGORY_FIELDS:
+            # the column is normalized at evaluate time, so the values are too
+            allowed, cast = CATEGORY_OPERATORS, _category
+        else:
+            raise ValueError(f"rule {name}: unknown field {field!r}")
+        if op not in allowed:
+            raise ValueError(f"rule {name}: operator {op!r} does not apply to {field}")
+
+        if op == "missing":
+            return field, OPERATORS[op], None
+        try:
+            if op in ("in", "not_in"):
+                if not isinstance(value, list):
+                    raise TypeError
+                value = [cast(v) for v in value]
+            else:
+                value = cast(value)
+        except (TypeError, ValueError, AttributeError):
+            kind = "numbers" if cast is float else "strings"
+            raise ValueError(f"rule {name}: {field} {op} takes {kind}, got {value!r}")
+        return field, OPERATORS[op], value
+
+    def evaluate(self, cibil_score, monthly_income, existing_obligations, employment_type) -> Grading:
+        """
+        Grade a batch given as equal-length sequences. Missing scores or
+        amounts are None/NaN, missing employment type None or "".
+        Employment types are compared in normalize_employment_type form.
+        """
+        income = np.asarray(monthly_income, dtype=np.float64)
+        obligations = np.asarray(existing_obligations, dtype=np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            foir = np.where(income > 0, obligations / income * 100, np.inf)
+
+        columns = {
+            "cibil_score": np.asarray(cibil_score, dtype=np.float64),
+            "foir": foir,
+            "monthly_income": income,
+            "existing_obligations": obligations,
+            "employment_type": np.array([normalize_employment_type(e) or "" for e in employment_type], dtype=str),
+        }
+        n = len(foir)
+
+        masks = np.ones((len(self.rules), n), dtype=bool)
+        with np.errstate(invalid="ignore"):
+            for i, (_, _, conditions) in enumerate(self.rules):
+                for field, op, value in conditions:
+                    masks[i] &= op(columns[field], value)
+
+        matched_rank = np.where(masks, self.rule_rank[:, None], 0)
+        final = matched_rank.max(axis=0) if len(self.rules) else np.zeros(n, dtype=np.int64)
+
+        # rules that decided the grade, as one bit pattern per application
+        deciding = masks & (self.rule_rank[:, None] == final[None, :])
+        codes = (deciding.T.astype(np.int64) << np.arange(len(self.rules), dtype=np.int64)).sum(axis=1)
+        for code in np.unique(codes).tolist():
+            if code not in self._reasons:
+                self._reasons[code] = tuple(name for i, name in enumerate(self.names) if code >> i & 1)
+
+        return Grading(
+            foir=foir,
+            risk_level=self.grade_names[final],
+            decision=self.decision_names[final],
+            reasons=[self._reasons[c] for c in codes.tolist()],
+        )
+
+
+def _load_policy():
+    if CREDIT_POLICY_FILE:
+        with open(CREDIT_POLICY_FILE) as f:
+            return json.load(f)
+    return CREDIT_POLICY
+
+
+# compiled once per process; a policy change is a deploy or restart
+current_policy = CompiledPolicy(_load_policy())
@@ -0,0 +1,210 @@
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+
+from app.core.config import CUSTOMER_CACHE_SIZE, CUSTOMER_CACHE_TTL
+from app.models.application import LoanApplication
+from app.models.credit import CreditReview
+from app.models.customer import Customer, CustomerAddress, EmploymentDetails
+from app.models.disbursement import LoanAccount
+from app.models.document import Document
+from app.models.kyc import KYCRecord
+from app.utils.cache import TTLCache
+
+
+# ------------------------------
+# CUSTOMER 360
+# ------------------------------
+# One customer with everything the onboarding, KYC, document, credit
+# and servicing screens show, in a fixed number of queries (customer +
+# one SELECT ... IN per relationship), cached per customer.
+#
+# ORM writes to any of these rows evict the customer in this process;
+# set-based writes call invalidate_customers after their commit.
+# Loan balances are updated with plain SQL by payment posting, and
+# other workers hold their own cache, so those can lag by up to
+# CUSTOMER_CACHE_TTL seconds.
+
+_cache = TTLCache(CUSTOMER_CACHE_SIZE, CUSTOMER_CACHE_TTL)
+
+
+# public columns per entity; internal ones such as the mobile/PAN search
+# keys and the document store key stay out of the view
+CUSTOMER_FIELDS = [
+    "id", "first_name", "last_name", "dob", "gender",
+    "mobile_number", "email", "otp_verified", "status", "created_at",
+]
+ADDRESS_FIELDS = ["id", "customer_id", "street_address", "city", "state", "pin_code"]
+EMPLOYMENT_FIELDS = [
+    "id", "customer_id", "employment_type", "company_name",
+    "designation", "monthly_income", "experience_years",
+]
+APPLICATION_FIELDS = [
+    "id", "customer_id", "application_number", "loan_type", "requested_amount",
+    "tenure_months", "interest_rate_expected", "status", "created_at", "updated_at",
+]
+KYC_FIELDS = [
+    "id", "customer_id", "pan_number", "pan_verified", "aadhaar_number", "aadhaar_verified",
+    "video_kyc_status", "cibil_score", "cibil_checked", "created_at",
+]
+DOCUMENT_FIELDS = [
+    "id", "customer_id", "document_type", "original_filename", "content_type",
+    "size_bytes", "uploaded_at", "verified", "processing_status",
+]
+CREDIT_REVIEW_FIELDS = [
+    "id", "application_id", "cibil_score", "monthly_income", "total_obligations", "foir_percent",
+    "fraud_flag", "risk_level", "remarks", "decision", "reviewed_by", "reviewed_at",
+]
+LOAN_ACCOUNT_FIELDS = [
+    "id", "application_id", "account_number", "loan_amount", "principal_amount",
+    "interest_rate", "tenure_months", "emi_amount", "status",
+]
+
+
+def _fields(obj, fields):
+    return {name: getattr(obj, name) for name in fields} if obj is not None else None
+
+
+def customer_360_query(customer_id: int):
+    applications = selectinload(Customer.applications)
+    return select(Customer).where(Customer.id == customer_id).options(
+        selectinload(Customer.addresses),
+        selectinload(Customer.employment),
+        selectinload(Customer.kyc_records),
+        selectinload(Customer.documents),
+        applications.selectinload(LoanApplication.credit_reviews),
+        applications.selectinload(LoanApplication.loan_accounts).selectinload(LoanAccount.summary),
+    )
+
+
+def _latest_review(reviews):
+    # reviewed ones first by time, then the most recently created
+    return max(reviews, key=lambda r: (r.reviewed_at is not None, r.reviewed_at or 0, r.id), default=None)
+
+
+def build_360(customer: Customer):
+    applications = []
+    loan_accounts = []
+    reviews = []
+
+    for application in customer.applications:
+        review = _latest_review(application.credit_reviews)
+        reviews += application.credit_reviews
+        applications.append({**_fields(application, APPLICATION_FIELDS), "credit_review": _fields(review, CREDIT_REVIEW_FIELDS)})
+
+        for account in application.loan_accounts:
+            summary = account.summary
+            loan_accounts.append({
+                **_fields(account, LOAN_ACCOUNT_FIELDS),
+                "outstanding_balance": summary.outstanding_balance if summary else None,
+                "total_paid": summary.total_paid if summary else None,
+                "next_due_date": summary.next_due_date if summary else None,
+            })
+
+    return {
+        # same first four keys as the old /onboarding/customers/{id}
+        "customer": _fields(customer, CUSTOMER_FIELDS),
+        "address": _fields(customer.addresses[0] if customer.addresses else None, ADDRESS_FIELDS),
+        "employment": _fields(customer.employment[0] if customer.employment else None, EMPLOYMENT_FIELDS),
+        "application": applications[0] if applications else None,
+        "applications": applications,
+        "kyc": _fields(customer.kyc_records[0] if customer.kyc_records else None, KYC_FIELDS),
+        "documents": [_fields(d, DOCUMENT_FIELDS) for d in customer.documents],
+        "credit_review": _fields(_latest_review(reviews), CREDIT_REVIEW_FIELDS),
+        "loan_accounts": loan_accounts,
+    }
+
+
+async def customer_360(db: AsyncSession, customer_id: int):
+    """Cached 360 view of a customer, or None if there is no such customer."""
+    view = _cache.get(customer_id)
+    if view is None:
+        customer = await db.scalar(customer_360_query(customer_id))
+        if customer is None:
+            return None
+        view = build_360(customer)
+        _cache.set(customer_id, view)
+    return view
+
+
+def invalidate_customer(customer_id: int):
+    _cache.pop(customer_id)
+
+
+def invalidate_customers(customer_ids):
+    """
+    Evict these customers after a set-based write (Core insert/update,
+    bulk UPDATE ... WHERE). Those skip the ORM events below, so any code
+    that writes the 360 tables that way calls this once it has committed.
+    """
+    for customer_id in set(customer_ids):
+        _cache.pop(customer_id)
+
+
+def customer_cache_stats():
+    return _cache.stats()
+
+
+# ------------------------------
+# INVALIDATION
+# ------------------------------
+def _stale(target, customer_id):
+    if customer_id is None:
+        return
+    invalidate_customer(customer_id)
+    session = Session.object_session(target)
+    if session is not None:
+        session.info.setdefault("stale_customers", set()).add(customer_id)
+
+
+def _by_customer(mapper, connection, target):
+    _stale(target, target.id if isinstance(target, Customer) else target.customer_id)
+
+
+def _by_application(mapper, connection, target):
+    # resolved to customers once per flush (see _resolve_applications)
+    session = Session.object_session(target)
+    if session is not None and target.application_id is not None:
+        session.info.setdefault("stale_applications", set()).add(target.application_id)
+
+
+@event.listens_for(Session, "after_flush")
+def _resolve_applications(session, flush_context):
+    application_ids = session.info.pop("stale_applications", None)
+    if not application_ids:
+        return
+
+    customer_ids = session.connection().scalars(
+        select(LoanApplication.customer_id).where(LoanApplication.id.in_(application_ids))
+    ).all()
+    stale = session.info.setdefault("stale_customers", set())
+    for customer_id in customer_ids:
+        invalidate_customer(customer_id)
+        stale.add(customer_id)
+
+
+for _model, _listener in (
+    (Customer, _by_customer),
+    (CustomerAddress, _by_customer),
+    (EmploymentDetails, _by_customer),
+    (LoanApplication, _by_customer),
+    (KYCRecord, _by_customer),
+    (Document, _by_customer),
+    (CreditReview, _by_application),
+    (LoanAccount, _by_application),
+):
+    for _event in ("after_insert", "after_update", "after_delete"):
+        event.listen(_model, _event, _listener)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session):
+    # again after commit, in case a read re-cached the old rows meanwhile
+    for customer_id in session.info.pop("stale_customers", ()):
+        invalidate_customer(customer_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_stale(session):
+    session.info.pop("stale_customers", None)
+    session.info.pop("stale_applications", None)
@@ -0,0 +1,123 @@
+import hashlib
+import re
+import time
+
+import numpy as np
+
+# ------------------------------
+# DOCUMENT PROCESSING STAGES
+# ------------------------------
+# Runs inside the worker's process pool, so no database access here:
+# progress goes back to the coordinator through a queue set up by
+# init_worker(). Each stage walks the stored file in chunks, which keeps
+# memory flat and lets the stage check its time limit as it goes.
+#
+# normalize and extract are stand-ins for real image clean-up and OCR:
+# they do comparable per-byte CPU work on the raw file.
+
+CHUNK = 1024 * 1024
+ROW = 1024                      # "image" width for normalization
+TEXT_RUN = re.compile(rb"[\x20-\x7e]{4,}")
+
+# name, ProcessingProgress.stage, percent range
+STAGES = [
+    ("hash", "HASHING", 0, 30),
+    ("normalize", "NORMALIZING", 30, 70),
+    ("extract", "EXTRACTING", 70, 100),
+]
+
+_progress = None
+
+
+class StageTimeout(Exception):
+    pass
+
+
+def init_worker(progress_queue):
+    global _progress
+    _progress = progress_queue
+
+
+def _chunks(path):
+    with open(path, "rb") as f:
+        while chunk := f.read(CHUNK):
+            yield chunk
+
+
+def _hash(path, result):
+    digest = hashlib.sha256()
+    for chunk in _chunks(path):
+        digest.update(chunk)
+        result["size"] = result.get("size", 0) + len(chunk)
+        yield len(chunk)
+    result["sha256"] = digest.hexdigest()
+    if result.get("expected_sha256") and result["sha256"] != result["expected_sha256"]:
+        raise ValueError(f"content hash mismatch: stored {result['expected_sha256']}, read {result['sha256']}")
+
+
+def _normalize(path, result):
+    # per-row contrast stretch to 0..255, then an intensity histogram
+    histogram = np.zeros(256, dtype=np.int64)
+    for chunk in _chunks(path):
+        pixels = np.frombuffer(chunk[:len(chunk) - len(chunk) % ROW], dtype=np.uint8).reshape(-1, ROW)
+        if len(pixels):
+            low = pixels.min(axis=1, keepdims=True).astype(np.float32)
+            span = np.maximum(pixels.max(axis=1, keepdims=True) - low, 1)
+            stretched = ((pixels - low) * (255.0 / span)).astype(np.uint8)
+            histogram += np.bincount(stretched.ravel(), minlength=256)
+        yield len(chunk)
+    total = histogram.sum()
+    result["mean_intensity"] = float((histogram * np.arange(256)).sum() / total) if total else 0.0
+
+
+def _extract(path, result):
+    # printable runs stand in for OCR output
+    chars = words = 0
+    for chunk in _chunks(path):
+        for run in TEXT_RUN.findall(chunk):
+            chars += len(run)
+            words += len(run.split())
+        yield len(chunk)
+    result["text_chars"] = chars
+    result["text_words"] = words
+
+
+_STEPS = {"hash": _hash, "normalize": _normalize, "extract": _extract}
+
+
+def process_document(document_id, path, expected_sha256, size, timeouts):
+    """
+    Run every stage over the file at ``path``. Returns
+    (result, {stage: seconds}); raises StageTimeout when a stage runs
+    past its entry in ``timeouts``.
+    """
+    result = {"expected_sha256": expected_sha256}
+    timings = {}
+    size = max(size or 0, 1)
+
+    for name, stage, start, end in STAGES:
+        started = time.perf_counter()
+        limit = timeouts.get(name)
+        done = 0
+        reported = -1
+        _report(document_id, stage, start)
+
+        for n in _STEPS[name](path, result):
+            done += n
+            elapsed = time.perf_counter() - started
+            if limit and elapsed > limit:
+                raise StageTimeout(f"{name} took more than {limit:g}s")
+            percent = start + (end - start) * min(done, size) // size
+            if percent - reported >= 5:
+                _report(document_id, stage, percent)
+                reported = percent
+
+        timings[name] = round(time.perf_counter() - started, 4)
+
+    result.pop("expected_sha256")
+    return result, timings
+
+
+def _report(document_id, stage, percent):
+    if _progress is not None:
+        _progress.put((document_id, stage, percent))
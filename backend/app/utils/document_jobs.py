@@ -0,0 +1,184 @@
+import json
+from datetime import datetime, timedelta
+from typing import NamedTuple
+
+from sqlalchemy import exists, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import DOC_MAX_ATTEMPTS, DOC_RETRY_BASE_SECONDS, DOC_RETRY_MAX_SECONDS
+from app.models.document import Document
+from app.models.processing import DocumentJob, ProcessingProgress
+from app.utils.customer360 import invalidate_customers
+
+
+# ------------------------------
+# DOCUMENT JOB QUEUE
+# ------------------------------
+# document_jobs is the queue. A job is claimed with a conditional UPDATE
+# (QUEUED -> RUNNING), so any number of worker processes on any number
+# of hosts can poll the same table without handing a job out twice.
+#
+# The pipeline only owns a document's processing_status while it is
+# PENDING or PROCESSING. Once a reviewer sets another status through
+# /documents/verify, jobs still finish but leave the status alone.
+
+class ClaimedJob(NamedTuple):
+    job_id: int
+    document_id: int
+    content_hash: str
+    size_bytes: int
+
+
+def enqueue_pending(db: Session) -> int:
+    """Queue every PENDING document that has no job yet (uploads made
+    before the worker existed, or inserted outside /documents/upload)."""
+    ids = db.scalars(
+        select(Document.id).where(
+            Document.processing_status == "PENDING",
+            Document.content_hash.is_not(None),
+            ~exists().where(DocumentJob.document_id == Document.id)
+        )
+    ).all()
+    db.add_all([DocumentJob(document_id=i) for i in ids])
+    db.commit()
+    return len(ids)
+
+
+def claim(db: Session, worker: str, limit: int):
+    """Up to ``limit`` due jobs, now RUNNING and locked by ``worker``."""
+    if limit <= 0:
+        return []
+    now = datetime.utcnow()
+    candidates = db.scalars(
+        select(DocumentJob.id).where(
+            DocumentJob.status == "QUEUED",
+            DocumentJob.run_after <= now
+        ).order_by(DocumentJob.run_after, DocumentJob.id).limit(limit)
+    ).all()
+
+    claimed = []
+    for job_id in candidates:
+        won = db.execute(
+            update(DocumentJob).where(
+                DocumentJob.id == job_id,
+                DocumentJob.status == "QUEUED"
+            ).values(
+                status="RUNNING",
+                attempts=DocumentJob.attempts + 1,
+                locked_by=worker,
+                locked_at=now
+            )
+        ).rowcount
+        if won:
+            claimed.append(job_id)
+
+    if not claimed:
+        db.commit()
+        return []
+
+    rows = db.execute(
+        select(DocumentJob.id, Document.id, Document.content_hash, Document.size_bytes, Document.customer_id)
+        .join(Document, Document.id == DocumentJob.document_id)
+        .where(DocumentJob.id.in_(claimed))
+    ).all()
+    db.execute(
+        update(Document).where(
+            Document.id.in_([r[1] for r in rows]),
+            Document.processing_status.in_(["PENDING", "PROCESSING"])
+        ).values(processing_status="PROCESSING")
+    )
+    db.commit()
+
+    invalidate_customers(r[4] for r in rows)
+
+    return [ClaimedJob(*r[:4]) for r in rows]
+
+
+def release(db: Session, job_ids):
+    """Put claimed jobs that never started back in the queue, attempt
+    not counted."""
+    if not job_ids:
+        return
+    db.execute(
+        update(DocumentJob).where(
+            DocumentJob.id.in_(job_ids),
+            DocumentJob.status == "RUNNING"
+        ).values(status="QUEUED", attempts=DocumentJob.attempts - 1, locked_by=None, locked_at=None)
+    )
+    db.execute(
+        update(Document).where(
+            Document.id.in_(select(DocumentJob.document_id).where(DocumentJob.id.in_(job_ids))),
+            Document.processing_status == "PROCESSING"
+        ).values(processing_status="PENDING")
+    )
+    db.commit()
+
+
+def requeue_stale(db: Session, lease_seconds: int) -> int:
+    """RUNNING jobs whose worker stopped renewing them (crashed or
+    killed) go back to the queue; the attempt still counts."""
+    cutoff = datetime.utcnow() - timedelta(seconds=lease_seconds)
+    count = db.execute(
+        update(DocumentJob).where(
+            DocumentJob.status == "RUNNING",
+            DocumentJob.locked_at < cutoff
+        ).values(status="QUEUED", locked_by=None, locked_at=None, last_error="lease expired")
+    ).rowcount
+    db.commit()
+    return count
+
+
+def renew(db: Session, worker: str):
+    """Heartbeat: push the lease of every job ``worker`` is running."""
+    db.execute(
+        update(DocumentJob).where(
+            DocumentJob.status == "RUNNING",
+            DocumentJob.locked_by == worker
+        ).values(locked_at=datetime.utcnow())
+    )
+    db.commit()
+
+
+def backoff(attempts: int) -> float:
+    return min(DOC_RETRY_BASE_SECONDS * 2 ** (attempts - 1), DOC_RETRY_MAX_SECONDS)
+
+
+def record_progress(db: Session, document: Document, stage: str, percent: int):
+    progress = db.scalar(
+        select(ProcessingProgress).where(ProcessingProgress.document_id == document.id).limit(1)
+    )
+    if progress is None:
+        progress = ProcessingProgress(document_id=document.id, customer_id=document.customer_id)
+        db.add(progress)
+    progress.stage = stage
+    progress.progress_percent = percent
+
+
+def complete(db: Session, job: DocumentJob, document: Document, timings: dict):
+    job.status = "DONE"
+    job.locked_by = job.locked_at = None
+    job.last_error = None
+    job.stage_timings = json.dumps(timings)
+    # a reviewer may have set the status while the job ran
+    if document.processing_status == "PROCESSING":
+        document.processing_status = "COMPLETED"
+        record_progress(db, document, "COMPLETED", 100)
+    db.commit()
+
+
+def retry_or_fail(db: Session, job: DocumentJob, document: Document, error: str, retryable: bool = True):
+    job.locked_by = job.locked_at = None
+    job.last_error = error[:2000]
+    owned = document.processing_status == "PROCESSING"
+    if not retryable or job.attempts >= DOC_MAX_ATTEMPTS:
+        job.status = "FAILED"
+        if owned:
+            document.processing_status = "FAILED"
+            record_progress(db, document, "FAILED", 0)
+    else:
+        job.status = "QUEUED"
+        job.run_after = datetime.utcnow() + timedelta(seconds=backoff(job.attempts))
+        if owned:
+            document.processing_status = "PENDING"
+            record_progress(db, document, "RETRY_WAIT", 0)
+    db.commit()
@@ -0,0 +1,82 @@
+from datetime import timedelta
+
+from sqlalchemy import func, case, insert, select
+from sqlalchemy.orm import Session
+
+from app.models.disbursement import EMISchedule
+from app.models.dpd_snapshot import DPDSnapshot
+
+BUCKETS = ("DPD 1-30", "DPD 31-60", "DPD 60+")
+
+
+def dpd_bucket(today):
+    """
+    SQL CASE bucketing EMISchedule rows by days past due. The cut-offs
+    are turned into dates here, so the expression is plain date
+    comparison on every backend.
+    """
+    return case(
+        (EMISchedule.due_date >= today - timedelta(days=30), BUCKETS[0]),
+        (EMISchedule.due_date >= today - timedelta(days=60), BUCKETS[1]),
+        else_=BUCKETS[2]
+    )
+
+
+def bucket_filter(today, bucket):
+    """Sargable due_date range of one bucket (same cut-offs as ``dpd_bucket``)."""
+    d30 = today - timedelta(days=30)
+    d60 = today - timedelta(days=60)
+
+    if bucket == BUCKETS[0]:
+        return (EMISchedule.due_date >= d30,)
+    if bucket == BUCKETS[1]:
+        return (EMISchedule.due_date < d30, EMISchedule.due_date >= d60)
+    return (EMISchedule.due_date < d60,)
+
+
+def overdue_filter(today):
+    return (
+        EMISchedule.balance > 0,
+        EMISchedule.due_date < today
+    )
+
+
+def bucket_totals_query(today):
+    bucket = dpd_bucket(today).label("bucket")
+
+    return select(
+        bucket,
+        func.count(EMISchedule.id),
+        func.count(func.distinct(EMISchedule.loan_account_id)),
+        func.coalesce(func.sum(EMISchedule.balance), 0)
+    ).where(*overdue_filter(today)).group_by(bucket)
+
+
+def collect_bucket_totals(rows):
+    """{bucket: {installments, loans, amount}} from ``bucket_totals_query`` rows."""
+    totals = {b: {"installments": 0, "loans": 0, "amount": 0.0} for b in BUCKETS}
+    for name, installments, loans, amount in rows:
+        totals[name] = {"installments": installments, "loans": loans, "amount": float(amount)}
+
+    return totals
+
+
+def bucket_totals(db: Session, today):
+    return collect_bucket_totals(db.execute(bucket_totals_query(today)))
+
+
+def take_snapshot(db: Session, day):
+    """Write (or rewrite) the aging snapshot of ``day`` and commit."""
+    totals = bucket_totals(db, day)
+
+    db.query(DPDSnapshot).filter(
+        DPDSnapshot.snapshot_date == day
+    ).delete(synchronize_session=False)
+
+    db.execute(insert(DPDSnapshot), [
+        {"snapshot_date": day, "bucket": name, **values}
+        for name, values in totals.items()
+    ])
+    db.commit()
+
+    return totals
@@ -1,25 +1,143 @@
-from datetime import date
-from dateutil.relativedelta import relativedelta
+from typing import NamedTuple
+
+import numpy as np
+
+
+# ------------------------------
+# BATCH AMORTIZATION ENGINE
+# ------------------------------
+# All money is carried as integer paise so every row satisfies
+# emi == principal + interest exactly and the last installment
+# closes the balance at zero.
+
+class Amortization(NamedTuple):
+    months: np.ndarray          # (n,)   tenure per loan
+    due_date: np.ndarray        # (n, m) datetime64[D]
+    emi: np.ndarray             # (n, m) paise
+    principal: np.ndarray       # (n, m) paise
+    interest: np.ndarray        # (n, m) paise
+    balance: np.ndarray         # (n, m) paise, after the installment
+
+    def rows(self, i):
+        """Schedule rows of loan ``i`` in the ``generate_schedule`` format."""
+        n = int(self.months[i])
+        due = self.due_date[i, :n].astype(object)
+        emi = (self.emi[i, :n] / 100).tolist()
+        principal = (self.principal[i, :n] / 100).tolist()
+        interest = (self.interest[i, :n] / 100).tolist()
+        balance = (self.balance[i, :n] / 100).tolist()
+
+        return [
+            {
+                "installment_no": k + 1,
+                "due_date": due[k],
+                "emi": emi[k],
+                "principal": principal[k],
+                "interest": interest[k],
+                "balance": balance[k]
+            }
+            for k in range(n)
+        ]
+
+
+def _finite(values, name):
+    # None becomes NaN here, and NaN cast to int64 is garbage, not an error
+    values = np.asarray(values, dtype=np.float64)
+    if not np.isfinite(values).all():
+        raise ValueError(f"{name} must be a finite number for every loan")
+    return values
+
+
+def _to_paise(values, name="amount"):
+    return np.floor(_finite(values, name) * 100 + 0.5).astype(np.int64)
+
+
+def emi_amount(principal, annual_rate, months):
+    """Standard annuity EMI (rupees, rounded to paise) for arrays of loans."""
+    P = np.asarray(principal, dtype=np.float64)
+    r = np.asarray(annual_rate, dtype=np.float64) / 12 / 100
+    n = np.asarray(months, dtype=np.float64)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        growth = np.power(1 + r, n)
+        emi = np.where(r > 0, P * r * growth / (growth - 1), P / np.maximum(n, 1))
+
+    return np.floor(emi * 100 + 0.5) / 100
+
+
+def due_dates(start_date, months):
+    """
+    Monthly due dates after each start date, matching
+    ``start + relativedelta(months=k)`` (day clamped to month end).
+    """
+    start = np.asarray(start_date, dtype="datetime64[D]").reshape(-1)
+    month0 = start.astype("datetime64[M]")
+    day = (start - month0.astype("datetime64[D]")).astype(np.int64)
+
+    offsets = np.arange(1, months + 1)
+    month = month0[:, None] + offsets[None, :]
+    first = month.astype("datetime64[D]")
+    month_len = ((month + 1).astype("datetime64[D]") - first).astype(np.int64)
+
+    return first + np.minimum(day[:, None], month_len - 1)
+
+
+def amortize(principal, annual_rate, months, start_date, emi=None):
+    """
+    Build the schedules of a whole batch of loans at once.
+
+    Arguments are equal-length arrays (scalars are broadcast). ``emi``
+    defaults to the annuity EMI. Raises ValueError when an amount or
+    rate is missing (None) or not finite. Iterates once per month over the
+    longest tenure, with every step vectorized across loans.
+    """
+    months = np.asarray(months, dtype=np.int64).reshape(-1)
+    size = months.shape[0]
+
+    P = np.broadcast_to(_to_paise(principal, "principal"), (size,))
+    rate = np.broadcast_to(_finite(annual_rate, "annual_rate"), (size,))
+    start = np.broadcast_to(np.asarray(start_date, dtype="datetime64[D]"), (size,))
+
+    if emi is None:
+        emi = emi_amount(P / 100, rate, months)
+    emi_p = np.broadcast_to(_to_paise(emi, "emi"), (size,))
+
+    width = int(months.max()) if size else 0
+    r = rate / 12 / 100
+
+    emi_out = np.zeros((size, width), dtype=np.int64)
+    principal_out = np.zeros((size, width), dtype=np.int64)
+    interest_out = np.zeros((size, width), dtype=np.int64)
+    balance_out = np.zeros((size, width), dtype=np.int64)
+
+    balance = P.copy()
+
+    for k in range(width):
+        active = k < months
+        last = k == months - 1
+
+        interest = np.floor(balance * r + 0.5).astype(np.int64)
+        paid = np.minimum(emi_p - interest, balance)
+        paid = np.where(last, balance, paid)
+        paid = np.where(active, paid, 0)
+        interest = np.where(active, interest, 0)
+
+        balance = balance - paid
+
+        emi_out[:, k] = paid + interest
+        principal_out[:, k] = paid
+        interest_out[:, k] = interest
+        balance_out[:, k] = balance
+
+    return Amortization(
+        months=months,
+        due_date=due_dates(start, width),
+        emi=emi_out,
+        principal=principal_out,
+        interest=interest_out,
+        balance=balance_out
+    )
+
 
 def generate_schedule(P, annual_rate, months, emi, start_date):
-    r = annual_rate/12/100
-    balance = P
-    schedule = []
-
-    for i in range(1, months+1):
-        interest = balance * r
-        principal = emi - interest
-        balance -= principal
-        if balance < 0:
-            balance = 0
-
-        schedule.append({
-            "installment_no": i,
-            "due_date": start_date + relativedelta(months=i),
-            "emi": round(emi,2),
-            "principal": round(principal,2),
-            "interest": round(interest,2),
-            "balance": round(balance,2)
-        })
-
-    return schedule
\ No newline at end of file
+    return amortize([P], [annual_rate], [months], [start_date], [emi]).rows(0)
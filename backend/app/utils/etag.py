@@ -0,0 +1,24 @@
+import hashlib
+import json
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+
+def etag_response(request: Request, content, headers=None):
+    """
+    JSON response carrying a content-hash ETag; 304 with no body when
+    the client's If-None-Match already has it. ``no-cache`` makes the
+    browser revalidate on every poll instead of serving a stale copy.
+    """
+    body = json.dumps(jsonable_encoder(content), separators=(",", ":"), ensure_ascii=False).encode()
+    etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+
+    headers = {**(headers or {}), "ETag": etag, "Cache-Control": "no-cache"}
+
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(",")) or if_none_match.strip() == "*":
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=body, media_type=JSONResponse.media_type, headers=headers)
@@ -0,0 +1,64 @@
+import csv
+import io
+import json
+from typing import Literal
+
+from fastapi.responses import StreamingResponse
+
+from app.core.database import SessionLocal
+
+ExportFormat = Literal["csv", "ndjson"]
+
+EXPORT_BATCH = 1000   # rows fetched per round trip and written per chunk
+
+MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def _csv_lines(rows, fields, header):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fields, extrasaction="ignore")
+    if header:
+        writer.writeheader()
+    writer.writerows(rows)
+    return buffer.getvalue()
+
+
+def _ndjson_lines(rows):
+    return "".join(json.dumps(r, default=str) + "\n" for r in rows)
+
+
+def stream_export(query, to_row, fields, fmt: ExportFormat, filename):
+    """
+    Stream a ``select()`` as CSV or NDJSON with constant memory.
+
+    Rows come through a server-side cursor (``yield_per``) and are mapped
+    by ``to_row``. The export owns its session, since the request's
+    session is gone once streaming starts.
+    """
+    def generate():
+        db = SessionLocal()
+        try:
+            rows = []
+            header = True
+
+            for record in db.execute(query.execution_options(yield_per=EXPORT_BATCH)):
+                rows.append(to_row(record))
+
+                if len(rows) == EXPORT_BATCH:
+                    yield _csv_lines(rows, fields, header) if fmt == "csv" else _ndjson_lines(rows)
+                    rows = []
+                    header = False
+
+            if rows or (header and fmt == "csv"):
+                yield _csv_lines(rows, fields, header) if fmt == "csv" else _ndjson_lines(rows)
+        finally:
+            db.close()
+
+    return StreamingResponse(
+        generate(),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{fmt}"'}
+    )
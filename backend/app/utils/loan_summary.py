@@ -0,0 +1,156 @@
+from sqlalchemy import func, case, insert, update
+from sqlalchemy.orm import Session
+
+from app.models.disbursement import LoanAccount, EMISchedule
+from app.models.loan_summary import LoanSummary
+from app.models.payment import Payment
+
+FIELDS = (
+    "outstanding_principal",
+    "interest_due",
+    "outstanding_balance",
+    "total_paid",
+    "next_due_date",
+    "status",
+)
+
+
+def open_summaries(db: Session, accounts, batch):
+    """Insert the summary rows of freshly opened accounts (``_open_accounts``)."""
+    rows = []
+    for i, account in enumerate(accounts):
+        n = int(batch.months[i])
+        rows.append({
+            "loan_account_id": account.id,
+            "outstanding_principal": int(batch.principal[i, :n].sum()) / 100,
+            "interest_due": int(batch.interest[i, :n].sum()) / 100,
+            "outstanding_balance": int(batch.balance[i, :n].sum()) / 100,
+            "total_paid": 0.0,
+            "next_due_date": batch.due_date[i, 0].astype(object) if n else None,
+            "status": "ACTIVE",
+        })
+
+    if rows:
+        db.execute(insert(LoanSummary), rows)
+
+
+def apply_payment(db: Session, loan_account_id, amount, principal, interest, balance):
+    """
+    Apply one posted payment: ``principal``, ``interest`` and ``balance``
+    are the amounts it took off the schedule. Runs in the caller's
+    transaction, under the loan account lock.
+    """
+    next_due = db.query(func.min(EMISchedule.due_date)).filter(
+        EMISchedule.loan_account_id == loan_account_id,
+        EMISchedule.balance > 0
+    ).scalar()
+
+    db.query(LoanSummary).filter(
+        LoanSummary.loan_account_id == loan_account_id
+    ).update({
+        LoanSummary.outstanding_principal: LoanSummary.outstanding_principal - principal,
+        LoanSummary.interest_due: LoanSummary.interest_due - interest,
+        LoanSummary.outstanding_balance: LoanSummary.outstanding_balance - balance,
+        LoanSummary.total_paid: LoanSummary.total_paid + amount,
+        LoanSummary.next_due_date: next_due,
+    }, synchronize_session=False)
+
+
+def compute_summaries(db: Session):
+    """Recompute every summary row from LoanAccount, EMISchedule and Payment."""
+    summaries = {
+        account_id: {
+            "outstanding_principal": 0.0,
+            "interest_due": 0.0,
+            "outstanding_balance": 0.0,
+            "total_paid": 0.0,
+            "next_due_date": None,
+            "status": status,
+        }
+        for account_id, status in db.query(LoanAccount.id, LoanAccount.status)
+    }
+
+    schedule = db.query(
+        EMISchedule.loan_account_id,
+        func.coalesce(func.sum(EMISchedule.principal), 0),
+        func.coalesce(func.sum(EMISchedule.interest), 0),
+        func.coalesce(func.sum(EMISchedule.balance), 0),
+        func.min(case((EMISchedule.balance > 0, EMISchedule.due_date))),
+    ).group_by(EMISchedule.loan_account_id)
+
+    for account_id, principal, interest, balance, next_due in schedule:
+        if account_id in summaries:
+            summaries[account_id].update(
+                outstanding_principal=float(principal),
+                interest_due=float(interest),
+                outstanding_balance=float(balance),
+                next_due_date=next_due,
+            )
+
+    paid = db.query(
+        Payment.loan_account_id,
+        func.sum(Payment.amount)
+    ).filter(
+        Payment.status == "SUCCESS"
+    ).group_by(Payment.loan_account_id)
+
+    for account_id, total in paid:
+        if account_id in summaries:
+            summaries[account_id]["total_paid"] = float(total or 0)
+
+    return summaries
+
+
+def _differs(a, b):
+    if isinstance(a, float) or isinstance(b, float):
+        return abs((a or 0) - (b or 0)) >= 0.005
+    return a != b
+
+
+def rebuild_summaries(db: Session, fix=True):
+    """
+    Compare stored summaries against the source tables and report the
+    drift; with ``fix`` the stored rows are rewritten and committed.
+    """
+    expected = compute_summaries(db)
+    stored = {
+        row.loan_account_id: {f: getattr(row, f) for f in FIELDS}
+        for row in db.query(LoanSummary)
+    }
+
+    missing = [i for i in expected if i not in stored]
+    orphaned = [i for i in stored if i not in expected]
+    drifted = {}
+
+    for account_id, want in expected.items():
+        have = stored.get(account_id)
+        if have is None:
+            continue
+        diff = {
+            f: {"stored": have[f], "expected": want[f]}
+            for f in FIELDS if _differs(have[f], want[f])
+        }
+        if diff:
+            drifted[account_id] = diff
+
+    if fix:
+        if missing:
+            db.execute(insert(LoanSummary), [
+                {"loan_account_id": i, **expected[i]} for i in missing
+            ])
+        if drifted:
+            db.execute(update(LoanSummary), [
+                {"loan_account_id": i, **expected[i]} for i in drifted
+            ])
+        if orphaned:
+            db.query(LoanSummary).filter(
+                LoanSummary.loan_account_id.in_(orphaned)
+            ).delete(synchronize_session=False)
+        db.commit()
+
+    return {
+        "accounts": len(expected),
+        "missing": missing,
+        "orphaned": orphaned,
+        "drifted": drifted,
+    }
@@ -0,0 +1,28 @@
+from contextlib import contextmanager
+
+from sqlalchemy.orm import Session
+
+from app.models.disbursement import LoanAccount
+
+
+@contextmanager
+def locked_loan_account(db: Session, loan_account_id: int):
+    """
+    Yield the LoanAccount with exclusive write access for the rest of the
+    transaction: SELECT ... FOR UPDATE on MySQL. SQLite has no row locks,
+    so there the transaction is opened with BEGIN IMMEDIATE, which takes
+    the database write lock up front. Other writers in any process wait
+    for it (up to busy_timeout). Commit inside the ``with`` block.
+    """
+    query = db.query(LoanAccount).filter(LoanAccount.id == loan_account_id)
+
+    if db.get_bind().dialect.name == "sqlite":
+        # pysqlite opens transactions lazily, before the first write; an
+        # explicit BEGIN takes its place and commit/rollback end it as usual
+        dbapi_connection = db.connection().connection.driver_connection
+        if dbapi_connection.in_transaction:
+            raise RuntimeError("locked_loan_account must start the transaction")
+        dbapi_connection.execute("BEGIN IMMEDIATE")
+        yield query.first()
+    else:
+        yield query.with_for_update().first()
@@ -0,0 +1,41 @@
+import re
+
+_NON_DIGITS = re.compile(r"\D")
+_NON_ALNUM = re.compile(r"[^0-9A-Za-z]")
+_SEPARATORS = re.compile(r"[^0-9A-Z]+")
+
+# screens and imports that spell the same employment type differently
+EMPLOYMENT_ALIASES = {"BUSINESS_OWNER": "BUSINESS"}
+
+PAN_PATTERN = re.compile(r"^[A-Z]{5}[0-9]{4}[A-Z]$")
+
+
+def normalize_mobile(value):
+    """Last 10 digits, so +91 98765 43210, 098765-43210 and 9876543210 agree."""
+    if not value:
+        return None
+    digits = _NON_DIGITS.sub("", value)
+    return digits[-10:] or None
+
+
+def normalize_pan(value):
+    """Upper-case PAN without spaces or separators."""
+    if not value:
+        return None
+    return _NON_ALNUM.sub("", value).upper() or None
+
+
+def normalize_employment_type(value):
+    """SALARIED / SELF_EMPLOYED / BUSINESS form: Self-Employed, self employed
+    and SELF_EMPLOYED agree, Business Owner is BUSINESS."""
+    if not value:
+        return None
+    canonical = _SEPARATORS.sub("_", value.upper()).strip("_")
+    return EMPLOYMENT_ALIASES.get(canonical, canonical) or None
+
+
+def normalize_aadhaar(value):
+    """Digits only: 1234 5678 9012 and 1234-5678-9012 agree."""
+    if not value:
+        return None
+    return _NON_DIGITS.sub("", value) or None
@@ -0,0 +1,150 @@
+import re
+
+from sqlalchemy import Column, Integer, MetaData, Table, func, literal, literal_column, or_, select
+from sqlalchemy.dialects.mysql import match as mysql_match
+
+from app.models.application import LoanApplication
+from app.models.customer import Customer
+from app.models.kyc import KYCRecord
+from app.utils.normalize import PAN_PATTERN, normalize_mobile, normalize_pan
+
+# ------------------------------
+# CUSTOMER SEARCH
+# ------------------------------
+# One query string, classified by shape, each kind answered from its
+# own index:
+#   PAN                  exact  kyc_records.pan_normalized
+#   mobile (>= 4 digits) exact / prefix  customers.mobile_normalized
+#   application number   exact / prefix  loan_applications.application_number
+#   name words           FTS5 (SQLite) / FULLTEXT (MySQL), prefix per word
+# Exact-key hits rank first, then name hits by relevance.
+
+WORDS = re.compile(r"\w+", re.UNICODE)
+
+# a short prefix ("ra") can match a large share of the book; rank only
+# the first this many name matches instead of scoring all of them
+NAME_CANDIDATES = 500
+
+# FTS5 table created with the customers table (see models.customer);
+# separate metadata so create_all never tries to build it
+_fts = Table(
+    "customer_name_fts", MetaData(),
+    Column("rowid", Integer),
+    Column("rank"),
+)
+
+
+def _prefix(column, prefix):
+    # sargable LIKE 'prefix%'
+    upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+    return (column >= prefix) & (column < upper)
+
+
+def _columns(matched_on, score):
+    return (
+        Customer.id.label("customer_id"),
+        Customer.first_name,
+        Customer.last_name,
+        Customer.mobile_number,
+        Customer.status,
+        literal(matched_on).label("matched_on"),
+        score.label("score"),
+    )
+
+
+def search_queries(q: str, dialect: str, limit: int):
+    """SELECTs for every kind of key ``q`` could be, best kind first."""
+    q = q.strip()
+    queries = []
+
+    pan = normalize_pan(q)
+    if pan and PAN_PATTERN.match(pan):
+        queries.append(
+            select(*_columns("pan", literal(0.0)))
+            .join(KYCRecord, KYCRecord.customer_id == Customer.id)
+            .where(KYCRecord.pan_normalized == pan)
+            .limit(limit)
+        )
+
+    digits = re.sub(r"[\s()+\-.]", "", q)
+    if digits.isdigit() and len(digits) >= 4:
+        mobile = normalize_mobile(digits)
+        condition = (
+            Customer.mobile_normalized == mobile if len(digits) >= 10
+            else _prefix(Customer.mobile_normalized, digits)
+        )
+        queries.append(
+            select(*_columns("mobile", literal(0.0)))
+            .where(condition)
+            .order_by(Customer.mobile_normalized, Customer.id)
+            .limit(limit)
+        )
+
+    if " " not in q and any(c.isdigit() for c in q):
+        queries.append(
+            select(*_columns("application_number", literal(0.0)))
+            .join(LoanApplication, LoanApplication.customer_id == Customer.id)
+            .where(_prefix(LoanApplication.application_number, q))
+            .order_by(LoanApplication.application_number)
+            .limit(limit)
+        )
+
+    words = [w for w in WORDS.findall(q) if not w.isdigit()]
+    if words:
+        queries.append(_name_query(words, dialect, limit))
+
+    return queries
+
+
+def _name_query(words, dialect, limit):
+    if dialect == "sqlite":
+        match = " ".join('"' + w.replace('"', '""') + '"*' for w in words)
+        candidates = (
+            select(_fts.c.rowid, _fts.c.rank)
+            .where(literal_column("customer_name_fts").op("MATCH")(match))
+            .limit(NAME_CANDIDATES)
+            .subquery()
+        )
+        return (
+            select(*_columns("name", candidates.c.rank))
+            .join(candidates, Customer.id == candidates.c.rowid)
+            .order_by(candidates.c.rank)
+            .limit(limit)
+        )
+
+    if dialect == "mysql":
+        against = " ".join(f"+{w}*" for w in words)
+        relevance = mysql_match(Customer.first_name, Customer.last_name, against=against).in_boolean_mode()
+        return (
+            select(*_columns("name", -relevance))
+            .where(relevance > 0)
+            .order_by(relevance.desc())
+            .limit(limit)
+        )
+
+    # no full-text index: prefix match on either name column
+    return (
+        select(*_columns("name", literal(0.0)))
+        .where(*[
+            or_(func.lower(Customer.first_name).startswith(w.lower()),
+                func.lower(Customer.last_name).startswith(w.lower()))
+            for w in words
+        ])
+        .order_by(Customer.id)
+        .limit(limit)
+    )
+
+
+def merge_results(results, limit):
+    """Concatenate per-kind rows in order, one row per customer."""
+    seen = set()
+    merged = []
+    for rows in results:
+        for row in rows:
+            if row.customer_id in seen:
+                continue
+            seen.add(row.customer_id)
+            merged.append(dict(row._mapping))
+            if len(merged) == limit:
+                return merged
+    return merged
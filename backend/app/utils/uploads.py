@@ -0,0 +1,145 @@
+from dataclasses import dataclass, field
+
+from fastapi import HTTPException, Request
+from python_multipart.exceptions import FormParserError
+from python_multipart.multipart import MultipartParser, parse_options_header
+from starlette.concurrency import run_in_threadpool
+
+from app.utils.blobstore import BlobWriter, ContentStore
+
+MAX_FIELD_BYTES = 4096
+
+
+# ------------------------------
+# STREAMING MULTIPART UPLOAD
+# ------------------------------
+# Starlette's form parser spools every file to a temp file before the
+# route runs and leaves hashing to a second pass. Here the request body
+# is parsed as it arrives and each file chunk goes straight into a
+# store writer (hash + size + disk write, off the event loop), so an
+# upload holds one network chunk in memory whatever its size.
+
+@dataclass
+class Upload:
+    fields: dict = field(default_factory=dict)
+    filename: str = None
+    content_type: str = None
+    blob: BlobWriter = None
+
+    async def save(self):
+        """(digest, stored) - see BlobWriter.commit."""
+        return await run_in_threadpool(self.blob.commit)
+
+    async def discard(self):
+        if self.blob is not None:
+            await run_in_threadpool(self.blob.abort)
+
+
+class _Parts:
+    def __init__(self, upload: Upload, store: ContentStore, max_bytes: int):
+        self.upload = upload
+        self.store = store
+        self.max_bytes = max_bytes
+        self.pending = []           # file bytes parsed from the current chunk
+        self.received = 0
+        self.headers = {}
+        self.header_name = b""
+        self.header_value = b""
+        self.name = None
+        self.data = bytearray()
+        self.in_file = False
+
+    def callbacks(self):
+        return {
+            "on_part_begin": self.on_part_begin,
+            "on_part_data": self.on_part_data,
+            "on_part_end": self.on_part_end,
+            "on_header_field": self.on_header_field,
+            "on_header_value": self.on_header_value,
+            "on_header_end": self.on_header_end,
+            "on_headers_finished": self.on_headers_finished,
+        }
+
+    def on_part_begin(self):
+        self.headers = {}
+        self.data = bytearray()
+        self.in_file = False
+
+    def on_header_field(self, data, start, end):
+        self.header_name += data[start:end]
+
+    def on_header_value(self, data, start, end):
+        self.header_value += data[start:end]
+
+    def on_header_end(self):
+        self.headers[self.header_name.lower()] = self.header_value
+        self.header_name = self.header_value = b""
+
+    def on_headers_finished(self):
+        _, options = parse_options_header(self.headers.get(b"content-disposition", b""))
+        if b"name" not in options:
+            raise HTTPException(400, "Multipart part without a name")
+        self.name = options[b"name"].decode("utf-8", "replace")
+
+        if b"filename" in options:
+            if self.upload.blob is not None:
+                raise HTTPException(400, "Only one file per upload")
+            self.in_file = True
+            self.upload.filename = options[b"filename"].decode("utf-8", "replace")
+            self.upload.content_type = self.headers.get(b"content-type", b"application/octet-stream").decode("latin-1")
+            # blocking, but only a mkstemp
+            self.upload.blob = self.store.writer()
+
+    def on_part_data(self, data, start, end):
+        if self.in_file:
+            self.received += end - start
+            if self.received > self.max_bytes:
+                raise HTTPException(413, f"File larger than {self.max_bytes} bytes")
+            self.pending.append(data[start:end])
+        else:
+            self.data += data[start:end]
+            if len(self.data) > MAX_FIELD_BYTES:
+                raise HTTPException(400, f"Field {self.name} too long")
+
+    def on_part_end(self):
+        if not self.in_file:
+            self.upload.fields[self.name] = self.data.decode("utf-8", "replace")
+
+
+async def receive_upload(request: Request, store: ContentStore, max_bytes: int) -> Upload:
+    """
+    Parse a multipart/form-data body with at most one file part,
+    streaming the file into ``store``. The blob stays in the store's
+    temp area until ``Upload.save()``; call ``discard()`` instead if the
+    request is rejected after parsing.
+    """
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    if content_type != b"multipart/form-data" or b"boundary" not in params:
+        raise HTTPException(400, "Expected multipart/form-data")
+
+    length = request.headers.get("content-length")
+    if length and length.isdigit() and int(length) > max_bytes + 64 * 1024:
+        raise HTTPException(413, f"File larger than {max_bytes} bytes")
+
+    upload = Upload()
+    parts = _Parts(upload, store, max_bytes)
+    parser = MultipartParser(params[b"boundary"], parts.callbacks())
+
+    try:
+        async for chunk in request.stream():
+            parser.write(chunk)
+            if parts.pending:
+                data = b"".join(parts.pending)
+                parts.pending.clear()
+                await run_in_threadpool(upload.blob.write, data)
+        parser.finalize()
+    except FormParserError:
+        await upload.discard()
+        raise HTTPException(400, "Malformed multipart body")
+    except BaseException:
+        await upload.discard()
+        raise
+
+    if upload.blob is None:
+        raise HTTPException(400, "No file in upload")
+    return upload
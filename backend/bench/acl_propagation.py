@@ -0,0 +1,103 @@
+"""
+Permission changes reach every worker process within the refresh bound.
+
+    ACL_REFRESH_SECONDS=1 python -m bench.acl_propagation --workers 4
+
+Starts ``--workers`` processes that spin on require_permission-style
+checks against the in-memory ACL, grants a new permission from this
+process, and measures how long each worker takes to see it, then the
+same for the revoke. Fails if any worker lags past
+ACL_REFRESH_SECONDS (plus a small scheduling margin).
+"""
+import argparse
+import multiprocessing as mp
+import time
+import uuid
+
+import bench.tempdb  # noqa: F401  (before app imports: scratch database)
+
+MARGIN = 0.5   # seconds
+
+
+def worker(role_id, permission, ready, results):
+    from app.core.acl import current_acl
+
+    def granted():
+        return permission in current_acl().permissions.get(role_id, ())
+
+    for expected in (True, False):
+        current_acl()
+        ready.put(True)
+        checks = 0
+        while granted() != expected:
+            checks += 1
+        results.put((expected, time.time(), checks))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    from app.core.config import ACL_REFRESH_SECONDS
+    from app.core.database import SessionLocal
+    from app.main import app  # noqa: F401  (creates tables)
+    from app.models.permission import Permission, RolePermission
+    from app.models.user import Role
+
+    tag = uuid.uuid4().hex[:8]
+    db = SessionLocal()
+    role = Role(name=f"bench-{tag}")
+    permission = Permission(name=f"bench.{tag}")
+    db.add_all([role, permission])
+    db.commit()
+
+    ctx = mp.get_context("spawn")
+    ready, results = ctx.Queue(), ctx.Queue()
+    procs = [
+        ctx.Process(target=worker, args=(role.id, permission.name, ready, results))
+        for _ in range(args.workers)
+    ]
+    for p in procs:
+        p.start()
+
+    lags = {True: [], False: []}
+    checks = 0
+    try:
+        for expected in (True, False):
+            for _ in procs:
+                ready.get(timeout=60)
+
+            if expected:
+                db.add(RolePermission(role_id=role.id, permission_id=permission.id))
+            else:
+                db.delete(db.get(RolePermission, (role.id, permission.id)))
+            db.commit()
+            changed_at = time.time()
+
+            for _ in procs:
+                seen, at, spins = results.get(timeout=ACL_REFRESH_SECONDS * 4 + 30)
+                lags[seen].append(at - changed_at)
+                checks += spins
+    finally:
+        for p in procs:
+            p.join(timeout=10)
+        db.rollback()
+        for grant in db.query(RolePermission).filter_by(role_id=role.id):
+            db.delete(grant)
+        db.delete(db.get(Permission, permission.id))
+        db.delete(db.get(Role, role.id))
+        db.commit()
+        db.close()
+
+    bound = ACL_REFRESH_SECONDS + MARGIN
+    for expected, name in ((True, "grant"), (False, "revoke")):
+        print(f"{name}:  max lag {max(lags[expected]):.3f}s over {args.workers} workers (bound {bound:.1f}s)")
+    print(f"{checks:,} permission checks while waiting")
+
+    ok = all(lag <= bound for values in lags.values() for lag in values)
+    raise SystemExit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Sync (thread pool) vs async (AsyncSession) read path under load.
+
+    python -m bench.async_concurrency --inflight 500 --requests 5000
+
+Mounts the same timeline and dashboard queries twice on an in-process
+app, once as a sync ``def`` route on SessionLocal and once as the real
+async routes, then keeps ``--inflight`` requests outstanding against
+each.
+
+Local SQLite answers in microseconds, which hides what the async path
+buys. ``--db-latency-ms`` (SQLite only) adds that much wait to every
+statement on both paths: a blocking sleep on the sync worker thread, an
+awaited sleep on the async one, like a network round trip would be.
+Point the DB_* environment at MySQL to measure the real thing.
+"""
+import argparse
+import asyncio
+import time
+
+import aiosqlite
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+
+import bench.tempdb  # noqa: F401  (before app imports: scratch database)
+from app.core.database import engine, get_db
+from app.main import app as main_app  # noqa: F401  (creates tables)
+from app.models.loan_summary import LoanSummary
+from app.routes import servicing
+from app.routes.servicing import _timeline_query
+from bench.concurrent_payments import open_accounts, cleanup
+
+app = FastAPI()
+app.include_router(servicing.router)
+
+
+@app.get("/sync/timeline/{loan_account_id}")
+def sync_timeline(loan_account_id: int, db: Session = Depends(get_db)):
+    return [list(r) for r in db.execute(_timeline_query([loan_account_id]))]
+
+
+@app.get("/sync/dashboard")
+def sync_dashboard(db: Session = Depends(get_db)):
+    return list(db.execute(select(func.sum(LoanSummary.outstanding_balance))).one())
+
+
+def add_latency(seconds):
+    @event.listens_for(engine, "before_cursor_execute")
+    def sync_wait(*args):
+        time.sleep(seconds)
+
+    execute = aiosqlite.Cursor.execute
+
+    async def async_wait(self, *args, **kwargs):
+        await asyncio.sleep(seconds)
+        return await execute(self, *args, **kwargs)
+
+    aiosqlite.Cursor.execute = async_wait
+
+
+async def drive(client, urls, inflight, total):
+    latencies = []
+    queue = iter(range(total))
+
+    async def worker():
+        for i in queue:
+            t0 = time.perf_counter()
+            r = await client.get(urls[i % len(urls)])
+            r.raise_for_status()
+            latencies.append(time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(inflight)))
+    elapsed = time.perf_counter() - t0
+
+    latencies.sort()
+    return {
+        "rps": total / elapsed,
+        "p50": latencies[len(latencies) // 2] * 1000,
+        "p99": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+async def run(args, ids):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for name, prefix in (("sync", "/sync"), ("async", "/servicing")):
+            urls = [f"{prefix}/timeline/{i}" for i in ids] + [f"{prefix}/dashboard"]
+            await drive(client, urls, 20, 200)   # warm-up
+            stats = await drive(client, urls, args.inflight, args.requests)
+            print(f"{name:>6}: {stats['rps']:8.0f} req/s  p50 {stats['p50']:7.1f} ms  p99 {stats['p99']:7.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--inflight", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--accounts", type=int, default=20)
+    parser.add_argument("--db-latency-ms", type=float, default=0)
+    args = parser.parse_args()
+
+    ids, _ = open_accounts(args.accounts, tenure=24)
+
+    if args.db_latency_ms and engine.dialect.name == "sqlite":
+        add_latency(args.db_latency_ms / 1000)
+    try:
+        asyncio.run(run(args, ids))
+    finally:
+        cleanup(ids)
+
+
+if __name__ == "__main__":
+    main()
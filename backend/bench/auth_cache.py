@@ -0,0 +1,99 @@
+"""
+Statements per authenticated request, cold vs warm auth cache.
+
+    python -m bench.auth_cache --requests 2000
+
+Creates a throwaway user, then calls a route guarded by
+get_current_user. The first request decodes the token and loads the
+user; every later one should be served from the cache with no user
+query (the periodic acl_version stamp check aside). Deactivating the
+user must take effect on the next request; a change made by another
+worker (simulated with plain SQL plus bump_acl_version, so no ORM event
+fires here) within ACL_REFRESH_SECONDS.
+"""
+import argparse
+import time
+import uuid
+
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event, update
+
+import bench.tempdb  # noqa: F401  (before app imports: scratch database)
+from app.core.acl import bump_acl_version
+from app.core.config import ACL_REFRESH_SECONDS
+from app.core.database import SessionLocal, engine
+from app.core.deps import auth_cache_stats, get_current_user
+from app.core.security import create_access_token
+from app.main import app as main_app  # noqa: F401  (creates tables)
+from app.models.user import User
+
+app = FastAPI()
+
+
+@app.get("/me")
+def me(user=Depends(get_current_user)):
+    return {"id": user.id}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    user = User(full_name="Bench User", email=f"bench-{uuid.uuid4().hex}@example.com", password_hash="x")
+    db.add(user)
+    db.commit()
+
+    statements = []
+    # the acl_version stamp check is allowed every ACL_REFRESH_SECONDS
+    event.listen(engine, "before_cursor_execute",
+                 lambda *a: "acl_version" not in a[2] and statements.append(a[2]))
+
+    client = TestClient(app)
+    token = create_access_token({"sub": str(user.id)})
+
+    try:
+        client.get("/me", params={"token": token}).raise_for_status()
+        cold = len(statements)
+        statements.clear()
+
+        start = time.perf_counter()
+        for _ in range(args.requests):
+            client.get("/me", params={"token": token}).raise_for_status()
+        elapsed = time.perf_counter() - start
+
+        print(f"cold request:  {cold} statements")
+        print(f"warm requests: {len(statements) / args.requests:.2f} statements each, "
+              f"{args.requests / elapsed:,.0f} req/s")
+        print(auth_cache_stats())
+
+        warm_ok = len(statements) == 0
+
+        user.is_active = False
+        db.commit()
+        status = client.get("/me", params={"token": token}).status_code
+        print(f"after deactivation: HTTP {status}")
+
+        # another worker reactivates the user: this process sees no event
+        user.is_active = True
+        db.commit()
+        client.get("/me", params={"token": token}).raise_for_status()
+        with engine.begin() as conn:
+            conn.execute(update(User).where(User.id == user.id).values(is_active=False))
+            bump_acl_version(conn)
+        time.sleep(ACL_REFRESH_SECONDS)
+        remote = client.get("/me", params={"token": token}).status_code
+        print(f"after deactivation by another worker: HTTP {remote} (within {ACL_REFRESH_SECONDS}s)")
+        ok = warm_ok and status == 401 and remote == 401
+    finally:
+        db.delete(user)
+        db.commit()
+        db.close()
+
+    raise SystemExit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
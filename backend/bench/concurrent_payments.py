@@ -0,0 +1,151 @@
+"""
+Concurrent payment posting: no installment may be allocated twice.
+
+    python -m bench.concurrent_payments --accounts 3 --payments 200
+    python -m bench.concurrent_payments --processes 4
+
+Opens throwaway loan accounts (360 months) in a scratch database
+(bench.tempdb), fires ``--payments`` parallel one-EMI payments at each
+account through ``post_payment`` and checks that exactly that many
+installments ended up fully paid and every payment was recorded.
+``--processes`` posts from that many separate processes instead of
+threads, the way several uvicorn workers or a job process would.
+The accounts are deleted afterwards unless ``--keep`` is given.
+"""
+import argparse
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+
+import bench.tempdb  # noqa: F401  (before app imports: scratch database)
+from app.core.database import SessionLocal
+from app.main import app  # noqa: F401  (creates tables)
+from app.models.application import LoanApplication
+from app.models.approval import LoanApproval
+from app.models.customer import Customer
+from app.models.disbursement import LoanAccount, Disbursement, EMISchedule
+from app.models.loan_summary import LoanSummary
+from app.models.payment import Payment
+from app.routes.disbursement import _open_accounts
+from app.routes.servicing import post_payment
+from app.utils.emi import emi_amount
+
+
+def open_accounts(count, principal=1_000_000, rate=10.5, tenure=360):
+    db = SessionLocal()
+    emi = float(emi_amount(principal, rate, tenure))
+    stamp = int(time.time() * 1000)
+
+    pairs = []
+    for i in range(count):
+        customer = Customer(first_name="Bench", last_name=str(i))
+        db.add(customer)
+        db.flush()
+
+        application = LoanApplication(
+            customer_id=customer.id,
+            application_number=f"BENCH-{stamp}-{i}",
+            requested_amount=principal,
+            tenure_months=tenure
+        )
+        db.add(application)
+        db.flush()
+
+        approval = LoanApproval(
+            application_id=application.id,
+            interest_rate=rate,
+            tenure_months=tenure,
+            emi_amount=emi
+        )
+        db.add(approval)
+        pairs.append((application, approval))
+
+    accounts, _ = _open_accounts(db, pairs)
+    ids = [a.id for a in accounts]
+    db.commit()
+    db.close()
+    return ids, emi
+
+
+def pay(loan_account_id, amount):
+    db = SessionLocal()
+    try:
+        return post_payment(loan_account_id, amount, "Auto-Debit", db=db)
+    finally:
+        db.close()
+
+
+def cleanup(ids):
+    db = SessionLocal()
+    application_ids = [
+        a for (a,) in db.query(LoanAccount.application_id).filter(LoanAccount.id.in_(ids))
+    ]
+    customer_ids = [
+        c for (c,) in db.query(LoanApplication.customer_id).filter(LoanApplication.id.in_(application_ids))
+    ]
+    for model, column, keys in (
+        (Payment, Payment.loan_account_id, ids),
+        (LoanSummary, LoanSummary.loan_account_id, ids),
+        (EMISchedule, EMISchedule.loan_account_id, ids),
+        (Disbursement, Disbursement.loan_account_id, ids),
+        (LoanAccount, LoanAccount.id, ids),
+        (LoanApproval, LoanApproval.application_id, application_ids),
+        (LoanApplication, LoanApplication.id, application_ids),
+        (Customer, Customer.id, customer_ids),
+    ):
+        db.query(model).filter(column.in_(keys)).delete(synchronize_session=False)
+    db.commit()
+    db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--accounts", type=int, default=3)
+    parser.add_argument("--payments", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=64)
+    parser.add_argument("--processes", type=int, default=0, help="post from processes instead of threads")
+    parser.add_argument("--keep", action="store_true")
+    args = parser.parse_args()
+
+    ids, emi = open_accounts(args.accounts)
+    # a hair over one EMI, so each payment clears exactly one installment
+    amount = emi + 0.004
+
+    jobs = [i for i in ids for _ in range(args.payments)]
+    t0 = time.perf_counter()
+    if args.processes:
+        # spawn: children must not inherit this process's pooled connections
+        pool = ProcessPoolExecutor(args.processes, mp_context=multiprocessing.get_context("spawn"))
+    else:
+        pool = ThreadPoolExecutor(max_workers=args.workers)
+    with pool:
+        results = list(pool.map(partial(pay, amount=amount), jobs, chunksize=8 if args.processes else 1))
+    elapsed = time.perf_counter() - t0
+
+    errors = [r for r in results if "error" in r]
+
+    db = SessionLocal()
+    failed = False
+    for i in ids:
+        paid = db.query(EMISchedule).filter(
+            EMISchedule.loan_account_id == i,
+            EMISchedule.principal == 0,
+            EMISchedule.interest == 0
+        ).count()
+        recorded = db.query(Payment).filter(Payment.loan_account_id == i).count()
+        ok = paid == args.payments and recorded == args.payments
+        failed |= not ok
+        print(f"account {i}: {recorded} payments, {paid} installments paid {'OK' if ok else 'LOST UPDATES'}")
+    db.close()
+
+    print(f"{len(jobs)} payments in {elapsed:.2f}s ({len(jobs) / elapsed:.0f}/s), {len(errors)} errors")
+
+    if not args.keep:
+        cleanup(ids)
+
+    raise SystemExit(1 if failed or errors else 0)
+
+
+if __name__ == "__main__":
+    main()
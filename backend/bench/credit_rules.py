@@ -0,0 +1,142 @@
+"""
+Credit rules engine: vectorized batch grading vs row-by-row rules.
+
+    python -m bench.credit_rules --applications 100000
+
+Generates ``--applications`` random applications (some without a bureau
+score or employment type) and grades them three ways: the compiled
+policy in one vectorized pass, a plain per-application Python reading of
+the same policy, and the POST /credit/grade endpoint. All three must
+agree on every risk level and reason.
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.credit_policy import CREDIT_POLICY
+from app.routes import credit
+from app.utils.credit_rules import CompiledPolicy
+from app.utils.normalize import normalize_employment_type
+
+# as the onboarding and document screens store them
+EMPLOYMENT = ["Salaried", "Self-Employed", "Business Owner", "Business", None]
+
+PY_OPERATORS = {
+    "<": lambda a, b: a is not None and a < b,
+    "<=": lambda a, b: a is not None and a <= b,
+    ">": lambda a, b: a is not None and a > b,
+    ">=": lambda a, b: a is not None and a >= b,
+    "==": lambda a, b: a == b,
+    "!=": lambda a, b: a != b,
+    "in": lambda a, b: a in b,
+    "not_in": lambda a, b: a not in b,
+    "missing": lambda a, _: a is None or a == "",
+}
+
+
+def generate(n):
+    rng = random.Random(25)
+    apps = []
+    for i in range(n):
+        income = round(rng.uniform(8_000, 250_000), 2)
+        apps.append({
+            "application_id": i + 1,
+            "cibil_score": None if rng.random() < 0.05 else rng.randint(300, 900),
+            "monthly_income": income,
+            "existing_obligations": round(income * rng.uniform(0, 0.9), 2),
+            "employment_type": rng.choice(EMPLOYMENT),
+        })
+    return apps
+
+
+def columns(apps):
+    return (
+        [a["cibil_score"] if a["cibil_score"] is not None else float("nan") for a in apps],
+        [a["monthly_income"] for a in apps],
+        [a["existing_obligations"] for a in apps],
+        [a["employment_type"] for a in apps],
+    )
+
+
+def grade_row(policy, app):
+    """The policy read the obvious way, one application at a time."""
+    fields = dict(app)
+    fields["employment_type"] = normalize_employment_type(app["employment_type"]) or ""
+    income = app["monthly_income"]
+    fields["foir"] = app["existing_obligations"] / income * 100 if income > 0 else float("inf")
+
+    grades = policy["grades"]
+    worst = 0
+    reasons = []
+    for rule in policy["rules"]:
+        if all(PY_OPERATORS[op](fields[field], value) for field, op, value in rule["when"]):
+            rank = grades.index(rule["grade"])
+            if rank > worst:
+                worst, reasons = rank, [rule["name"]]
+            elif rank == worst and rank > 0:
+                reasons.append(rule["name"])
+    return grades[worst], reasons
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--applications", type=int, default=100_000)
+    parser.add_argument("--skip-endpoint", action="store_true")
+    args = parser.parse_args()
+
+    apps = generate(args.applications)
+    cols = columns(apps)
+
+    started = time.perf_counter()
+    policy = CompiledPolicy(CREDIT_POLICY)
+    compile_time = time.perf_counter() - started
+
+    policy.evaluate(*columns(apps[:100]))     # warm up numpy
+    started = time.perf_counter()
+    grading = policy.evaluate(*cols)
+    vector_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    reference = [grade_row(CREDIT_POLICY, a) for a in apps]
+    row_time = time.perf_counter() - started
+
+    mismatched = [
+        i for i, (level, reasons) in enumerate(reference)
+        if grading.risk_level[i] != level or list(grading.reasons[i]) != reasons
+    ]
+
+    n = args.applications
+    levels, counts = np.unique(grading.risk_level.astype(str), return_counts=True)
+    print(f"{n} applications: " + ", ".join(f"{l} {c}" for l, c in zip(levels, counts)))
+    print(f"compile:    {compile_time * 1000:.2f} ms ({len(policy.rules)} rules)")
+    print(f"vectorized: {vector_time * 1000:.1f} ms ({n / vector_time:,.0f} applications/s)")
+    print(f"per row:    {row_time * 1000:.1f} ms ({n / row_time:,.0f} applications/s)")
+    print(f"speedup: {row_time / vector_time:.1f}x, mismatches: {len(mismatched)}")
+
+    if not args.skip_endpoint:
+        # /grade is stateless: the router alone, no database needed
+        app = FastAPI()
+        app.include_router(credit.router)
+        client = TestClient(app)
+        started = time.perf_counter()
+        res = client.post("/credit/grade", json={"applications": apps})
+        endpoint_time = time.perf_counter() - started
+        res.raise_for_status()
+        served = res.json()["grades"]
+        endpoint_mismatched = sum(
+            g["risk_level"] != level or g["reasons"] != reasons
+            for g, (level, reasons) in zip(served, reference)
+        )
+        print(f"POST /credit/grade: {endpoint_time:.2f}s end to end "
+              f"({n / endpoint_time:,.0f} applications/s), mismatches: {endpoint_mismatched}")
+        mismatched += [None] * endpoint_mismatched
+
+    raise SystemExit(1 if mismatched else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Customer search latency on a large synthetic book.
+
+    python -m bench.customer_search --customers 1000000
+
+Builds a throwaway SQLite database (not the configured one) with
+``--customers`` customers, a KYC record with PAN for every other one and
+an application each, then times the /onboarding/search queries for each
+kind of key: exact mobile, mobile prefix, PAN, application number and
+name words. For comparison the same lookups are timed as the
+``LIKE '%q%'`` scans a search box would otherwise run.
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from sqlalchemy import create_engine, insert, or_, select
+from sqlalchemy.orm import Session
+
+from app.core.database import Base
+from app.models.application import LoanApplication
+from app.models.customer import Customer
+from app.models.kyc import KYCRecord
+from app.utils.normalize import normalize_mobile, normalize_pan
+from app.utils.search import search_queries, merge_results
+
+FIRST = ["Ramesh", "Suresh", "Priya", "Anita", "Karthik", "Lakshmi", "Vijay", "Deepa",
+         "Arun", "Meena", "Rahul", "Divya", "Sanjay", "Kavya", "Manoj", "Revathi"]
+LAST = ["Kumar", "Sharma", "Iyer", "Reddy", "Nair", "Patel", "Singh", "Rao",
+        "Menon", "Das", "Gupta", "Pillai", "Joshi", "Naidu", "Bose", "Verma"]
+
+BATCH = 20_000
+
+
+def _pan(i):
+    letters = "".join(chr(65 + (i // 26 ** k) % 26) for k in range(5))
+    return f"{letters}{i % 10_000:04d}{chr(65 + i % 26)}"
+
+
+def seed(engine, customers):
+    rng = random.Random(7)
+    Base.metadata.create_all(engine, tables=[Customer.__table__, KYCRecord.__table__, LoanApplication.__table__])
+
+    with engine.begin() as conn:
+        for start in range(1, customers + 1, BATCH):
+            ids = range(start, min(start + BATCH, customers + 1))
+            conn.execute(insert(Customer), [{
+                "id": i,
+                "first_name": rng.choice(FIRST) + ("" if i % 7 else f"{i % 97}"),
+                "last_name": rng.choice(LAST),
+                "mobile_number": f"+91 9{i:09d}",
+                "mobile_normalized": normalize_mobile(f"9{i:09d}"),
+                "status": "ONBOARDED",
+            } for i in ids])
+            conn.execute(insert(KYCRecord), [{
+                "customer_id": i, "pan_number": _pan(i), "pan_normalized": normalize_pan(_pan(i)),
+            } for i in ids if i % 2 == 0])
+            conn.execute(insert(LoanApplication), [{
+                "customer_id": i, "application_number": f"APP{i:08d}", "status": "SUBMITTED",
+            } for i in ids])
+
+
+def _like_scan(q):
+    # what a search box does without search keys: contains-match everywhere
+    pattern = f"%{q}%"
+    return (
+        select(Customer.id)
+        .outerjoin(KYCRecord, KYCRecord.customer_id == Customer.id)
+        .outerjoin(LoanApplication, LoanApplication.customer_id == Customer.id)
+        .where(or_(
+            Customer.mobile_number.like(pattern),
+            Customer.first_name.like(pattern),
+            Customer.last_name.like(pattern),
+            KYCRecord.pan_number.like(pattern),
+            LoanApplication.application_number.like(pattern),
+        ))
+        .limit(20)
+    )
+
+
+def timed(fn, repeat):
+    fn()   # warm the page cache
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - t0)
+    times.sort()
+    return result, times[len(times) // 2] * 1000, times[min(int(len(times) * 0.99), len(times) - 1)] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--customers", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--scan-repeat", type=int, default=3, help="repeats for the LIKE scans")
+    args = parser.parse_args()
+
+    n = args.customers
+    probes = {
+        "mobile exact": f"+91 9{n // 3:09d}",
+        "mobile prefix": f"9{n // 3:09d}"[:7],
+        "PAN": _pan(n // 2 * 2),
+        "application number": f"APP{n // 5:08d}",
+        "name": "Lakshmi Red",
+        "name prefix": "kav",
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'search.db')}")
+        t0 = time.perf_counter()
+        seed(engine, n)
+        print(f"seeded {n} customers in {time.perf_counter() - t0:.1f}s\n")
+
+        print(f"{'query':<20} {'hits':>5} {'p50 ms':>9} {'p99 ms':>9} {'LIKE p50 ms':>12}")
+        with Session(engine) as db:
+            for name, q in probes.items():
+                def search():
+                    results = [db.execute(s).all() for s in search_queries(q, "sqlite", 20)]
+                    return merge_results(results, 20)
+
+                hits, p50, p99 = timed(search, args.repeat)
+                _, scan_p50, _ = timed(lambda: db.execute(_like_scan(q)).all(), args.scan_repeat)
+                print(f"{name:<20} {len(hits):5d} {p50:9.3f} {p99:9.3f} {scan_p50:12.1f}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
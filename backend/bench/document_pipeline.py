@@ -0,0 +1,140 @@
+"""
+Document worker throughput by pool size.
+
+    python -m bench.document_pipeline --documents 40 --size-mb 5 --workers 1 2 4
+    DOC_RETRY_BASE_SECONDS=0.2 DOC_MAX_ATTEMPTS=3 python -m bench.document_pipeline --broken 2
+
+Stores ``--documents`` synthetic scans in the document store and
+queues a job for each, the same way /documents/upload does. For every
+``--workers`` value it drains the queue with app.jobs.document_worker
+and reports documents/s and mean seconds per stage. ``--broken`` adds
+documents whose blob is missing: they have to go through every retry
+and end up FAILED. Runs on a scratch database and document store
+(bench.tempdb).
+"""
+import argparse
+import json
+import os
+import time
+
+from sqlalchemy import func, select, update
+
+import bench.tempdb  # noqa: F401  (before app imports: scratch database)
+from app.core.config import DOC_MAX_ATTEMPTS
+from app.core.database import Base, SessionLocal, engine
+from app import models  # noqa: F401
+from app.jobs.document_worker import run
+from app.models.customer import Customer
+from app.models.document import Document
+from app.models.processing import DocumentJob, ProcessingProgress
+from app.utils.blobstore import document_store
+
+
+def seed(documents, size, broken):
+    db = SessionLocal()
+    customer = Customer(first_name="Bench", last_name="Documents")
+    db.add(customer)
+    db.flush()
+
+    for i in range(documents + broken):
+        writer = document_store.writer()
+        # printable text mixed with binary, like a scanned statement
+        text = f"STATEMENT {i} OPENING BALANCE 1,20,000.00 CREDIT SALARY ".encode()
+        block = text + os.urandom(4096 - len(text))
+        for _ in range(size // len(block)):
+            writer.write(block)
+        digest, _ = writer.commit()
+        if i >= documents:
+            os.remove(document_store.path(digest))   # blob lost: every attempt fails
+
+        doc = Document(
+            customer_id=customer.id, document_type="BANK_STATEMENT",
+            file_path=document_store.key(digest), content_hash=digest, size_bytes=writer.size,
+            original_filename=f"statement-{i}.pdf", verified=False, processing_status="PENDING"
+        )
+        db.add(doc)
+        db.flush()
+        db.add(DocumentJob(document_id=doc.id))
+    db.commit()
+    customer_id = customer.id
+    db.close()
+    return customer_id
+
+
+def reset(customer_id):
+    db = SessionLocal()
+    ids = select(Document.id).where(Document.customer_id == customer_id)
+    db.execute(update(DocumentJob).where(DocumentJob.document_id.in_(ids)).values(
+        status="QUEUED", attempts=0, run_after=func.now(), last_error=None, stage_timings=None
+    ))
+    db.execute(update(Document).where(Document.id.in_(ids)).values(processing_status="PENDING"))
+    db.commit()
+    db.close()
+
+
+def report(customer_id):
+    db = SessionLocal()
+    rows = db.execute(
+        select(DocumentJob.status, DocumentJob.attempts, DocumentJob.stage_timings, Document.processing_status)
+        .join(Document, Document.id == DocumentJob.document_id)
+        .where(Document.customer_id == customer_id)
+    ).all()
+    progress = db.execute(
+        select(ProcessingProgress.stage, func.count()).where(
+            ProcessingProgress.customer_id == customer_id
+        ).group_by(ProcessingProgress.stage)
+    ).all()
+    db.close()
+
+    stages = {}
+    for row in rows:
+        for stage, seconds in json.loads(row.stage_timings or "{}").items():
+            stages.setdefault(stage, []).append(seconds)
+    statuses = {}
+    for row in rows:
+        key = (row.status, row.processing_status, row.attempts)
+        statuses[key] = statuses.get(key, 0) + 1
+    return {s: sum(v) / len(v) for s, v in stages.items()}, statuses, dict(progress)
+
+
+def cleanup(customer_id):
+    db = SessionLocal()
+    ids = select(Document.id).where(Document.customer_id == customer_id)
+    db.query(DocumentJob).filter(DocumentJob.document_id.in_(ids)).delete(synchronize_session=False)
+    db.query(ProcessingProgress).filter(ProcessingProgress.customer_id == customer_id).delete(synchronize_session=False)
+    db.query(Document).filter(Document.customer_id == customer_id).delete(synchronize_session=False)
+    db.query(Customer).filter(Customer.id == customer_id).delete(synchronize_session=False)
+    db.commit()
+    db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--documents", type=int, default=40)
+    parser.add_argument("--size-mb", type=float, default=5)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--broken", type=int, default=0, help="documents whose blob is missing")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    customer_id = seed(args.documents, int(args.size_mb * 1024 * 1024), args.broken)
+    try:
+        for workers in args.workers:
+            reset(customer_id)
+            started = time.perf_counter()
+            run(workers, drain=True, poll=0.1)
+            elapsed = time.perf_counter() - started
+
+            stage_means, statuses, progress = report(customer_id)
+            print(f"\n{workers} workers: {args.documents} documents in {elapsed:.2f}s "
+                  f"({args.documents / elapsed:.1f} docs/s, {args.documents * args.size_mb / elapsed:.0f} MB/s)")
+            print("  mean stage seconds: " + ", ".join(f"{s} {v:.3f}" for s, v in stage_means.items()))
+            for (status, processing, attempts), count in sorted(statuses.items()):
+                print(f"  job {status:<7} document {processing:<10} attempts {attempts}/{DOC_MAX_ATTEMPTS}: {count}")
+            print(f"  progress rows: {progress}")
+    finally:
+        cleanup(customer_id)
+
+
+if __name__ == "__main__":
+    main()
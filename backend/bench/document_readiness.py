@@ -0,0 +1,99 @@
+"""
+Reviewer-queue readiness: one grouped query per page vs per customer.
+
+    python -m bench.document_readiness --customers 50000
+
+Builds a throwaway SQLite database with ``--customers`` customers, each
+with a random subset of REQUIRED_DOCUMENTS uploaded (some verified, some
+re-uploaded). It walks every page of the /documents/readiness query and
+compares that with the old way: load each customer's Document rows and
+check them in Python. The old way is timed on ``--legacy-sample``
+customers and extrapolated. Both must agree on which customers are
+ready.
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+from app.core.database import Base
+from app.core.document_config import REQUIRED_DOCUMENTS
+from app.models.customer import Customer
+from app.models.document import Document
+from app.routes.document import _readiness, _readiness_query
+
+BATCH = 20_000
+
+
+def seed(engine, customers):
+    rng = random.Random(11)
+    Base.metadata.create_all(engine, tables=[Customer.__table__, Document.__table__])
+
+    with engine.begin() as conn:
+        for start in range(1, customers + 1, BATCH):
+            ids = range(start, min(start + BATCH, customers + 1))
+            conn.execute(insert(Customer), [{"id": i, "first_name": "Bench", "last_name": f"R{i}"} for i in ids])
+            docs = []
+            for i in ids:
+                for doc_type in REQUIRED_DOCUMENTS:
+                    if rng.random() < 0.8:
+                        docs += [{"customer_id": i, "document_type": doc_type, "verified": rng.random() < 0.7,
+                                  "processing_status": "COMPLETED"}
+                                 for _ in range(1 + (rng.random() < 0.1))]
+            conn.execute(insert(Document), docs)
+
+
+def legacy_ready(db, customer_id):
+    docs = db.query(Document).filter(Document.customer_id == customer_id).all()
+    verified = {d.document_type for d in docs if d.verified}
+    return all(t in verified for t in REQUIRED_DOCUMENTS)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--customers", type=int, default=50_000)
+    parser.add_argument("--page", type=int, default=1000)
+    parser.add_argument("--legacy-sample", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'readiness.db')}")
+        seed(engine, args.customers)
+
+        with Session(engine) as db:
+            ready = {}
+            pages = 0
+            cursor = None
+            started = time.perf_counter()
+            while True:
+                rows = db.execute(_readiness_query(cursor=cursor).limit(args.page)).mappings().all()
+                for row in rows:
+                    ready[row["id"]] = _readiness(row).ready
+                pages += 1
+                if len(rows) < args.page:
+                    break
+                cursor = rows[-1]["id"]
+            grouped = time.perf_counter() - started
+
+            sample = random.Random(3).sample(range(1, args.customers + 1), min(args.legacy_sample, args.customers))
+            db.expunge_all()
+            started = time.perf_counter()
+            legacy = {c: legacy_ready(db, c) for c in sample}
+            legacy_time = (time.perf_counter() - started) * args.customers / len(sample)
+
+        engine.dispose()
+
+    mismatched = [c for c, r in legacy.items() if ready[c] != r]
+    print(f"{args.customers} customers, {sum(ready.values())} ready")
+    print(f"grouped query: {pages} pages in {grouped:.2f}s ({grouped / pages * 1000:.1f} ms/page of {args.page})")
+    print(f"per customer:  {legacy_time:.2f}s (extrapolated from {len(sample)})")
+    print(f"speedup: {legacy_time / grouped:.1f}x, mismatches: {len(mismatched)}")
+    raise SystemExit(1 if mismatched else 0)
+
+
+if __name__ == "__main__":
+    main()
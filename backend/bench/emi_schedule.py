@@ -0,0 +1,89 @@
+"""
+Legacy per-loan schedule loop vs the batch amortization engine.
+
+    python -m bench.emi_schedule --sizes 1000 10000 100000
+
+The legacy loop is timed on at most ``--legacy-sample`` loans and
+extrapolated linearly above that, since it takes minutes at 100k.
+"""
+import argparse
+import time
+
+import numpy as np
+from dateutil.relativedelta import relativedelta
+
+from app.utils.emi import amortize, emi_amount
+
+
+def legacy_schedule(P, annual_rate, months, emi, start_date):
+    r = annual_rate/12/100
+    balance = P
+    schedule = []
+
+    for i in range(1, months+1):
+        interest = balance * r
+        principal = emi - interest
+        balance -= principal
+        if balance < 0:
+            balance = 0
+
+        schedule.append({
+            "installment_no": i,
+            "due_date": start_date + relativedelta(months=i),
+            "emi": round(emi,2),
+            "principal": round(principal,2),
+            "interest": round(interest,2),
+            "balance": round(balance,2)
+        })
+
+    return schedule
+
+
+def portfolio(n, seed=7):
+    rng = np.random.default_rng(seed)
+    principal = rng.integers(50_000, 5_000_000, n).astype(float)
+    rate = rng.choice([8.5, 9.75, 10.5, 12.0, 14.25, 18.0], n)
+    months = rng.choice([12, 24, 36, 60, 120, 240, 360], n)
+    start = np.datetime64("2024-01-01") + rng.integers(0, 365, n).astype("timedelta64[D]")
+    return principal, rate, months, start
+
+
+def time_legacy(principal, rate, months, start, sample):
+    n = len(principal)
+    k = min(n, sample)
+    emi = emi_amount(principal[:k], rate[:k], months[:k])
+    starts = start[:k].astype(object)
+
+    t0 = time.perf_counter()
+    for i in range(k):
+        legacy_schedule(float(principal[i]), float(rate[i]), int(months[i]), float(emi[i]), starts[i])
+    elapsed = time.perf_counter() - t0
+
+    return elapsed * n / k, k < n
+
+
+def time_batch(principal, rate, months, start):
+    t0 = time.perf_counter()
+    amortize(principal, rate, months, start)
+    return time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--legacy-sample", type=int, default=10_000)
+    args = parser.parse_args()
+
+    print(f"{'loans':>8} {'legacy s':>12} {'batch s':>10} {'speedup':>9}")
+    for n in args.sizes:
+        principal, rate, months, start = portfolio(n)
+        legacy, extrapolated = time_legacy(principal, rate, months, start, args.legacy_sample)
+        batch = time_batch(principal, rate, months, start)
+        mark = "*" if extrapolated else " "
+        print(f"{n:>8} {legacy:>11.2f}{mark} {batch:>10.3f} {legacy / batch:>8.1f}x")
+
+    print("* extrapolated from --legacy-sample loans")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,307 @@
+"""
+Endpoint latency benchmark against a seeded portfolio.
+
+    python -m bench.endpoints --requests 200 --concurrency 16 --out bench-results.json
+    python -m bench.endpoints --baseline bench-results.json --tolerance 0.2
+
+Seeds throwaway loan accounts (part of each schedule backdated so the
+recovery board and overdue buckets have rows), approved applications
+for disbursement and a login user. It then drives each endpoint in turn
+with ``--concurrency`` clients. Requests go through the real app
+in-process, or to a running server with ``--url http://127.0.0.1:8000``
+(for example under uvicorn). Seeding goes to a scratch database
+(bench.tempdb); with ``--url``, set BENCH_DATABASE_URL to the server's
+database, since this script seeds it directly.
+
+For every endpoint it prints and stores p50/p95/p99 latency (ms),
+throughput and error count. With ``--baseline`` the run is compared
+against an earlier JSON result. It exits 1 if any endpoint's p95 grew,
+or its throughput dropped, by more than ``--tolerance``. Seeded rows
+are deleted afterwards.
+"""
+import argparse
+import asyncio
+import json
+import platform
+import time
+import uuid
+from datetime import date, datetime, timedelta
+
+import httpx
+from sqlalchemy import update
+
+import bench.tempdb  # noqa: F401  (before app imports: scratch database)
+from app.core.config import BCRYPT_ROUNDS, DATABASE_URL
+from app.core.database import SessionLocal
+from app.core.security import hash_password
+from app.main import app
+from app.models.application import LoanApplication
+from app.models.approval import LoanApproval
+from app.models.customer import Customer, CustomerAddress, EmploymentDetails
+from app.models.disbursement import EMISchedule, LoanAccount
+from app.models.user import User
+from app.utils.emi import emi_amount
+from bench.concurrent_payments import open_accounts, cleanup
+
+PRINCIPAL, RATE, TENURE = 500_000, 11.5, 36
+
+
+# ------------------------------
+# SEED
+# ------------------------------
+class Portfolio:
+    def __init__(self):
+        self.tag = uuid.uuid4().hex[:8]
+        self.account_ids = []
+        self.emi = 0.0
+        self.approved = []          # application ids ready for /disbursement/confirm
+        self.customers = []         # created through /onboarding/basic
+        self.user_id = None
+        self.credentials = {}
+
+
+def seed(accounts, approvals):
+    portfolio = Portfolio()
+    portfolio.account_ids, portfolio.emi = open_accounts(accounts, PRINCIPAL, RATE, TENURE)
+
+    db = SessionLocal()
+
+    # first six installments of every other account fall 1-180 days overdue
+    overdue = portfolio.account_ids[::2]
+    db.execute(update(EMISchedule), [
+        {"id": row_id, "due_date": due - timedelta(days=200)}
+        for row_id, due in db.query(EMISchedule.id, EMISchedule.due_date).filter(
+            EMISchedule.loan_account_id.in_(overdue), EMISchedule.installment_no <= 6
+        )
+    ])
+
+    emi = float(emi_amount(PRINCIPAL, RATE, TENURE))
+    for i in range(approvals):
+        customer = Customer(first_name="Bench", last_name=f"Approved {i}")
+        db.add(customer)
+        db.flush()
+        application = LoanApplication(
+            customer_id=customer.id,
+            application_number=f"BENCH-{portfolio.tag}-{i}",
+            requested_amount=PRINCIPAL,
+            tenure_months=TENURE
+        )
+        db.add(application)
+        db.flush()
+        db.add(LoanApproval(application_id=application.id, interest_rate=RATE, tenure_months=TENURE, emi_amount=emi))
+        portfolio.approved.append(application.id)
+
+    portfolio.credentials = {"email": f"bench-{portfolio.tag}@example.com", "password": "bench-password"}
+    user = User(full_name="Bench User", email=portfolio.credentials["email"],
+                password_hash=hash_password(portfolio.credentials["password"]))
+    db.add(user)
+    db.commit()
+    portfolio.user_id = user.id
+    db.close()
+    return portfolio
+
+
+def unseed(portfolio):
+    db = SessionLocal()
+    disbursed = [
+        i for (i,) in db.query(LoanAccount.id).filter(LoanAccount.application_id.in_(portfolio.approved))
+    ]
+    db.close()
+    cleanup(portfolio.account_ids + disbursed)
+
+    db = SessionLocal()
+    customer_ids = portfolio.customers + [
+        c for (c,) in db.query(LoanApplication.customer_id).filter(LoanApplication.id.in_(portfolio.approved))
+    ]
+    for model, column, keys in (
+        (LoanApproval, LoanApproval.application_id, portfolio.approved),
+        (LoanApplication, LoanApplication.customer_id, customer_ids),
+        (CustomerAddress, CustomerAddress.customer_id, customer_ids),
+        (EmploymentDetails, EmploymentDetails.customer_id, customer_ids),
+        (Customer, Customer.id, customer_ids),
+        (User, User.id, [portfolio.user_id]),
+    ):
+        db.query(model).filter(column.in_(keys)).delete(synchronize_session=False)
+    db.commit()
+    db.close()
+
+
+# ------------------------------
+# ENDPOINTS
+# ------------------------------
+# name -> function(i, portfolio) returning httpx request arguments. They
+# run in this order; onboarding steps use the customers created by
+# /onboarding/basic.
+
+def _basic(i, p):
+    return "POST", "/onboarding/basic", {"json": {
+        "first_name": "Bench", "last_name": f"Onboard {i}", "dob": "1990-01-01", "gender": "F"
+    }}
+
+
+def _contact(i, p):
+    return "POST", "/onboarding/contact", {"json": {
+        "customer_id": p.customers[i % len(p.customers)],
+        "mobile_number": f"9{i:09d}", "email": f"onboard{i}@example.com", "otp": "123456"
+    }}
+
+
+def _demographics(i, p):
+    return "POST", "/onboarding/demographics", {"json": {
+        "customer_id": p.customers[i % len(p.customers)],
+        "street_address": "1 Bench Street", "city": "Chennai", "state": "TN",
+        "pin_code": "600001", "employment_type": "SALARIED"
+    }}
+
+
+def _onboard_confirm(i, p):
+    return "POST", "/onboarding/confirm", {"json": {"customer_id": p.customers[i % len(p.customers)]}}
+
+
+ENDPOINTS = {
+    "login": lambda i, p: ("POST", "/auth/login", {"json": p.credentials}),
+    "onboarding basic": _basic,
+    "onboarding contact": _contact,
+    "onboarding demographics": _demographics,
+    "onboarding confirm": _onboard_confirm,
+    "disbursement confirm": lambda i, p: ("POST", f"/disbursement/confirm/{p.approved[i % len(p.approved)]}", {}),
+    "post payment": lambda i, p: (
+        "POST", f"/servicing/pay/{p.account_ids[i % len(p.account_ids)]}",
+        {"params": {"amount": p.emi, "mode": "UPI"}}
+    ),
+    "dashboard": lambda i, p: ("GET", "/servicing/dashboard", {}),
+    "overdue buckets": lambda i, p: ("GET", "/servicing/overdue-buckets", {"params": {"live": "true"}}),
+    "recovery board": lambda i, p: ("GET", "/recovery/board", {"params": {"limit": 100}}),
+}
+
+# steps that continue customers created by "onboarding basic"
+NEEDS_CUSTOMERS = {"onboarding contact", "onboarding demographics", "onboarding confirm"}
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(int(round(p * (len(sorted_values) - 1))), len(sorted_values) - 1)] * 1000
+
+
+async def drive(client, name, portfolio, requests, concurrency):
+    build = ENDPOINTS[name]
+    latencies, errors = [], 0
+    counter = iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        for i in counter:
+            method, url, kwargs = build(i, portfolio)
+            t0 = time.perf_counter()
+            r = await client.request(method, url, **kwargs)
+            latencies.append(time.perf_counter() - t0)
+            if r.status_code >= 400:
+                errors += 1
+            elif name == "onboarding basic":
+                portfolio.customers.append(r.json()["customer_id"])
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": requests,
+        "errors": errors,
+        "rps": round(requests / elapsed, 2),
+        "p50_ms": round(percentile(latencies, 0.50), 3),
+        "p95_ms": round(percentile(latencies, 0.95), 3),
+        "p99_ms": round(percentile(latencies, 0.99), 3),
+    }
+
+
+async def run(args, portfolio):
+    if args.url:
+        transport, base_url = None, args.url
+    else:
+        transport, base_url = httpx.ASGITransport(app=app), "http://bench"
+
+    results = {}
+    async with httpx.AsyncClient(transport=transport, base_url=base_url, timeout=None) as client:
+        for name in args.endpoints:
+            if name in NEEDS_CUSTOMERS and not portfolio.customers:
+                print(f"{name:<24} skipped: no customers from 'onboarding basic' (include it in --endpoints)")
+                continue
+            if ENDPOINTS[name](0, portfolio)[0] == "GET":
+                await drive(client, name, portfolio, args.warmup, args.concurrency)   # warm caches
+            results[name] = await drive(client, name, portfolio, args.requests, args.concurrency)
+            r = results[name]
+            print(f"{name:<24} {r['rps']:9.1f} req/s  p50 {r['p50_ms']:8.2f}  "
+                  f"p95 {r['p95_ms']:8.2f}  p99 {r['p99_ms']:8.2f} ms  errors {r['errors']}")
+    return results
+
+
+# ------------------------------
+# BASELINE DIFF
+# ------------------------------
+def compare(results, baseline, tolerance):
+    regressions = []
+    print(f"\nagainst baseline (tolerance {tolerance:.0%}):")
+    for name, r in results.items():
+        base = baseline.get("endpoints", {}).get(name)
+        if not base:
+            print(f"  {name:<24} (not in baseline)")
+            continue
+
+        p95_change = r["p95_ms"] / base["p95_ms"] - 1 if base["p95_ms"] else 0.0
+        rps_change = r["rps"] / base["rps"] - 1 if base["rps"] else 0.0
+        worse = p95_change > tolerance or rps_change < -tolerance
+        if worse:
+            regressions.append(name)
+        print(f"  {name:<24} p95 {p95_change:+7.1%}  rps {rps_change:+7.1%}{'  REGRESSION' if worse else ''}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200, help="requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--warmup", type=int, default=20, help="unmeasured requests before each read endpoint")
+    parser.add_argument("--accounts", type=int, default=200, help="seeded loan accounts")
+    parser.add_argument("--endpoints", nargs="+", default=list(ENDPOINTS), choices=list(ENDPOINTS), metavar="NAME")
+    parser.add_argument("--url", help="benchmark a running server instead of the in-process app")
+    parser.add_argument("--out", help="write results as JSON")
+    parser.add_argument("--baseline", help="JSON from an earlier run to diff against")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    portfolio = seed(args.accounts, args.requests)
+    try:
+        results = asyncio.run(run(args, portfolio))
+    finally:
+        unseed(portfolio)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "date": date.today().isoformat(),
+            "target": args.url or "in-process",
+            "database": DATABASE_URL.split("://")[0],
+            "python": platform.python_version(),
+            "bcrypt_rounds": BCRYPT_ROUNDS,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "accounts": args.accounts,
+        },
+        "endpoints": results,
+    }
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+
+    failed = any(r["errors"] for r in results.values())
+    if args.baseline:
+        with open(args.baseline) as f:
+            failed |= bool(compare(results, json.load(f), args.tolerance))
+
+    raise SystemExit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
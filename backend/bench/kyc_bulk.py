@@ -0,0 +1,135 @@
+"""
+Bulk bureau/KYC ingestion throughput through /kyc/bulk.
+
+    python -m bench.kyc_bulk --rows 50000 --min-rate 10000
+
+Seeds ``--rows`` throwaway customers, half of them with an existing KYC
+record, then streams a bureau file covering all of them (plus 1% bad
+rows) through the real app, once as CSV and once as NDJSON. Prints
+rows/s and the insert/update/error split. Exits 1 if either format is
+below ``--min-rate`` rows/s or the report doesn't match the file.
+Seeded rows are deleted afterwards.
+"""
+import argparse
+import asyncio
+import json
+import time
+
+import httpx
+from sqlalchemy import delete, func, insert, select
+
+import bench.tempdb  # noqa: F401  (before app imports: scratch database)
+from app.core.database import SessionLocal
+from app.main import app
+from app.models.customer import Customer
+from app.models.kyc import KYCRecord
+
+BATCH = 10_000
+
+
+def seed(rows):
+    db = SessionLocal()
+    start = (db.scalar(select(func.max(Customer.id))) or 0) + 1
+    ids = list(range(start, start + rows))
+    for i in range(0, rows, BATCH):
+        chunk = ids[i:i + BATCH]
+        db.execute(insert(Customer.__table__), [{"id": c, "first_name": "Bench", "last_name": "KYC"} for c in chunk])
+        db.execute(insert(KYCRecord.__table__), [{"customer_id": c} for c in chunk[::2]])
+    db.commit()
+    db.close()
+    return ids
+
+
+def unseed(ids):
+    db = SessionLocal()
+    for i in range(0, len(ids), BATCH):
+        chunk = ids[i:i + BATCH]
+        db.execute(delete(KYCRecord.__table__).where(KYCRecord.customer_id.in_(chunk)))
+        db.execute(delete(Customer.__table__).where(Customer.id.in_(chunk)))
+    db.commit()
+    db.close()
+
+
+def records(ids):
+    for n, customer_id in enumerate(ids):
+        yield {
+            "customer_id": customer_id,
+            "pan_number": f"ABCDE{n % 10000:04d}F" if n % 100 else "BAD",    # 1% invalid
+            "aadhaar_number": f"{n:012d}",
+            "cibil_score": 300 + n % 600,
+        }
+
+
+def csv_body(ids):
+    def generate():
+        yield b"customer_id,pan_number,aadhaar_number,cibil_score\n"
+        lines = []
+        for r in records(ids):
+            lines.append(f"{r['customer_id']},{r['pan_number']},{r['aadhaar_number']},{r['cibil_score']}\n")
+            if len(lines) == 1000:
+                yield "".join(lines).encode()
+                lines = []
+        yield "".join(lines).encode()
+    return generate
+
+
+def ndjson_body(ids):
+    def generate():
+        lines = []
+        for r in records(ids):
+            lines.append(json.dumps(r) + "\n")
+            if len(lines) == 1000:
+                yield "".join(lines).encode()
+                lines = []
+        yield "".join(lines).encode()
+    return generate
+
+
+async def post(body, media_type):
+    async def stream():
+        for chunk in body():
+            yield chunk
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        started = time.perf_counter()
+        r = await client.post("/kyc/bulk", content=stream(), headers={"Content-Type": media_type})
+        elapsed = time.perf_counter() - started
+    r.raise_for_status()
+    return r.json(), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--min-rate", type=float, default=10_000, help="rows/s each format must reach")
+    args = parser.parse_args()
+
+    ids = seed(args.rows)
+    bad = len(ids[::100])
+    failed = False
+    try:
+        for name, body, media_type in (
+            ("csv", csv_body(ids), "text/csv"),
+            ("ndjson", ndjson_body(ids), "application/x-ndjson"),
+        ):
+            report, elapsed = asyncio.run(post(body, media_type))
+            rate = report["rows"] / elapsed
+            print(f"{name:<7} {report['rows']} rows in {elapsed:.2f}s = {rate:,.0f} rows/s  "
+                  f"inserted {report['inserted']} updated {report['updated']} failed {report['failed']}")
+
+            ok = report["rows"] == args.rows and report["failed"] == bad \
+                and report["inserted"] + report["updated"] == args.rows - bad
+            if not ok:
+                print("  report does not match the file")
+            if rate < args.min_rate:
+                print(f"  below {args.min_rate:,.0f} rows/s")
+            failed |= not ok or rate < args.min_rate
+    finally:
+        unseed(ids)
+
+    raise SystemExit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
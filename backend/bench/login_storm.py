@@ -0,0 +1,126 @@
+"""
+Login throughput and servicing latency during a login storm.
+
+    python -m bench.login_storm --logins 64 --servicing 32 --seconds 10
+
+Keeps ``--logins`` logins and ``--servicing`` servicing requests in
+flight together for ``--seconds``. The servicing mix is the sync payment
+route, which needs a request worker thread, plus the async timeline.
+It runs twice. The first run uses the old login: a sync route hashing
+inline on a request worker thread. The second uses /auth/login, which
+hashes on the dedicated bcrypt pool. The cost is BCRYPT_ROUNDS and the
+pool size is HASH_WORKERS.
+"""
+import argparse
+import asyncio
+import time
+import uuid
+
+import httpx
+from fastapi import Depends, FastAPI, HTTPException
+from sqlalchemy.orm import Session
+
+import bench.tempdb  # noqa: F401  (before app imports: scratch database)
+from app.core.config import BCRYPT_ROUNDS, HASH_WORKERS
+from app.core.database import SessionLocal, get_db
+from app.core.security import hash_password, verify_password
+from app.main import app as main_app  # noqa: F401  (creates tables)
+from app.models.user import User
+from app.routes import auth, servicing
+from app.schemas.auth import LoginRequest
+from bench.concurrent_payments import open_accounts, cleanup
+
+app = FastAPI()
+app.include_router(auth.router)
+app.include_router(servicing.router)
+
+
+@app.post("/legacy/login")
+def legacy_login(data: LoginRequest, db: Session = Depends(get_db)):
+    user = db.query(User).filter(User.email == data.email).first()
+    if not user or not verify_password(data.password, user.password_hash):
+        raise HTTPException(401, "Invalid credentials")
+    return {"user_id": user.id}
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(int(len(values) * p), len(values) - 1)] * 1000 if values else 0.0
+
+
+async def storm(client, login_url, credentials, ids, args):
+    deadline = time.perf_counter() + args.seconds
+    logins, servicing_latency = [], []
+
+    async def login_worker():
+        while time.perf_counter() < deadline:
+            t0 = time.perf_counter()
+            r = await client.post(login_url, json=credentials)
+            r.raise_for_status()
+            logins.append(time.perf_counter() - t0)
+
+    async def servicing_worker(n):
+        while time.perf_counter() < deadline:
+            account = ids[n % len(ids)]
+            t0 = time.perf_counter()
+            if n % 2:
+                r = await client.post(f"/servicing/pay/{account}", params={"amount": 1, "mode": "UPI"})
+            else:
+                r = await client.get(f"/servicing/timeline/{account}")
+            r.raise_for_status()
+            servicing_latency.append(time.perf_counter() - t0)
+            n += 1
+
+    await asyncio.gather(
+        *(login_worker() for _ in range(args.logins)),
+        *(servicing_worker(n) for n in range(args.servicing))
+    )
+
+    return {
+        "logins/s": len(logins) / args.seconds,
+        "servicing/s": len(servicing_latency) / args.seconds,
+        "servicing p50": percentile(servicing_latency, 0.5),
+        "servicing p99": percentile(servicing_latency, 0.99),
+    }
+
+
+async def run(args, credentials, ids):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        for name, url in (("legacy", "/legacy/login"), ("off-loop", "/auth/login")):
+            stats = await storm(client, url, credentials, ids, args)
+            print(
+                f"{name:>8}: {stats['logins/s']:7.1f} logins/s  "
+                f"{stats['servicing/s']:7.1f} servicing req/s  "
+                f"p50 {stats['servicing p50']:7.1f} ms  p99 {stats['servicing p99']:7.1f} ms"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--servicing", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--accounts", type=int, default=8)
+    args = parser.parse_args()
+
+    print(f"bcrypt cost {BCRYPT_ROUNDS}, {HASH_WORKERS} hashing threads")
+
+    credentials = {"email": f"bench-{uuid.uuid4().hex}@example.com", "password": "bench-password"}
+    db = SessionLocal()
+    user = User(full_name="Bench User", email=credentials["email"], password_hash=hash_password(credentials["password"]))
+    db.add(user)
+    db.commit()
+
+    ids, _ = open_accounts(args.accounts, tenure=360)
+    try:
+        asyncio.run(run(args, credentials, ids))
+    finally:
+        cleanup(ids)
+        db.delete(user)
+        db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Run every read route under the N+1 detector and fail on a repeated query.
+
+    python -m bench.nplusone_check --accounts 20 --threshold 5
+
+Opens throwaway loan accounts with part of their schedule backdated
+(so they show up as overdue on the recovery board), posts a payment on
+each, then calls the read routes through the real app with
+app.core.nplusone watching. Any statement shape repeated more than
+``--threshold`` times in one request is reported with its call site;
+the exit status is 1 if there was any.
+"""
+import argparse
+import asyncio
+from datetime import timedelta
+
+import httpx
+from sqlalchemy import update
+
+import bench.tempdb  # noqa: F401  (before app imports: scratch database)
+from app.core import nplusone
+from app.core.database import SessionLocal, engine, async_engine
+from app.main import app
+from app.models.application import LoanApplication
+from app.models.disbursement import EMISchedule, LoanAccount
+from bench.concurrent_payments import open_accounts, cleanup, pay
+
+
+def urls(ids, customer_ids, application_ids):
+    joined = "&".join(f"loan_account_ids={i}" for i in ids)
+    yield "/servicing/dashboard"
+    yield "/servicing/overdue-buckets?live=true"
+    yield "/servicing/overdue-trend"
+    yield f"/servicing/timelines?{joined}"
+    yield "/servicing/payments/export?format=ndjson"
+    yield "/recovery/overdue"
+    yield "/recovery/overdue/export"
+    yield "/recovery/board?limit=200"
+    yield "/recovery/board/export"
+    yield "/onboarding/customers"
+    yield "/documents/readiness"
+    for i in ids[:3]:
+        yield f"/servicing/timeline/{i}"
+        yield f"/servicing/recent-payments/{i}"
+        yield f"/recovery/history/{i}"
+    for c in customer_ids[:3]:
+        yield f"/onboarding/customers/{c}"
+        yield f"/documents/check/{c}"
+        yield f"/documents/summary/{c}"
+    for a in application_ids[:3]:
+        yield f"/credit/summary/{a}"
+        yield f"/approval/summary/{a}"
+
+
+async def run(paths, threshold):
+    flagged = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for path in paths:
+            with nplusone.watch(path, threshold, mode="warn") as watch:
+                r = await client.get(path)
+            statements = sum(watch.counts.values())
+            print(f"{r.status_code} {statements:4d} statements  {path}")
+            flagged += [(path, *f) for f in watch.flagged]
+    return flagged
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--accounts", type=int, default=20)
+    parser.add_argument("--threshold", type=int, default=5)
+    args = parser.parse_args()
+
+    nplusone.instrument_engine(engine)
+    nplusone.instrument_engine(async_engine.sync_engine)
+
+    ids, emi = open_accounts(args.accounts, tenure=24)
+    try:
+        db = SessionLocal()
+        db.execute(update(EMISchedule), [
+            {"id": row_id, "due_date": due - timedelta(days=200)}
+            for row_id, due in db.query(EMISchedule.id, EMISchedule.due_date).filter(
+                EMISchedule.loan_account_id.in_(ids), EMISchedule.installment_no <= 6
+            )
+        ])
+        db.commit()
+        rows = db.query(LoanAccount.application_id, LoanApplication.customer_id).join(
+            LoanApplication, LoanApplication.id == LoanAccount.application_id
+        ).filter(LoanAccount.id.in_(ids)).all()
+        db.close()
+
+        for i in ids:
+            pay(i, emi)
+
+        application_ids = [a for a, _ in rows]
+        customer_ids = [c for _, c in rows]
+        flagged = asyncio.run(run(urls(ids, customer_ids, application_ids), args.threshold))
+    finally:
+        cleanup(ids)
+
+    for path, shape, count, site in flagged:
+        print(f"\nN+1 in {path} at {site}:\n  {shape[:300]}")
+    print(f"\n{len(flagged)} repeated statement(s) over threshold {args.threshold}")
+    raise SystemExit(1 if flagged else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+EXPLAIN every hot query and fail on a full table scan.
+
+    python -m bench.query_plans
+
+Runs against the configured database (SQLite: EXPLAIN QUERY PLAN,
+MySQL: EXPLAIN). Apply app.migrations.m001_hot_path_indexes first on
+existing databases (and m002-m006 for the later listing, search and
+document queries). On MySQL the optimizer may still pick a scan for
+near-empty tables, so run it against a seeded copy.
+"""
+from datetime import date
+
+from sqlalchemy import func
+
+from app.core.database import SessionLocal, engine
+from app.main import app  # noqa: F401  (creates tables)
+from app.models.application import LoanApplication
+from app.models.customer import CustomerAddress, EmploymentDetails
+from app.models.disbursement import LoanAccount, EMISchedule
+from app.models.document import Document
+from app.models.kyc import KYCRecord
+from app.models.payment import Payment
+from app.routes.document import _readiness_query
+from app.routes.onboarding import _customers_query
+from app.routes.recovery import _board_query, _overdue_query
+from app.routes.servicing import _timeline_query
+from app.utils.dpd import bucket_totals_query
+from app.utils.search import search_queries
+
+
+def hot_queries(db):
+    today = date.today()
+
+    yield "payment allocation page", db.query(EMISchedule).filter(
+        EMISchedule.loan_account_id == 1,
+        EMISchedule.balance > 0,
+        EMISchedule.installment_no > 0
+    ).order_by(EMISchedule.installment_no).limit(10)
+
+    yield "next due date", db.query(func.min(EMISchedule.due_date)).filter(
+        EMISchedule.loan_account_id == 1,
+        EMISchedule.balance > 0
+    )
+
+    yield "overdue buckets", bucket_totals_query(today)
+    yield "overdue listing", _overdue_query(today)
+    yield "recovery board", _board_query(today).limit(100)
+
+    yield "recent payments", db.query(Payment).filter(
+        Payment.loan_account_id == 1
+    ).order_by(Payment.id.desc()).limit(10)
+
+    yield "existing account", db.query(LoanAccount).filter(LoanAccount.application_id == 1)
+
+    for model in (Document, KYCRecord, LoanApplication, CustomerAddress, EmploymentDetails):
+        yield f"{model.__tablename__} by customer", db.query(model).filter(model.customer_id == 1)
+
+    yield "emi timeline", _timeline_query([1, 2])
+
+    yield "customers page by status", _customers_query(["id", "status"], status="ONBOARDED", cursor=100000).limit(100)
+
+    yield "customers page by created date", _customers_query(
+        ["id", "status"], created_from=today, created_to=today
+    ).limit(100)
+
+    yield "document readiness page", _readiness_query(cursor=1000).limit(200)
+    yield "document readiness, not ready only", _readiness_query(status="ONBOARDED", ready=False).limit(200)
+
+    # PAN, mobile prefix + application number, name words
+    for q in ("ABCDE1234F", "98765", "Ramesh Ku"):
+        for n, query in enumerate(search_queries(q, engine.dialect.name, 20), 1):
+            yield f"customer search {q!r} ({n})", query
+
+
+def plan(db, query):
+    statement = getattr(query, "statement", query)
+    compiled = statement.compile(
+        dialect=engine.dialect,
+        compile_kwargs={"render_postcompile": True}
+    )
+    params = compiled.construct_params()
+    sql = str(compiled)
+
+    conn = db.connection()
+    if engine.dialect.name == "sqlite":
+        args = tuple(params[k] for k in compiled.positiontup)
+        rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + sql, args).fetchall()
+        steps = [r[-1] for r in rows]
+        # scanning a bounded subquery's result is fine, only base tables count
+        derived = {s.split()[-1] for s in steps if s.startswith(("MATERIALIZE", "CO-ROUTINE"))}
+        scans = [s for s in steps if s.startswith("SCAN") and " INDEX " not in s and s.split()[1] not in derived]
+    else:
+        rows = conn.exec_driver_sql("EXPLAIN " + sql, params).mappings().fetchall()
+        steps = [f"{r['table']}: {r['type']} {r['key']}" for r in rows]
+        scans = [f"{r['table']}" for r in rows if r["type"] == "ALL"]
+
+    return steps, scans
+
+
+def main():
+    db = SessionLocal()
+    failed = []
+
+    try:
+        for name, query in hot_queries(db):
+            steps, scans = plan(db, query)
+            print(("FULL SCAN " if scans else "ok        ") + name)
+            for s in steps:
+                print(f"    {s}")
+            if scans:
+                failed.append(name)
+    finally:
+        db.close()
+
+    if failed:
+        print(f"\n{len(failed)} hot queries fall back to a full scan: {', '.join(failed)}")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
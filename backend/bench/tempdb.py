@@ -0,0 +1,29 @@
+"""
+Scratch database for the benches that seed rows through the app's own
+engine. Import it before any app module:
+
+    import bench.tempdb  # noqa: F401  (before app imports)
+
+It points DATABASE_URL at a throwaway SQLite file, with DOCUMENT_STORE_DIR
+next to it, so a run never writes to the tracked cubeloan360.db or to a
+MySQL database configured through DB_*. Child processes (spawned pool
+workers, a uvicorn under test) inherit the same scratch database through
+the environment; the process that created it deletes it on exit.
+
+BENCH_DATABASE_URL seeds that database instead, e.g. the one a server
+benchmarked with ``--url`` is using.
+"""
+import atexit
+import os
+import shutil
+import tempfile
+
+if "BENCH_SCRATCH_DIR" not in os.environ:
+    scratch = tempfile.mkdtemp(prefix="cubeloan-bench-")
+    atexit.register(shutil.rmtree, scratch, ignore_errors=True)
+    os.environ["BENCH_SCRATCH_DIR"] = scratch
+
+    url = os.getenv("BENCH_DATABASE_URL") or f"sqlite:///{os.path.join(scratch, 'bench.db')}"
+    os.environ["DATABASE_URL"] = url
+    os.environ["ASYNC_DATABASE_URL"] = url.replace("sqlite://", "sqlite+aiosqlite://").replace("+pymysql", "+aiomysql")
+    os.environ["DOCUMENT_STORE_DIR"] = os.path.join(scratch, "document_store")
@@ -0,0 +1,169 @@
+"""
+Concurrent large document uploads against a real server process.
+
+    python -m bench.upload_storm --uploads 100 --size-mb 20
+
+Starts uvicorn on this app in a subprocess, with a scratch database
+(bench.tempdb) and a throwaway DOCUMENT_STORE_DIR. It then sends
+``--uploads`` multipart uploads of ``--size-mb`` each, all at once,
+streamed from a generator so the client never holds a whole file. Every
+``--distinct``-th file repeats earlier content, which checks dedup.
+
+The server's resident memory is sampled from /proc throughout (so
+Linux only). The script reports peak RSS growth over the idle server,
+throughput, and how many blobs hit the disk. The seeded customer and
+its documents are deleted afterwards.
+"""
+import argparse
+import asyncio
+import hashlib
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+
+import httpx
+
+import bench.tempdb  # noqa: F401  (before app imports: scratch database)
+from app import models  # noqa: F401
+from app.core.database import Base, SessionLocal, engine
+from app.models.customer import Customer
+from app.models.document import Document
+
+CHUNK = 64 * 1024
+
+
+def rss_kib(pid):
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return 0
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def content(seed, size):
+    # deterministic, incompressible-looking bytes without holding them all
+    block = hashlib.sha256(str(seed).encode()).digest() * (CHUNK // 32)
+    sent = 0
+    while sent < size:
+        piece = block[:min(CHUNK, size - sent)]
+        sent += len(piece)
+        yield piece
+
+
+async def multipart_body(boundary, customer_id, seed, size):
+    head = (
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="customer_id"\r\n\r\n{customer_id}\r\n'
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="document_type"\r\n\r\nBANK_STATEMENT\r\n'
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="file"; filename="statement-{seed}.pdf"\r\n'
+        f"Content-Type: application/pdf\r\n\r\n"
+    )
+    yield head.encode()
+    for piece in content(seed, size):
+        yield piece
+    yield f"\r\n--{boundary}--\r\n".encode()
+
+
+async def upload(client, customer_id, seed, size):
+    boundary = uuid.uuid4().hex
+    r = await client.post(
+        "/documents/upload",
+        content=multipart_body(boundary, customer_id, seed, size),
+        headers={"Content-Type": f"multipart/form-data; boundary={boundary}"},
+    )
+    r.raise_for_status()
+    return r.json()
+
+
+async def storm(url, pid, customer_id, uploads, size, distinct):
+    peak = 0
+    done = False
+
+    async def sample():
+        nonlocal peak
+        while not done:
+            peak = max(peak, rss_kib(pid))
+            await asyncio.sleep(0.05)
+
+    limits = httpx.Limits(max_connections=uploads)
+    async with httpx.AsyncClient(base_url=url, timeout=None, limits=limits) as client:
+        sampler = asyncio.create_task(sample())
+        started = time.perf_counter()
+        results = await asyncio.gather(*(upload(client, customer_id, i % distinct, size) for i in range(uploads)))
+        elapsed = time.perf_counter() - started
+        done = True
+        await sampler
+    return results, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--uploads", type=int, default=100)
+    parser.add_argument("--size-mb", type=float, default=20)
+    parser.add_argument("--distinct", type=int, default=50, help="distinct file contents among the uploads")
+    args = parser.parse_args()
+    size = int(args.size_mb * 1024 * 1024)
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    customer = Customer(first_name="Bench", last_name="Uploads")
+    db.add(customer)
+    db.commit()
+    customer_id = customer.id
+    db.close()
+
+    with tempfile.TemporaryDirectory() as store:
+        port = free_port()
+        env = {**os.environ, "DOCUMENT_STORE_DIR": store, "UPLOAD_MAX_BYTES": str(size + 1024)}
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+            env=env,
+        )
+        url = f"http://127.0.0.1:{port}"
+        try:
+            for _ in range(100):
+                try:
+                    httpx.get(url + "/metrics", timeout=1)
+                    break
+                except httpx.TransportError:
+                    time.sleep(0.1)
+            idle = rss_kib(server.pid)
+
+            results, elapsed, peak = asyncio.run(
+                storm(url, server.pid, customer_id, args.uploads, size, args.distinct)
+            )
+        finally:
+            server.terminate()
+            server.wait()
+
+        blobs = sum(len(files) for root, _, files in os.walk(store) if not root.endswith("tmp"))
+        total_mb = args.uploads * size / 1024 / 1024
+        duplicates = sum(r["duplicate"] for r in results)
+        print(f"{args.uploads} uploads x {args.size_mb:g} MB in {elapsed:.1f}s "
+              f"({total_mb / elapsed:.0f} MB/s)")
+        print(f"server RSS: idle {idle / 1024:.0f} MB, peak {peak / 1024:.0f} MB "
+              f"(+{(peak - idle) / 1024:.0f} MB, {(peak - idle) / args.uploads:.0f} KB per upload)")
+        print(f"blobs on disk: {blobs} (distinct contents {min(args.distinct, args.uploads)}), "
+              f"duplicate responses: {duplicates}")
+
+    db = SessionLocal()
+    db.query(Document).filter(Document.customer_id == customer_id).delete(synchronize_session=False)
+    db.query(Customer).filter(Customer.id == customer_id).delete(synchronize_session=False)
+    db.commit()
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -99,11 +99,12 @@ export default function DocumentCollection() {
     if (!selectedCustomerId) return toast.error("Select a customer first");
     setIsLoading(true);
     try {
-      const fileName = file ? file.name : `mock_${docType.toLowerCase()}.pdf`;
-      const uploadRes = await api.post("/documents/upload", {
-        customer_id: selectedCustomerId,
-        document_type: docType,
-        file_path: fileName
+      const form = new FormData();
+      form.append("customer_id", String(selectedCustomerId));
+      form.append("document_type", docType);
+      form.append("file", file ?? new Blob([`mock ${docType}`], { type: "application/pdf" }), file?.name ?? `mock_${docType.toLowerCase()}.pdf`);
+      const uploadRes = await api.post("/documents/upload", form, {
+        headers: { "Content-Type": "multipart/form-data" }
       });
 
       // Auto-verify for testing purposes